@@ -0,0 +1,114 @@
+"""Micro-benchmark for get_idu_data response decoding.
+
+Compares the previous path (full JSON parse as resp.json(content_type=None)
+does, then IDUDevice.from_api_data per unit) with extract_idu_units plus
+the in-place register update, for each available JSON backend.
+
+Usage: python benchmarks/bench_idu_decoder.py [--json]
+"""
+import argparse
+import json
+import sys
+import timeit
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "tools"))
+
+from custom_components.hidom.api import decoder  # noqa: E402
+from custom_components.hidom.api.models import IDUDevice  # noqa: E402
+from custom_components.hidom.api.registers import topology_key  # noqa: E402
+from custom_components.hidom.device.manager import HiDOMDeviceManager  # noqa: E402
+from simulator import HiDOMSimulator, SimulatorConfig  # noqa: E402
+
+UNIT_COUNTS = (10, 50, 100, 250, 500)
+
+def build_case(units: int):
+    """Build topology and a get_idu_data body for ``units`` units."""
+    systems = max(1, -(-units // 50))
+    simulator = HiDOMSimulator(SimulatorConfig(
+        systems=systems,
+        idus_per_system=-(-units // systems),
+        seed=0
+    ))
+    devs = [{"sys": item["sysAdr"], "addr": item["address"]} for item in simulator.topology]
+    payload = json.dumps(simulator.idu_data(devs)).encode()
+    return simulator.topology, payload
+
+def legacy_decode(topo_index: Dict[Any, Dict[str, Any]], payload: bytes) -> Dict[str, IDUDevice]:
+    """Previous get_idu_data path: full parse, new device per unit."""
+    data = json.loads(payload.decode("utf-8"))
+    devices = {}
+    
+    for idu_data in data.get("dats", []):
+        key = topology_key(idu_data.get("sys"), idu_data.get("addr"))
+        device = IDUDevice.from_api_data(topo_index.get(key, {}), idu_data)
+        devices[device.uid] = device
+    
+    return devices
+
+def measure(func) -> float:
+    """Return best time per call in microseconds."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=5, number=number)) / number * 1e6
+
+def run() -> List[Dict[str, Any]]:
+    """Run all benchmark cases."""
+    results = []
+    backends = list(decoder.JSON_BACKENDS)
+    
+    for units in UNIT_COUNTS:
+        topology, payload = build_case(units)
+        topo_index = {
+            topology_key(item["sysAdr"], item["address"]): item
+            for item in topology
+        }
+        legacy = legacy_decode(topo_index, payload)
+        legacy_us = measure(lambda: legacy_decode(topo_index, payload))
+        
+        for backend in backends:
+            decoder.set_json_backend(backend)
+            manager = HiDOMDeviceManager(api_client=None)
+            manager.seed_topology(topology)
+            manager._apply_units(decoder.extract_idu_units(payload))
+            
+            devices = manager.get_placeholder_devices()
+            assert all(devices[uid].as_dict() == device.as_dict() for uid, device in legacy.items())
+            
+            fast_us = measure(lambda: manager._apply_units(decoder.extract_idu_units(payload)))
+            results.append({
+                "units": units,
+                "backend": backend,
+                "payload_bytes": len(payload),
+                "legacy_us": round(legacy_us, 1),
+                "fast_us": round(fast_us, 1),
+                "speedup": round(legacy_us / fast_us, 2),
+            })
+    
+    decoder.set_json_backend()
+    return results
+
+def main() -> None:
+    """Run benchmark and print results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--json", action="store_true", help="print JSON results")
+    args = parser.parse_args()
+    
+    results = run()
+    
+    if args.json:
+        print(json.dumps({"benchmark": "idu_decoder", "results": results}, indent=2))
+        return
+    
+    print(f"{'units':>6}{'backend':>9}{'bytes':>9}{'legacy us':>11}{'fast us':>10}{'speedup':>9}")
+    for row in results:
+        print(
+            f"{row['units']:>6}{row['backend']:>9}{row['payload_bytes']:>9}"
+            f"{row['legacy_us']:>11}{row['fast_us']:>10}{row['speedup']:>9}"
+        )
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
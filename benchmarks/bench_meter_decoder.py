@@ -0,0 +1,123 @@
+"""Micro-benchmark for the get_meter_pwr response decoder.
+
+Compares extract_meter_powers with the previous decoding path
+(text decode, per-character isdigit scan, chr() join, json.loads) on
+plain JSON and ASCII-code encoded payloads of growing size.
+
+Usage: python benchmarks/bench_meter_decoder.py [--json]
+"""
+import argparse
+import json
+import random
+import sys
+import timeit
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.hidom.api.decoder import extract_meter_powers  # noqa: E402
+
+METER_COUNTS = (1, 2, 8, 32, 128)
+
+def build_payload(meters: int, ascii_codes: bool) -> bytes:
+    """Build a realistic meter response body."""
+    document = json.dumps({
+        "status": "success",
+        "dats": [
+            {
+                "id": str(index + 1),
+                "pwr": f"{random.uniform(1000, 500000):.1f}",
+                "vol": "230.1",
+                "cur": "12.4"
+            }
+            for index in range(meters)
+        ]
+    })
+    
+    if ascii_codes:
+        return " ".join(str(ord(c)) for c in document).encode("ascii")
+    return document.encode("ascii")
+
+def legacy_decode(raw_bytes: bytes) -> Optional[List[float]]:
+    """Previous get_power_data decoding path."""
+    try:
+        raw_text = raw_bytes.decode('ascii')
+    except UnicodeDecodeError:
+        raw_text = raw_bytes.decode('utf-8', errors='ignore')
+    
+    if raw_text.strip() and all(c.isdigit() or c.isspace() for c in raw_text.strip()):
+        try:
+            ascii_codes = [int(x) for x in raw_text.split()]
+            raw_text = ''.join(chr(code) for code in ascii_codes)
+        except Exception:
+            pass
+    
+    try:
+        data = json.loads(raw_text)
+    except json.JSONDecodeError:
+        return None
+    
+    if data.get("status") != "success":
+        return None
+    
+    powers = []
+    for meter in data.get("dats", []):
+        if isinstance(meter, dict) and "pwr" in meter:
+            try:
+                powers.append(float(meter["pwr"]))
+            except (ValueError, TypeError):
+                continue
+    
+    return powers
+
+def measure(func, payload: bytes) -> float:
+    """Return best time per call in microseconds."""
+    timer = timeit.Timer(lambda: func(payload))
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=5, number=number)) / number * 1e6
+
+def run() -> List[Dict[str, Any]]:
+    """Run all benchmark cases."""
+    random.seed(0)
+    results = []
+    
+    for ascii_codes in (False, True):
+        for meters in METER_COUNTS:
+            payload = build_payload(meters, ascii_codes)
+            assert extract_meter_powers(payload) == legacy_decode(payload)
+            
+            legacy_us = measure(legacy_decode, payload)
+            fast_us = measure(extract_meter_powers, payload)
+            results.append({
+                "encoding": "ascii_codes" if ascii_codes else "json",
+                "meters": meters,
+                "payload_bytes": len(payload),
+                "legacy_us": round(legacy_us, 2),
+                "fast_us": round(fast_us, 2),
+                "speedup": round(legacy_us / fast_us, 2),
+            })
+    
+    return results
+
+def main() -> None:
+    """Run benchmark and print results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--json", action="store_true", help="print JSON results")
+    args = parser.parse_args()
+    
+    results = run()
+    
+    if args.json:
+        print(json.dumps({"benchmark": "meter_decoder", "results": results}, indent=2))
+        return
+    
+    print(f"{'encoding':<12}{'meters':>8}{'bytes':>10}{'legacy us':>12}{'fast us':>10}{'speedup':>9}")
+    for row in results:
+        print(
+            f"{row['encoding']:<12}{row['meters']:>8}{row['payload_bytes']:>10}"
+            f"{row['legacy_us']:>12}{row['fast_us']:>10}{row['speedup']:>9}"
+        )
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
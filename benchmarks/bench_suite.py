@@ -0,0 +1,255 @@
+"""Benchmark suite for poll cycles, decoding and commands.
+
+Runs the device manager against the controller simulator (started as a
+separate process, so CPU figures only cover the client side) for
+installations of growing size and measures:
+
+- poll-cycle latency and CPU time of get_idu_devices
+- decode cost per unit of a get_idu_data response, applied in place
+- command latency: raw set_idu, confirmed command, and confirmed command
+  followed by a full refresh as the coordinator does
+- memory per device, and memory allocated by a steady-state poll update
+
+Usage: python benchmarks/bench_suite.py [--units 10,50,100,250,500] [--json] [--output FILE]
+"""
+import argparse
+import asyncio
+import gc
+import json
+import math
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import aiohttp
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "tools"))
+
+from custom_components.hidom.api.client import HiDOMAPIClient  # noqa: E402
+from custom_components.hidom.api.decoder import extract_idu_units  # noqa: E402
+from custom_components.hidom.device.manager import HiDOMDeviceManager  # noqa: E402
+from custom_components.hidom.const import DATA_SET_TEMP  # noqa: E402
+from simulator import HiDOMSimulator, SimulatorConfig  # noqa: E402
+
+UNIT_COUNTS = (10, 50, 100, 250, 500)
+
+# Units per refrigerant system in generated installations
+UNITS_PER_SYSTEM = 50
+
+def layout(units: int) -> Tuple[int, int]:
+    """Return systems and units per system for a unit count."""
+    systems = max(1, math.ceil(units / UNITS_PER_SYSTEM))
+    return systems, math.ceil(units / systems)
+
+def free_port() -> int:
+    """Return an unused local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_simulator(units: int, port: int) -> subprocess.Popen:
+    """Start the simulator process and wait until it accepts connections."""
+    systems, per_system = layout(units)
+    process = subprocess.Popen(
+        [
+            sys.executable, str(ROOT / "tools" / "simulator.py"),
+            "--port", str(port),
+            "--systems", str(systems),
+            "--idus", str(per_system),
+            "--seed", "0",
+        ],
+        stdout=subprocess.DEVNULL,
+    )
+    
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return process
+        except OSError:
+            time.sleep(0.05)
+    
+    process.kill()
+    raise RuntimeError("Simulator did not start")
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Return median, p95 and max in milliseconds."""
+    ordered = sorted(samples)
+    return {
+        "median_ms": round(statistics.median(ordered) * 1000, 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+async def bench_polls(manager: HiDOMDeviceManager, cycles: int) -> Dict[str, Any]:
+    """Measure get_idu_devices wall and CPU time."""
+    wall: List[float] = []
+    cpu: List[float] = []
+    
+    for _ in range(cycles):
+        cpu_start = time.process_time()
+        start = time.perf_counter()
+        await manager.get_idu_devices()
+        wall.append(time.perf_counter() - start)
+        cpu.append(time.process_time() - cpu_start)
+    
+    return {"latency": summarize(wall), "cpu": summarize(cpu)}
+
+async def bench_commands(
+    api: HiDOMAPIClient,
+    manager: HiDOMDeviceManager,
+    cycles: int
+) -> Dict[str, Any]:
+    """Measure command latency with and without confirmation and refresh."""
+    devices = await manager.get_idu_devices()
+    uid, device = next(iter(sorted(devices.items())))
+    raw: List[float] = []
+    confirmed: List[float] = []
+    refreshed: List[float] = []
+    
+    for index in range(cycles):
+        temp = 18 + index % 10
+        
+        start = time.perf_counter()
+        await api.set_idu(device.sys, device.addr, onoff=1, mode=device.mode_code, fan=device.fan_code, temp=temp)
+        raw.append(time.perf_counter() - start)
+        
+        start = time.perf_counter()
+        await manager.queue_command(uid, {"temp": temp + 1}, {"onoff": 1})
+        confirmed.append(time.perf_counter() - start)
+        
+        start = time.perf_counter()
+        await manager.queue_command(uid, {"temp": temp}, {"onoff": 1})
+        await manager.get_idu_devices()
+        refreshed.append(time.perf_counter() - start)
+    
+    return {
+        "set_idu": summarize(raw),
+        "confirmed": summarize(confirmed),
+        "confirmed_with_refresh": summarize(refreshed),
+    }
+
+def traced_bytes(func) -> Tuple[int, int]:
+    """Return memory retained and peak memory allocated by ``func``."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    func()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current - before, peak - before
+
+def bench_decode(units: int) -> Dict[str, Any]:
+    """Measure in-place decode cost and memory per unit."""
+    systems, per_system = layout(units)
+    simulator = HiDOMSimulator(SimulatorConfig(systems=systems, idus_per_system=per_system, seed=0))
+    devs = [{"sys": item["sysAdr"], "addr": item["address"]} for item in simulator.topology]
+    responses = []
+    for temp in (20, 21):
+        for registers in simulator._registers.values():
+            registers[DATA_SET_TEMP] = temp
+        responses.append(extract_idu_units(json.dumps(simulator.idu_data(devs)).encode()))
+    count = len(responses[0])
+    
+    manager = HiDOMDeviceManager(api_client=None)
+    
+    # Device objects are created with the topology and first poll
+    device_bytes, _ = traced_bytes(lambda: (
+        manager.seed_topology(simulator.topology),
+        manager._apply_units(responses[0])
+    ))
+    
+    # Later polls update them in place, here with one changed register
+    state = iter(range(1 << 30))
+    timer = timeit.Timer(lambda: manager._apply_units(responses[next(state) % 2]))
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=5, number=number)) / number
+    
+    poll_retained, poll_peak = traced_bytes(lambda: manager._apply_units(responses[0]))
+    
+    return {
+        "decode_us_per_unit": round(best / count * 1e6, 3),
+        "device_bytes_per_unit": round(device_bytes / count),
+        "poll_retained_bytes_per_unit": round(poll_retained / count, 1),
+        "poll_peak_bytes_per_unit": round(poll_peak / count, 1),
+    }
+
+async def bench_units(units: int, cycles: int) -> Dict[str, Any]:
+    """Run all benchmarks for one installation size."""
+    result: Dict[str, Any] = {"units": units}
+    result.update(bench_decode(units))
+    
+    port = free_port()
+    process = start_simulator(units, port)
+    try:
+        async with aiohttp.ClientSession() as session:
+            api = HiDOMAPIClient(f"127.0.0.1:{port}", session)
+            manager = HiDOMDeviceManager(api, command_delay=0)
+            
+            # First poll also fetches the topology
+            start = time.perf_counter()
+            await manager.get_idu_devices()
+            result["first_poll_ms"] = round((time.perf_counter() - start) * 1000, 3)
+            
+            result["poll"] = await bench_polls(manager, cycles)
+            result["command"] = await bench_commands(api, manager, max(3, cycles // 2))
+            await manager.async_shutdown()
+    finally:
+        process.terminate()
+        process.wait()
+    
+    return result
+
+async def run(unit_counts: List[int], cycles: int) -> List[Dict[str, Any]]:
+    """Run the suite for every installation size."""
+    return [await bench_units(units, cycles) for units in unit_counts]
+
+def main() -> None:
+    """Run benchmark and print results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--units", default=",".join(str(units) for units in UNIT_COUNTS), help="comma separated unit counts")
+    parser.add_argument("--cycles", type=int, default=20, help="poll cycles per size")
+    parser.add_argument("--json", action="store_true", help="print JSON results")
+    parser.add_argument("--output", help="also write JSON results to this file")
+    args = parser.parse_args()
+    
+    unit_counts = [int(units) for units in args.units.split(",") if units.strip()]
+    results = asyncio.run(run(unit_counts, args.cycles))
+    document = {
+        "benchmark": "suite",
+        "python": platform.python_version(),
+        "results": results,
+    }
+    
+    if args.output:
+        Path(args.output).write_text(json.dumps(document, indent=2))
+    
+    if args.json:
+        print(json.dumps(document, indent=2))
+        return
+    
+    print(
+        f"{'units':>6}{'decode us/u':>13}{'dev B/u':>9}{'poll B/u':>10}{'poll ms':>10}{'poll p95':>10}"
+        f"{'cpu ms':>9}{'set_idu ms':>12}{'confirm ms':>12}{'+refresh ms':>13}"
+    )
+    for row in results:
+        print(
+            f"{row['units']:>6}{row['decode_us_per_unit']:>13}{row['device_bytes_per_unit']:>9}"
+            f"{row['poll_retained_bytes_per_unit']:>10}"
+            f"{row['poll']['latency']['median_ms']:>10}{row['poll']['latency']['p95_ms']:>10}"
+            f"{row['poll']['cpu']['median_ms']:>9}{row['command']['set_idu']['median_ms']:>12}"
+            f"{row['command']['confirmed']['median_ms']:>12}"
+            f"{row['command']['confirmed_with_refresh']['median_ms']:>13}"
+        )
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,79 +1,144 @@
 """HiDOM (Hisense DOM) integration."""
 import logging
-from datetime import timedelta
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import aiohttp_client
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
-from .const import DOMAIN
+from .const import DOMAIN, EVENT_UNIT_TRANSITION
+from .config import HiDOMConfig
 from .api.client import HiDOMAPIClient
+from .api.resilience import reset_circuit_breaker
+from .coordinator import HiDOMHubCoordinator
 from .device.manager import HiDOMDeviceManager
+from .device.polling import HiDOMPollScheduler
+from .device.power import HiDOMPowerEstimator
+from .services import async_setup_services, async_unload_services
+from .storage import HiDOMTopologyStore
 
 _LOGGER = logging.getLogger(__name__)
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up HiDOM from a config entry."""
     hass.data.setdefault(DOMAIN, {})
+    config = HiDOMConfig.from_entry_data(entry.data)
     
     # Create API client
     session = aiohttp_client.async_get_clientsession(hass)
     api_client = HiDOMAPIClient(
-        host=entry.data["host"],
-        session=session
+        host=config.host,
+        session=session,
+        meter_ids=config.meter_ids,
+        request_concurrency=config.request_concurrency
     )
     
+    # Poll interval follows activity unless adaptive polling is disabled
+    if config.adaptive_polling:
+        scheduler = HiDOMPollScheduler(config.scan_interval_climate)
+    else:
+        scheduler = HiDOMPollScheduler(
+            config.scan_interval_climate,
+            fast_interval=config.scan_interval_climate,
+            idle_interval=config.scan_interval_climate,
+            offline_poll_every=1
+        )
+    
     # Create device manager
-    device_manager = HiDOMDeviceManager(api_client)
+    device_manager = HiDOMDeviceManager(
+        api_client,
+        topology_ttl=config.topology_ttl,
+        max_batch_size=config.max_batch_size,
+        command_delay=config.command_delay,
+        poll_chunk_size=config.poll_chunk_size,
+        poll_by_system=config.poll_by_system,
+        poll_concurrency=config.poll_concurrency,
+        poll_timeout=config.poll_timeout,
+        scheduler=scheduler,
+        history_samples=config.history_samples
+    )
     
-    # Coordinator for climate devices
-    async def update_climate_data():
-        """Update climate devices data."""
-        return await device_manager.get_idu_devices()
+    # Power is estimated once per meter sample, not per state read
+    power_estimator = HiDOMPowerEstimator(
+        method=config.power_method,
+        alpha=config.power_ema_alpha
+    )
     
-    coordinator_climate = DataUpdateCoordinator(
+    # One coordinator polls units and meter of the hub
+    coordinator = HiDOMHubCoordinator(
         hass,
-        _LOGGER,
-        name=f"{DOMAIN}_climate",
-        update_method=update_climate_data,
-        update_interval=timedelta(seconds=10),
+        api_client,
+        device_manager,
+        power_estimator,
+        meter_interval=config.scan_interval_sensor
     )
     
-    # Coordinator for power meter data
-    async def update_sensor_data():
-        """Update sensor data."""
-        return await api_client.get_power_data()
+    # Topology saved by a previous run
+    topology_store = HiDOMTopologyStore(hass, entry.entry_id)
+    saved_topology = await topology_store.async_load()
     
-    coordinator_sensor = DataUpdateCoordinator(
-        hass,
-        _LOGGER,
-        name=f"{DOMAIN}_sensor",
-        update_method=update_sensor_data,
-        update_interval=timedelta(seconds=30),
+    if saved_topology:
+        # Entities are created from the saved topology, state follows
+        device_manager.seed_topology(saved_topology)
+    else:
+        # Units and meter are fetched concurrently
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except Exception as e:
+            _LOGGER.warning("Initial refresh failed: %s", e)
+        
+        if device_manager.topology:
+            topology_store.async_delay_save(device_manager.topology)
+    
+    known_uids = set(device_manager.topology_uids)
+    
+    def handle_topology_change(topo) -> None:
+        """Save new topology and reload when units were added or removed."""
+        topology_store.async_delay_save(topo)
+        
+        if set(device_manager.topology_uids) != known_uids:
+            _LOGGER.info("HiDOM topology changed, reloading %s", entry.title)
+            hass.async_create_task(
+                hass.config_entries.async_reload(entry.entry_id)
+            )
+    
+    entry.async_on_unload(
+        device_manager.add_topology_listener(handle_topology_change)
     )
     
-    # Initialize coordinators
-    try:
-        await coordinator_climate.async_config_entry_first_refresh()
-        await coordinator_sensor.async_config_entry_first_refresh()
-    except Exception as e:
-        _LOGGER.warning("Initial refresh failed: %s", e)
+    def handle_transitions(transitions) -> None:
+        """Fire one event per unit state transition."""
+        for transition in transitions:
+            hass.bus.async_fire(EVENT_UNIT_TRANSITION, {
+                "entry_id": entry.entry_id,
+                **transition.as_dict(),
+            })
+    
+    entry.async_on_unload(
+        device_manager.add_transition_listener(handle_transitions)
+    )
     
     # Store dependencies
     hass.data[DOMAIN][entry.entry_id] = {
         "api_client": api_client,
         "device_manager": device_manager,
-        "coordinator_climate": coordinator_climate,
-        "coordinator_sensor": coordinator_sensor,
-        "host": entry.data["host"]
+        "coordinator": coordinator,
+        "power_estimator": power_estimator,
+        "host": config.host
     }
     
+    # Register integration services once
+    if len(hass.data[DOMAIN]) == 1:
+        await async_setup_services(hass)
+    
     # Set up platforms
     await hass.config_entries.async_forward_entry_setups(
         entry, ["climate", "sensor"]
     )
     
+    if saved_topology:
+        # Reconcile topology and fetch state in the background
+        hass.async_create_task(coordinator.async_refresh())
+    
     return True
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -83,6 +148,18 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     )
     
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id, None)
+        data = hass.data[DOMAIN].pop(entry.entry_id, None)
+        if data:
+            await data["device_manager"].async_shutdown()
+            
+            # Breakers outlive the entry, start the next setup closed
+            reset_circuit_breaker(data["host"])
+        
+        if not hass.data[DOMAIN]:
+            await async_unload_services(hass)
     
-    return unload_ok
\ No newline at end of file
+    return unload_ok
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove data of a deleted config entry."""
+    await HiDOMTopologyStore(hass, entry.entry_id).async_remove()
\ No newline at end of file
@@ -1,9 +1,13 @@
 """API module for HiDOM."""
 from .client import HiDOMAPIClient
-from .models import IDUDevice, PowerData
+from .models import IDUCommand, IDUDevice, IDUInfo, PowerData, make_uid, parse_uid
 
 __all__ = [
     "HiDOMAPIClient",
+    "IDUCommand",
     "IDUDevice",
-    "PowerData"
+    "IDUInfo",
+    "PowerData",
+    "make_uid",
+    "parse_uid"
 ]
\ No newline at end of file
@@ -2,167 +2,344 @@
 import asyncio
 import json
 import logging
+import time
+from collections import deque
 import aiohttp
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Sequence
 
-from .models import IDUDevice
+from .decoder import IDUUnitData, decode_payload, extract_idu_units, extract_meter_powers
+from .models import IDUCommand
+from .resilience import RetryPolicy, get_circuit_breaker, STATE_CLOSED
+from .scheduler import get_request_scheduler, PRIORITY_COMMAND, PRIORITY_POLL
+from .stats import EndpointStats
+from ..error_handler import CircuitOpenError, handle_errors
+from ..const import (
+    SET_IDU_REG_ADDR,
+    SET_IDU_MAX_BATCH,
+    DEFAULT_METER_IDS,
+    IDU_DATA_TIMEOUT,
+    REQUEST_CONCURRENCY,
+    DIAGNOSTICS_HISTORY,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+# Controller endpoints
+ENDPOINT_MISCDATA = "/cgi/get_miscdata.shtml"
+ENDPOINT_IDU_DATA = "/cgi/get_idu_data.shtml"
+ENDPOINT_SET_IDU = "/cgi/set_idu.shtml"
+ENDPOINT_METER_PWR = "/cgi/get_meter_pwr.shtml"
+
+# Short endpoint names used for statistics
+ENDPOINT_NAMES = {
+    ENDPOINT_MISCDATA: "miscdata",
+    ENDPOINT_IDU_DATA: "idu_data",
+    ENDPOINT_SET_IDU: "set_idu",
+    ENDPOINT_METER_PWR: "meter_pwr",
+}
+
+# Errors that make a request fail
+REQUEST_ERRORS = (asyncio.TimeoutError, aiohttp.ClientError, CircuitOpenError)
+
 class HiDOMAPIClient:
     """HTTP client for HiDOM API."""
     
-    def __init__(self, host: str, session: aiohttp.ClientSession):
+    def __init__(
+        self,
+        host: str,
+        session: aiohttp.ClientSession,
+        meter_ids: Sequence[str] = DEFAULT_METER_IDS,
+        retry_policy: Optional[RetryPolicy] = None,
+        request_concurrency: int = REQUEST_CONCURRENCY
+    ):
         self._host = host
         self._session = session
         self._base_url = f"http://{host}"
+        self._meter_ids = list(meter_ids)
+        self._retry = retry_policy or RetryPolicy()
+        self._breaker = get_circuit_breaker(host)
+        self._scheduler = get_request_scheduler(host, request_concurrency)
+        self._stats = {
+            endpoint: EndpointStats(name)
+            for endpoint, name in ENDPOINT_NAMES.items()
+        }
+        self.recent_errors: deque = deque(maxlen=DIAGNOSTICS_HISTORY)
     
-    async def get_miscdata(self) -> Optional[Dict[str, Any]]:
-        """Get device topology."""
-        url = f"{self._base_url}/cgi/get_miscdata.shtml"
+    @property
+    def host(self) -> str:
+        """Return controller host."""
+        return self._host
+    
+    @property
+    def circuit_open(self) -> bool:
+        """Check whether requests to the controller are paused."""
+        return self._breaker.state != STATE_CLOSED
+    
+    @property
+    def circuit_state(self) -> str:
+        """Return circuit breaker state."""
+        return self._breaker.state
+    
+    @property
+    def stats(self) -> Dict[str, EndpointStats]:
+        """Return request statistics by endpoint name."""
+        return {stats.name: stats for stats in self._stats.values()}
+    
+    @property
+    def queue_stats(self) -> Dict[str, Any]:
+        """Return request queue statistics."""
+        return self._scheduler.stats
+    
+    def _record_error(self, endpoint: str, error: str) -> None:
+        """Remember a failed request for diagnostics."""
+        self.recent_errors.append({
+            "time": time.time(),
+            "endpoint": ENDPOINT_NAMES[endpoint],
+            "error": error,
+        })
+    
+    async def _post_raw(
+        self,
+        endpoint: str,
+        payload: Dict[str, Any],
+        timeout: float
+    ) -> Optional[bytes]:
+        """Post to an endpoint and return the raw response body.
+        
+        Uses the shared session, so connections are kept alive between
+        polls.
+        """
+        url = f"{self._base_url}{endpoint}"
+        stats = self._stats[endpoint]
+        start = time.monotonic()
         
         try:
             async with self._session.post(
                 url,
-                json={"ip": "127.0.0.1"},
-                timeout=10
+                json=payload,
+                timeout=aiohttp.ClientTimeout(total=timeout)
             ) as resp:
-                if resp.status != 200:
-                    return None
-                
-                data = await resp.json(content_type=None)
-                if data.get("status") != "success":
-                    return None
-                
-                return data.get("miscdata", {})
-                
-        except (asyncio.TimeoutError, aiohttp.ClientError) as e:
-            _LOGGER.error("Failed to get miscdata: %s", e)
-            return None
+                resp.raise_for_status()
+                raw_bytes = await resp.read()
+        except asyncio.TimeoutError:
+            stats.record_timeout(time.monotonic() - start)
+            self._record_error(endpoint, "timeout")
+            raise
+        except aiohttp.ClientError as e:
+            stats.record_error(time.monotonic() - start)
+            self._record_error(endpoint, f"{type(e).__name__}: {e}")
+            raise
+        
+        stats.record_latency(time.monotonic() - start, len(raw_bytes))
+        return raw_bytes
     
-    async def get_idu_data(self, devs: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-        """Get indoor unit data."""
-        url = f"{self._base_url}/cgi/get_idu_data.shtml"
+    async def _send(
+        self,
+        endpoint: str,
+        payload: Dict[str, Any],
+        timeout: float
+    ) -> bytes:
+        """Send one request and record its outcome on the circuit breaker.
         
+        Runs as the queued job, so a poll shared by several callers counts
+        once.
+        """
         try:
-            async with self._session.post(
-                url,
-                json={"ip": "127.0.0.1", "devs": devs},
-                timeout=15
-            ) as resp:
-                if resp.status != 200:
-                    return None
-                
-                data = await resp.json(content_type=None)
-                if data.get("status") != "success":
-                    return None
-                
-                return data
+            raw_bytes = await self._post_raw(endpoint, payload, timeout)
+        except (asyncio.TimeoutError, aiohttp.ClientError):
+            self._breaker.record_failure()
+            raise
+        except BaseException:
+            # Cancelled before an outcome, let the next trial through
+            self._breaker.release_trial()
+            raise
+        
+        self._breaker.record_success()
+        return raw_bytes
+    
+    async def _request(
+        self,
+        endpoint: str,
+        payload: Dict[str, Any],
+        timeout: float,
+        idempotent: bool = False
+    ) -> bytes:
+        """Send a request through the circuit breaker and request queue.
+        
+        Idempotent requests are queued as polls: they run after pending
+        commands, identical queued polls are merged, and they are retried
+        with jittered exponential backoff. Raises ``CircuitOpenError``
+        without sending while the breaker is open.
+        """
+        attempts = self._retry.attempts if idempotent else 1
+        if idempotent:
+            priority = PRIORITY_POLL
+            key = (endpoint, json.dumps(payload, sort_keys=True))
+        else:
+            priority = PRIORITY_COMMAND
+            key = None
+        
+        for attempt in range(max(1, attempts)):
+            if not self._breaker.allow_request():
+                raise CircuitOpenError(f"Requests to {self._host} are paused")
+            
+            try:
+                return await self._scheduler.submit(
+                    lambda: self._send(endpoint, payload, timeout),
+                    priority,
+                    key
+                )
+            except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+                if attempt + 1 >= attempts or self.circuit_open:
+                    raise
                 
-        except (asyncio.TimeoutError, aiohttp.ClientError) as e:
-            _LOGGER.error("Failed to get IDU data: %s", e)
+                _LOGGER.debug(
+                    "Request to %s%s failed (%s), retrying",
+                    self._host, endpoint, str(e) or type(e).__name__
+                )
+                await asyncio.sleep(self._retry.delay(attempt))
+            except BaseException:
+                # Waiter cancelled, its trial may never get an outcome
+                self._breaker.release_trial()
+                raise
+    
+    async def _post(
+        self,
+        endpoint: str,
+        payload: Dict[str, Any],
+        timeout: float,
+        idempotent: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """Post to an endpoint and decode the response.
+        
+        Returns ``None`` unless the controller reports success.
+        """
+        stats = self._stats[endpoint]
+        raw_bytes = await self._request(endpoint, payload, timeout, idempotent)
+        
+        data = decode_payload(raw_bytes) if raw_bytes else None
+        if not isinstance(data, dict):
+            stats.record_parse_error()
+            self._record_error(endpoint, "unreadable reply")
+            return None
+        
+        if data.get("status") != "success":
+            stats.record_error()
+            self._record_error(endpoint, f"status {data.get('status')!r}")
+            return None
+        
+        stats.record_success()
+        return data
+    
+    @handle_errors(REQUEST_ERRORS, None, "Failed to get miscdata")
+    async def get_miscdata(self) -> Optional[Dict[str, Any]]:
+        """Get device topology."""
+        data = await self._post(
+            ENDPOINT_MISCDATA,
+            {"ip": "127.0.0.1"},
+            10,
+            idempotent=True
+        )
+        if data is None:
+            return None
+        
+        return data.get("miscdata", {})
+    
+    @handle_errors(REQUEST_ERRORS, None, "Failed to get IDU data")
+    async def get_idu_data(
+        self,
+        devs: List[Dict[str, Any]],
+        timeout: float = IDU_DATA_TIMEOUT
+    ) -> Optional[List[IDUUnitData]]:
+        """Get indoor unit data as ``(sys, addr, registers)`` entries."""
+        raw_bytes = await self._request(
+            ENDPOINT_IDU_DATA,
+            {"ip": "127.0.0.1", "devs": devs},
+            timeout,
+            idempotent=True
+        )
+        
+        units = extract_idu_units(raw_bytes)
+        stats = self._stats[ENDPOINT_IDU_DATA]
+        if units is None:
+            stats.record_parse_error()
+            self._record_error(ENDPOINT_IDU_DATA, "unreadable or failed reply")
             return None
+        
+        stats.record_success()
+        return units
     
     async def set_idu(self, sys: int, addr: int, **kwargs) -> bool:
         """Set indoor unit parameters."""
-        url = f"{self._base_url}/cgi/set_idu.shtml"
-        
-        cmd_list = [{
-            "seq": 1,
-            "sys": sys,
-            "iduAddr": addr,
-            "regAddr": 78,
-            "regVal": [
-                kwargs.get("onoff", 1),
-                kwargs.get("mode", 2),
-                kwargs.get("fan", 4),
-                kwargs.get("temp", 24),
-                0
-            ]
-        }]
+        results = await self.set_idu_batch([IDUCommand.from_params(sys, addr, **kwargs)])
+        return results[0]
+    
+    async def set_idu_batch(
+        self,
+        commands: List[IDUCommand],
+        max_batch_size: int = SET_IDU_MAX_BATCH
+    ) -> List[bool]:
+        """Set parameters of many indoor units.
         
-        try:
-            async with self._session.post(
-                url,
-                json={"ip": "127.0.0.1", "cmdList": cmd_list},
-                timeout=10
-            ) as resp:
-                if resp.status != 200:
-                    return False
-                
-                data = await resp.json(content_type=None)
-                return data.get("status") == "success"
-                
-        except (asyncio.TimeoutError, aiohttp.ClientError) as e:
-            _LOGGER.error("Failed to set IDU: %s", e)
-            return False
+        Commands are packed into ``cmdList`` requests of at most
+        ``max_batch_size`` entries. Returns success per command, in order.
+        """
+        results: List[bool] = []
+        batch_size = max(1, max_batch_size)
+        
+        for start in range(0, len(commands), batch_size):
+            batch = commands[start:start + batch_size]
+            success = await self._send_cmd_list(batch)
+            results.extend([success] * len(batch))
+        
+        return results
     
+    @handle_errors(REQUEST_ERRORS, False, "Failed to set IDU")
+    async def _send_cmd_list(self, commands: List[IDUCommand]) -> bool:
+        """Send one set_idu request.
+        
+        Not retried: a timed out write may still have been applied.
+        """
+        cmd_list = [
+            {
+                "seq": seq,
+                "sys": command.sys,
+                "iduAddr": command.addr,
+                "regAddr": SET_IDU_REG_ADDR,
+                "regVal": command.reg_values
+            }
+            for seq, command in enumerate(commands, start=1)
+        ]
+        
+        data = await self._post(
+            ENDPOINT_SET_IDU,
+            {"ip": "127.0.0.1", "cmdList": cmd_list},
+            10
+        )
+        return data is not None
+    
+    @handle_errors(REQUEST_ERRORS, None, "Failed to get power data")
     async def get_power_data(self) -> Optional[float]:
         """Get power meter data."""
-        url = f"{self._base_url}/cgi/get_meter_pwr.shtml"
+        raw_bytes = await self._request(
+            ENDPOINT_METER_PWR,
+            {"ids": self._meter_ids, "ip": self._host},
+            10,
+            idempotent=True
+        )
         
-        try:
-            # Create separate session to avoid MIME-type issues
-            timeout = aiohttp.ClientTimeout(total=10)
-            connector = aiohttp.TCPConnector(limit=1)
-            
-            async with aiohttp.ClientSession(
-                connector=connector,
-                timeout=timeout,
-                headers={"User-Agent": "HomeAssistant"}
-            ) as session:
-                
-                payload = {"ids": ["1", "2"], "ip": self._host}
-                headers = {"Content-Type": "application/json"}
-                
-                async with session.post(
-                    url, 
-                    json=payload, 
-                    headers=headers
-                ) as response:
-                    
-                    if response.status != 200:
-                        return None
-                    
-                    raw_bytes = await response.read()
-                    
-                    try:
-                        raw_text = raw_bytes.decode('ascii')
-                    except UnicodeDecodeError:
-                        raw_text = raw_bytes.decode('utf-8', errors='ignore')
-                    
-                    # Decode ASCII codes if response contains numbers
-                    if raw_text.strip() and all(c.isdigit() or c.isspace() for c in raw_text.strip()):
-                        try:
-                            ascii_codes = [int(x) for x in raw_text.split()]
-                            decoded_text = ''.join(chr(code) for code in ascii_codes)
-                            raw_text = decoded_text
-                        except Exception:
-                            pass
-                    
-                    # Parse JSON
-                    try:
-                        data = json.loads(raw_text)
-                        
-                        if data.get("status") != "success":
-                            return None
-                        
-                        # Find power meter data
-                        for meter in data.get("dats", []):
-                            if isinstance(meter, dict) and "pwr" in meter:
-                                power_value = meter["pwr"]
-                                try:
-                                    power = float(power_value)
-                                    if power >= 0:
-                                        return power
-                                except (ValueError, TypeError):
-                                    continue
-                        
-                        return None
-                        
-                    except json.JSONDecodeError:
-                        return None
-                        
-        except (asyncio.TimeoutError, aiohttp.ClientError) as e:
-            _LOGGER.error("Failed to get power data: %s", e)
-            return None
\ No newline at end of file
+        powers = extract_meter_powers(raw_bytes)
+        stats = self._stats[ENDPOINT_METER_PWR]
+        if powers is None:
+            stats.record_parse_error()
+            self._record_error(ENDPOINT_METER_PWR, "unreadable or failed reply")
+            return None
+        
+        stats.record_success()
+        
+        # Find power meter data
+        for power in powers:
+            if power >= 0:
+                return power
+        
+        return None
\ No newline at end of file
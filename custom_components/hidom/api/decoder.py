@@ -0,0 +1,236 @@
+"""Response decoding for HiDOM API."""
+import json
+import logging
+import re
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from .registers import REGISTER_ARRAY_LENGTH, topology_key
+
+_LOGGER = logging.getLogger(__name__)
+
+# Unit entry of a get_idu_data reply: system, unit address, registers
+IDUUnitData = Tuple[int, int, Sequence[Any]]
+
+# JSON parsers by backend name
+JSON_BACKENDS = {"json": json.loads}
+if orjson is not None:
+    JSON_BACKENDS["orjson"] = orjson.loads
+
+_json_loads: Callable[[bytes], Any] = json.loads
+json_backend = "json"
+
+# First bytes of an ASCII-code encoded body
+_ASCII_CODE_DIGITS = frozenset(b"0123456789")
+
+# Byte value of every decimal code, faster than int() per token
+_ASCII_CODE_TABLE = {str(code).encode("ascii"): code for code in range(256)}
+
+# Reply fields, matched on the raw JSON bytes
+_STATUS_RE = re.compile(rb'"status"\s*:\s*"([^"]*)"')
+_METER_PWR_RE = re.compile(rb'"pwr"\s*:\s*"?(-?\d+(?:\.\d*)?(?:[eE][-+]?\d+)?)')
+_STATUS_KEY = b'"status"'
+_PWR_KEY = b'"pwr"'
+
+# dats entry with its register array, in the order the controller sends
+_IDU_UNIT_RE = re.compile(
+    rb'\{\s*"sys"\s*:\s*"?(\d+)"?\s*,\s*"addr"\s*:\s*"?(\d+)"?\s*,'
+    rb'\s*"data"\s*:\s*\[([^\]]*)\]'
+)
+_DATA_KEY = b'"data"'
+
+# Bytes of register arrays holding plain integers only
+_INTEGER_ARRAY_BYTES = b"0123456789-, \t\r\n"
+
+def set_json_backend(name: str = "auto") -> str:
+    """Select the JSON parser used for replies.
+    
+    ``"auto"`` picks the fastest installed backend. Returns the name of
+    the backend in use.
+    """
+    global _json_loads, json_backend
+    
+    if name == "auto":
+        name = "orjson" if "orjson" in JSON_BACKENDS else "json"
+    if name not in JSON_BACKENDS:
+        raise ValueError(f"JSON backend {name} is not available")
+    
+    _json_loads = JSON_BACKENDS[name]
+    json_backend = name
+    return name
+
+def is_ascii_code_payload(raw_bytes: bytes) -> bool:
+    """Detect the ASCII-code encoding from the first non-blank byte."""
+    body = raw_bytes.lstrip()
+    return bool(body) and body[0] in _ASCII_CODE_DIGITS
+
+def decode_ascii_codes(raw_bytes: bytes) -> bytes:
+    """Decode a body sent as space-separated decimal ASCII codes."""
+    try:
+        return bytes(map(_ASCII_CODE_TABLE.__getitem__, raw_bytes.split()))
+    except KeyError as e:
+        raise ValueError(f"Invalid ASCII code {e}") from None
+
+def _json_body(raw_bytes: bytes) -> bytes:
+    """Return the JSON document of a response body."""
+    if is_ascii_code_payload(raw_bytes):
+        return decode_ascii_codes(raw_bytes)
+    return raw_bytes
+
+def _parse_json(body: bytes) -> Any:
+    """Parse a JSON document, dropping bytes that are not valid UTF-8.
+    
+    Controllers may send a stray byte of another encoding in unit names,
+    which must not cost the whole reply.
+    """
+    try:
+        return _json_loads(body)
+    except ValueError:
+        text = body.decode("utf-8", errors="ignore")
+        if len(text.encode("utf-8")) == len(body):
+            # Valid UTF-8, the document itself is malformed
+            raise
+        return _json_loads(text)
+
+def _match_status(body: bytes) -> Optional[bytes]:
+    """Return the reply status matched on the raw bytes.
+    
+    ``None`` unless the body holds exactly one status field, which is
+    then the top-level one.
+    """
+    if body.count(_STATUS_KEY) != 1:
+        return None
+    
+    status = _STATUS_RE.search(body)
+    return status.group(1) if status is not None else None
+
+def decode_payload(raw_bytes: bytes) -> Optional[Any]:
+    """Decode a JSON response body regardless of its content type.
+    
+    Some firmware versions send the JSON document as space-separated
+    decimal ASCII codes, which is handled transparently.
+    """
+    try:
+        return _parse_json(_json_body(raw_bytes))
+    except (ValueError, UnicodeDecodeError) as e:
+        _LOGGER.debug("Failed to parse response: %s", e)
+        return None
+
+def extract_meter_powers(raw_bytes: bytes) -> Optional[List[float]]:
+    """Extract ``dats[*].pwr`` values from a get_meter_pwr body.
+    
+    Works on the raw bytes without building the JSON document when the
+    body has one status field and one numeric ``pwr`` per object below
+    the top level. Other layouts are parsed in full. Returns ``None``
+    unless the controller reports success.
+    """
+    try:
+        body = _json_body(raw_bytes)
+    except ValueError as e:
+        _LOGGER.debug("Failed to decode meter response: %s", e)
+        return None
+    
+    status = _match_status(body)
+    if status is not None:
+        powers = _METER_PWR_RE.findall(body)
+        if len(powers) == body.count(_PWR_KEY) == body.count(b"{") - 1:
+            if status != b"success":
+                return None
+            return [float(value) for value in powers]
+    
+    try:
+        data = _parse_json(body)
+    except ValueError as e:
+        _LOGGER.debug("Failed to parse meter response: %s", e)
+        return None
+    
+    if not isinstance(data, dict) or data.get("status") != "success":
+        return None
+    
+    powers = []
+    for meter in data.get("dats", []):
+        if not isinstance(meter, dict) or "pwr" not in meter:
+            continue
+        try:
+            powers.append(float(meter["pwr"]))
+        except (ValueError, TypeError):
+            continue
+    
+    return powers
+
+def _split_registers(array: bytes) -> Sequence[Any]:
+    """Return the values of a raw register array.
+    
+    Plain integer arrays are only split. Arrays holding quoted, decimal
+    or other values are parsed, so they convert like a full parse.
+    """
+    if array.translate(None, _INTEGER_ARRAY_BYTES):
+        return _json_loads(b"[" + array + b"]")
+    
+    # Registers past the register map stay unsplit
+    return array.split(b",", REGISTER_ARRAY_LENGTH)
+
+def _match_idu_units(body: bytes) -> Optional[List[IDUUnitData]]:
+    """Match the units of a successful reply on the raw bytes.
+    
+    Returns ``None`` when the layout is not covered by the matcher.
+    """
+    try:
+        units = [
+            (int(match.group(1)), int(match.group(2)), _split_registers(match.group(3)))
+            for match in _IDU_UNIT_RE.finditer(body)
+        ]
+    except (ValueError, UnicodeDecodeError):
+        return None
+    
+    if len(units) != body.count(_DATA_KEY):
+        return None
+    return units
+
+def extract_idu_units(raw_bytes: bytes) -> Optional[List[IDUUnitData]]:
+    """Extract system, address and registers of every unit of a get_idu_data body.
+    
+    With the stdlib backend the ``dats`` entries are matched on the raw
+    bytes and plain integer register arrays are only split; values are
+    converted when the register map reads them. A faster JSON backend
+    parses the body in full instead. Both give the same register values.
+    Layouts the matcher does not cover, including nested status fields,
+    are parsed in full as well. Returns ``None`` unless the controller reports success.
+    """
+    try:
+        body = _json_body(raw_bytes)
+    except ValueError as e:
+        _LOGGER.debug("Failed to decode IDU response: %s", e)
+        return None
+    
+    status = _match_status(body) if json_backend == "json" else None
+    if status is not None:
+        if status != b"success":
+            return None
+        
+        units = _match_idu_units(body)
+        if units is not None:
+            return units
+    
+    try:
+        data = _parse_json(body)
+    except ValueError as e:
+        _LOGGER.debug("Failed to parse IDU response: %s", e)
+        return None
+    
+    if not isinstance(data, dict) or data.get("status") != "success":
+        return None
+    
+    units = []
+    for item in data.get("dats", []):
+        key = topology_key(item.get("sys"), item.get("addr"))
+        if key is not None:
+            units.append((*key, item.get("data", [])))
+    
+    return units
+
+set_json_backend()
\ No newline at end of file
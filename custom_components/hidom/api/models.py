@@ -1,13 +1,36 @@
 """Data models for HiDOM API."""
-from dataclasses import dataclass
-from typing import Optional, Dict, Any
+from dataclasses import asdict, dataclass
+from typing import Optional, Dict, Any, List, Tuple
 
-@dataclass
-class IDUDevice:
-    """Indoor unit model."""
+from .registers import (
+    COMMAND_FIELDS,
+    FIELD_FLAGS,
+    STATE_FIELDS,
+    apply_fields,
+    apply_registers,
+    decode_registers,
+)
+from ..const import MODE_COOL, FAN_MID
+
+def make_uid(sys: int, addr: int) -> str:
+    """Build unique device identifier from system and unit address."""
+    return f"S{sys}_{addr}"
+
+def parse_uid(uid: str) -> Optional[Tuple[int, int]]:
+    """Parse system and unit address from a device identifier."""
+    try:
+        s_part, addr_part = uid.split('_')
+        return int(s_part[1:]), int(addr_part)
+    except (ValueError, AttributeError):
+        return None
+
+@dataclass(frozen=True, slots=True)
+class IDUInfo:
+    """Static topology data of an indoor unit, shared across polls."""
     sys: int
     addr: int
-    name: str
+    uid: str
+    name: str = ""
     code: str = ""
     pname: str = ""
     ppname: str = ""
@@ -15,40 +38,25 @@ class IDUDevice:
     indoor_name: str = ""
     tenant_name: str = ""
     
-    # State data
-    power: int = 0
-    mode_code: int = 2
-    fan_code: int = 4
-    set_temp: int = 24
-    error_code: int = 0
-    room_temp: Optional[float] = None
-    pipe_temp: Optional[float] = None
-    
-    # Lock registers
-    model1: int = 0
-    model2: int = 0
-    model3: int = 0
-    model4: int = 0
-    model5: int = 0
-    
-    # Transformed values
-    mode: str = "cool"
-    fan: str = "auto"
-    status: str = "off"
-    
-    @property
-    def uid(self) -> str:
-        """Unique device identifier."""
-        return f"S{self.sys}_{self.addr}"
-    
     @classmethod
-    def from_api_data(cls, topo_item: Dict[str, Any], idu_data: Dict[str, Any]) -> 'IDUDevice':
-        """Create from API data."""
-        raw_data = idu_data.get("data", [])
+    def from_topology(
+        cls,
+        topo_item: Dict[str, Any],
+        idu_data: Optional[Dict[str, Any]] = None
+    ) -> 'IDUInfo':
+        """Create from a topology item.
+        
+        System and address fall back to ``idu_data`` for units missing
+        from the topology.
+        """
+        idu_data = idu_data or {}
+        sys = int(topo_item.get("sysAdr", idu_data.get("sys", 1)))
+        addr = int(topo_item.get("address", idu_data.get("addr", 1)))
         
-        device = cls(
-            sys=topo_item.get("sysAdr", 1),
-            addr=int(topo_item.get("address", 1)),
+        return cls(
+            sys=sys,
+            addr=addr,
+            uid=make_uid(sys, addr),
             name=topo_item.get("name", ""),
             code=topo_item.get("code", ""),
             pname=topo_item.get("pname", ""),
@@ -56,23 +64,183 @@ class IDUDevice:
             pppname=topo_item.get("pppname", ""),
             indoor_name=topo_item.get("indoorName", ""),
             tenant_name=topo_item.get("tenantName", ""),
-            
-            power=raw_data[28] if len(raw_data) > 28 else 0,
-            mode_code=raw_data[29] if len(raw_data) > 29 else 2,
-            fan_code=raw_data[30] if len(raw_data) > 30 else 4,
-            set_temp=raw_data[31] if len(raw_data) > 31 else 24,
-            error_code=raw_data[35] if len(raw_data) > 35 else 0,
-            room_temp=raw_data[39] if len(raw_data) > 39 else None,
-            pipe_temp=raw_data[38] if len(raw_data) > 38 else None,
-            
-            model1=raw_data[72] if len(raw_data) > 72 else 0,
-            model2=raw_data[73] if len(raw_data) > 73 else 0,
-            model3=raw_data[74] if len(raw_data) > 74 else 0,
-            model4=raw_data[75] if len(raw_data) > 75 else 0,
-            model5=raw_data[77] if len(raw_data) > 77 else 0,
         )
+
+# State of a unit without register data
+DEFAULT_STATE: Dict[str, Any] = decode_registers([])
+
+# Every change flag set
+ALL_FIELDS = sum(FIELD_FLAGS.values())
+
+class IDUDevice:
+    """Indoor unit model.
+    
+    Static topology data lives in ``info``; state fields are slots
+    updated in place, so one object serves a unit across all polls.
+    ``changed`` holds the ``FIELD_FLAGS`` of the fields changed by the
+    last update.
+    """
+    
+    __slots__ = ("info", "changed") + STATE_FIELDS
+    
+    def __init__(self, info: IDUInfo):
+        """Initialize with default state."""
+        self.info = info
+        self.changed = 0
         
+        for field, value in DEFAULT_STATE.items():
+            setattr(self, field, value)
+    
+    def __repr__(self) -> str:
+        """Return readable representation."""
+        return f"IDUDevice({self.info.uid}, {self.as_dict()})"
+    
+    @property
+    def uid(self) -> str:
+        """Unique device identifier."""
+        return self.info.uid
+    
+    @property
+    def sys(self) -> int:
+        """System address."""
+        return self.info.sys
+    
+    @property
+    def addr(self) -> int:
+        """Unit address."""
+        return self.info.addr
+    
+    @property
+    def name(self) -> str:
+        """Unit name."""
+        return self.info.name
+    
+    @property
+    def code(self) -> str:
+        """Unit code."""
+        return self.info.code
+    
+    @property
+    def pname(self) -> str:
+        """Room name."""
+        return self.info.pname
+    
+    @property
+    def ppname(self) -> str:
+        """Floor name."""
+        return self.info.ppname
+    
+    @property
+    def pppname(self) -> str:
+        """Building name."""
+        return self.info.pppname
+    
+    @property
+    def indoor_name(self) -> str:
+        """Indoor unit name."""
+        return self.info.indoor_name
+    
+    @property
+    def tenant_name(self) -> str:
+        """Tenant name."""
+        return self.info.tenant_name
+    
+    @classmethod
+    def from_topology(cls, topo_item: Dict[str, Any]) -> 'IDUDevice':
+        """Create from topology only, without state data."""
+        return cls(IDUInfo.from_topology(topo_item))
+    
+    @classmethod
+    def from_api_data(cls, topo_item: Dict[str, Any], idu_data: Dict[str, Any]) -> 'IDUDevice':
+        """Create from API data."""
+        device = cls(IDUInfo.from_topology(topo_item, idu_data))
+        device.update_registers(idu_data.get("data", []))
         return device
+    
+    def has_changed(self, *fields: str) -> bool:
+        """Check whether the last update changed any of ``fields``."""
+        return any(self.changed & FIELD_FLAGS[field] for field in fields)
+    
+    def update_registers(self, raw_data: List[Any]) -> int:
+        """Apply an IDU data array and return the changed field flags."""
+        self.changed = apply_registers(self, raw_data)
+        return self.changed
+    
+    def apply_params(self, **params) -> int:
+        """Apply command parameters and return the changed field flags."""
+        self.changed = apply_fields(self, {
+            COMMAND_FIELDS[key]: value
+            for key, value in params.items()
+            if key in COMMAND_FIELDS
+        })
+        return self.changed
+    
+    def snapshot(self) -> Tuple[Any, ...]:
+        """Return state values for a later ``restore``."""
+        return tuple(getattr(self, field) for field in STATE_FIELDS)
+    
+    def restore(self, snapshot: Tuple[Any, ...]) -> int:
+        """Restore state values and return the changed field flags."""
+        changed = 0
+        
+        for field, value in zip(STATE_FIELDS, snapshot):
+            if value != getattr(self, field):
+                setattr(self, field, value)
+                changed |= FIELD_FLAGS[field]
+        
+        self.changed = changed
+        return changed
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Return topology and state fields as dictionary."""
+        return {
+            **asdict(self.info),
+            **{field: getattr(self, field) for field in STATE_FIELDS},
+        }
+    
+    def matches_params(self, params: Dict[str, Any]) -> bool:
+        """Check whether the state reflects command parameters."""
+        if params.get("onoff") == 0:
+            # Switched off units may report any mode
+            return self.power == 0
+        
+        return all(
+            getattr(self, COMMAND_FIELDS[key]) == value
+            for key, value in params.items()
+            if key in COMMAND_FIELDS
+        )
+
+@dataclass
+class IDUCommand:
+    """Register write for a single indoor unit."""
+    sys: int
+    addr: int
+    onoff: int = 1
+    mode: int = MODE_COOL
+    fan: int = FAN_MID
+    temp: int = 24
+    
+    @property
+    def uid(self) -> str:
+        """Unique device identifier."""
+        return make_uid(self.sys, self.addr)
+    
+    @property
+    def reg_values(self) -> List[int]:
+        """Register values written starting at the command register."""
+        return [self.onoff, self.mode, self.fan, self.temp, 0]
+    
+    @classmethod
+    def from_params(cls, sys: int, addr: int, **params) -> 'IDUCommand':
+        """Create from ``onoff``/``mode``/``fan``/``temp`` parameters."""
+        return cls(
+            sys=sys,
+            addr=addr,
+            onoff=params.get("onoff", 1),
+            mode=params.get("mode", MODE_COOL),
+            fan=params.get("fan", FAN_MID),
+            temp=params.get("temp", 24)
+        )
 
 @dataclass
 class PowerData:
@@ -0,0 +1,216 @@
+"""Register map for IDU data arrays."""
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from ..const import (
+    DATA_ONOFF,
+    DATA_MODE,
+    DATA_FAN,
+    DATA_SET_TEMP,
+    DATA_ERROR_CODE,
+    DATA_PIPE_TEMP,
+    DATA_ROOM_TEMP,
+    DATA_MODEL1,
+    DATA_MODEL2,
+    DATA_MODEL3,
+    DATA_MODEL4,
+    DATA_MODEL5,
+    MODE_MAP,
+    MODE_COOL,
+    FAN_MAP,
+    FAN_MID,
+    FAN_HIGH_EXTRA_CODES,
+    OFFLINE_ERROR_CODES,
+)
+
+@dataclass(frozen=True)
+class RegisterSpec:
+    """Single register of an IDU data array.
+    
+    ``decoder`` maps the converted value to a readable one stored in
+    ``decoded_field``; values missing from it fall back to
+    ``decoded_default``.
+    """
+    field: str
+    offset: int
+    type: Callable[[Any], Any] = int
+    scale: float = 1
+    default: Any = 0
+    decoded_field: Optional[str] = None
+    decoder: Optional[Mapping[Any, Any]] = None
+    decoded_default: Any = None
+    
+    def convert(self, value: Any) -> Any:
+        """Convert raw register value."""
+        try:
+            value = self.type(value)
+        except (TypeError, ValueError):
+            return self.default
+        
+        if self.scale != 1:
+            return value * self.scale
+        return value
+
+# Lookup tables
+MODE_LOOKUP: Dict[int, str] = dict(MODE_MAP)
+
+FAN_LOOKUP: Dict[int, str] = dict(FAN_MAP)
+FAN_LOOKUP.update({code: "high" for code in FAN_HIGH_EXTRA_CODES})
+
+ERROR_STATUS_LOOKUP: Dict[int, str] = {
+    code: "offline" for code in OFFLINE_ERROR_CODES
+}
+
+POWER_STATUS_LOOKUP: Dict[int, str] = {1: "on"}
+
+IDU_REGISTERS: Tuple[RegisterSpec, ...] = (
+    RegisterSpec("power", DATA_ONOFF),
+    RegisterSpec(
+        "mode_code", DATA_MODE, default=MODE_COOL,
+        decoded_field="mode", decoder=MODE_LOOKUP, decoded_default="cool"
+    ),
+    RegisterSpec(
+        "fan_code", DATA_FAN, default=FAN_MID,
+        decoded_field="fan", decoder=FAN_LOOKUP, decoded_default="medium"
+    ),
+    RegisterSpec("set_temp", DATA_SET_TEMP, default=24),
+    RegisterSpec("error_code", DATA_ERROR_CODE),
+    RegisterSpec("pipe_temp", DATA_PIPE_TEMP, type=float, default=None),
+    RegisterSpec("room_temp", DATA_ROOM_TEMP, type=float, default=None),
+    RegisterSpec("model1", DATA_MODEL1),
+    RegisterSpec("model2", DATA_MODEL2),
+    RegisterSpec("model3", DATA_MODEL3),
+    RegisterSpec("model4", DATA_MODEL4),
+    RegisterSpec("model5", DATA_MODEL5),
+)
+
+# Arrays at least this long need no per-register bounds checks
+REGISTER_ARRAY_LENGTH = max(spec.offset for spec in IDU_REGISTERS) + 1
+
+# Registers with a readable representation
+DECODED_REGISTERS = tuple(spec for spec in IDU_REGISTERS if spec.decoder is not None)
+
+# Fields of the mutable unit state, in change flag order
+STATE_FIELDS: Tuple[str, ...] = tuple(
+    name
+    for spec in IDU_REGISTERS
+    for name in (spec.field, spec.decoded_field)
+    if name is not None
+) + ("status",)
+
+# Change flag bit of every state field
+FIELD_FLAGS: Dict[str, int] = {
+    name: 1 << index for index, name in enumerate(STATE_FIELDS)
+}
+
+# Command parameters and the register fields they write
+COMMAND_FIELDS: Dict[str, str] = {
+    "onoff": "power",
+    "mode": "mode_code",
+    "fan": "fan_code",
+    "temp": "set_temp",
+}
+
+def decode_status(error_code: int, power: int) -> str:
+    """Decode unit status from error code and power register."""
+    if error_code != 0:
+        return ERROR_STATUS_LOOKUP.get(error_code, "alarm")
+    return POWER_STATUS_LOOKUP.get(power, "off")
+
+def decode_fields(values: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill readable fields for the register fields present in ``values``."""
+    for spec in DECODED_REGISTERS:
+        if spec.field in values:
+            values[spec.decoded_field] = spec.decoder.get(values[spec.field], spec.decoded_default)
+    
+    if "error_code" in values and "power" in values:
+        values["status"] = decode_status(values["error_code"], values["power"])
+    
+    return values
+
+def decode_registers(raw_data: List[Any]) -> Dict[str, Any]:
+    """Decode all mapped registers of an IDU data array in one pass."""
+    values: Dict[str, Any] = {}
+    complete = len(raw_data) >= REGISTER_ARRAY_LENGTH
+    
+    for spec in IDU_REGISTERS:
+        if complete or spec.offset < len(raw_data):
+            value = spec.convert(raw_data[spec.offset])
+        else:
+            value = spec.default
+        
+        values[spec.field] = value
+        
+        if spec.decoder is not None:
+            values[spec.decoded_field] = spec.decoder.get(value, spec.decoded_default)
+    
+    values["status"] = decode_status(values["error_code"], values["power"])
+    
+    return values
+
+def apply_registers(state: Any, raw_data: List[Any]) -> int:
+    """Decode an IDU data array into ``state`` in place.
+    
+    Only fields whose value differs are assigned. Returns the
+    ``FIELD_FLAGS`` of the changed fields.
+    """
+    changed = 0
+    complete = len(raw_data) >= REGISTER_ARRAY_LENGTH
+    
+    for spec in IDU_REGISTERS:
+        if complete or spec.offset < len(raw_data):
+            value = spec.convert(raw_data[spec.offset])
+        else:
+            value = spec.default
+        
+        if value == getattr(state, spec.field):
+            continue
+        
+        setattr(state, spec.field, value)
+        changed |= FIELD_FLAGS[spec.field]
+        
+        if spec.decoder is not None:
+            decoded = spec.decoder.get(value, spec.decoded_default)
+            if decoded != getattr(state, spec.decoded_field):
+                setattr(state, spec.decoded_field, decoded)
+                changed |= FIELD_FLAGS[spec.decoded_field]
+    
+    if changed:
+        status = decode_status(state.error_code, state.power)
+        if status != state.status:
+            state.status = status
+            changed |= FIELD_FLAGS["status"]
+    
+    return changed
+
+def apply_fields(state: Any, values: Mapping[str, Any]) -> int:
+    """Assign register fields to ``state`` and refresh the readable ones.
+    
+    Returns the ``FIELD_FLAGS`` of the changed fields.
+    """
+    changed = 0
+    
+    for field, value in values.items():
+        if value != getattr(state, field):
+            setattr(state, field, value)
+            changed |= FIELD_FLAGS[field]
+    
+    if changed:
+        decoded = decode_fields({
+            "power": state.power,
+            "error_code": state.error_code,
+            **{spec.field: getattr(state, spec.field) for spec in DECODED_REGISTERS},
+        })
+        for field in (*(spec.decoded_field for spec in DECODED_REGISTERS), "status"):
+            if decoded[field] != getattr(state, field):
+                setattr(state, field, decoded[field])
+                changed |= FIELD_FLAGS[field]
+    
+    return changed
+
+def topology_key(sys: Any, addr: Any) -> Optional[Tuple[int, int]]:
+    """Build topology index key from system and unit address."""
+    try:
+        return int(sys), int(addr)
+    except (TypeError, ValueError):
+        return None
\ No newline at end of file
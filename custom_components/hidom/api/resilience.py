@@ -0,0 +1,143 @@
+"""Retry and circuit breaker for HiDOM API."""
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Dict
+
+from ..const import (
+    RETRY_ATTEMPTS,
+    RETRY_BASE_DELAY,
+    RETRY_MAX_DELAY,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_TIMEOUT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Bounded retries with jittered exponential backoff."""
+    attempts: int = RETRY_ATTEMPTS
+    base_delay: float = RETRY_BASE_DELAY
+    max_delay: float = RETRY_MAX_DELAY
+    
+    def delay(self, attempt: int) -> float:
+        """Return delay before retry number ``attempt`` (starting at 0)."""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(ceiling / 2, ceiling)
+
+class CircuitBreaker:
+    """Circuit breaker for a single controller.
+    
+    Opens after ``failure_threshold`` consecutive failures. While open,
+    requests fail fast; after ``reset_timeout`` seconds one trial request
+    is let through and its result closes or reopens the breaker.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = BREAKER_RESET_TIMEOUT
+    ):
+        """Initialize."""
+        self._name = name
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._state = STATE_CLOSED
+        self._failures = 0
+        self._opened_at: float = 0
+        self._trial_running = False
+    
+    @property
+    def state(self) -> str:
+        """Return breaker state."""
+        if self._state == STATE_OPEN and self._reset_due():
+            return STATE_HALF_OPEN
+        return self._state
+    
+    @property
+    def failures(self) -> int:
+        """Return number of consecutive failures."""
+        return self._failures
+    
+    def _reset_due(self) -> bool:
+        """Check whether the open period is over."""
+        return time.monotonic() - self._opened_at >= self._reset_timeout
+    
+    def allow_request(self) -> bool:
+        """Check whether a request may be sent now."""
+        if self._state == STATE_CLOSED:
+            return True
+        
+        if self._state == STATE_OPEN and self._reset_due():
+            self._state = STATE_HALF_OPEN
+            self._trial_running = False
+        
+        if self._state == STATE_HALF_OPEN and not self._trial_running:
+            self._trial_running = True
+            return True
+        
+        return False
+    
+    def record_success(self) -> None:
+        """Record a successful request."""
+        if self._state != STATE_CLOSED:
+            _LOGGER.info("Connection to %s restored", self._name)
+        
+        self._state = STATE_CLOSED
+        self._failures = 0
+        self._trial_running = False
+    
+    def record_failure(self) -> None:
+        """Record a failed request."""
+        self._failures += 1
+        self._trial_running = False
+        
+        if self._state == STATE_HALF_OPEN or (
+            self._state == STATE_CLOSED and self._failures >= self._failure_threshold
+        ):
+            if self._state == STATE_CLOSED:
+                _LOGGER.warning(
+                    "%s failed %s times in a row, pausing requests for %s s",
+                    self._name, self._failures, self._reset_timeout
+                )
+            
+            self._state = STATE_OPEN
+            self._opened_at = time.monotonic()
+    
+    def release_trial(self) -> None:
+        """Free the trial slot of a request that ended without an outcome.
+        
+        A cancelled trial records neither success nor failure, so the
+        breaker would otherwise stay half open and refuse every request.
+        """
+        if self._state == STATE_HALF_OPEN:
+            self._trial_running = False
+    
+    def reset(self) -> None:
+        """Close the breaker and forget past failures."""
+        self._state = STATE_CLOSED
+        self._failures = 0
+        self._trial_running = False
+
+# One breaker per controller host
+_BREAKERS: Dict[str, CircuitBreaker] = {}
+
+def get_circuit_breaker(host: str) -> CircuitBreaker:
+    """Return the shared circuit breaker of a controller host."""
+    breaker = _BREAKERS.get(host)
+    if breaker is None:
+        breaker = _BREAKERS[host] = CircuitBreaker(f"HiDOM {host}")
+    return breaker
+
+def reset_circuit_breaker(host: str) -> None:
+    """Reset the circuit breaker of a controller host, if there is one."""
+    breaker = _BREAKERS.get(host)
+    if breaker is not None:
+        breaker.reset()
\ No newline at end of file
@@ -0,0 +1,175 @@
+"""Per-controller request scheduler for HiDOM API."""
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+from ..const import REQUEST_CONCURRENCY
+
+_LOGGER = logging.getLogger(__name__)
+
+# Lower value runs first
+PRIORITY_COMMAND = 0
+PRIORITY_POLL = 1
+
+@dataclass(order=True)
+class _Job:
+    """Queued request."""
+    priority: int
+    seq: int
+    func: Callable[[], Awaitable[Any]] = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    key: Optional[Hashable] = field(compare=False, default=None)
+    queued_at: float = field(compare=False, default=0)
+
+@dataclass
+class _WaitStats:
+    """Wait time statistics of one priority."""
+    count: int = 0
+    total: float = 0
+    max: float = 0
+    
+    def add(self, wait: float) -> None:
+        """Record a wait time."""
+        self.count += 1
+        self.total += wait
+        self.max = max(self.max, wait)
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Return statistics as dictionary."""
+        return {
+            "count": self.count,
+            "mean_wait": round(self.total / self.count, 4) if self.count else 0,
+            "max_wait": round(self.max, 4),
+        }
+
+class HiDOMRequestScheduler:
+    """Queue that serializes requests to one controller.
+    
+    At most ``concurrency`` requests run at once. Commands are started
+    before queued polls, and a poll that is already queued under the same
+    key is shared instead of being sent twice.
+    """
+    
+    def __init__(self, name: str, concurrency: int = REQUEST_CONCURRENCY):
+        """Initialize."""
+        self._name = name
+        self.concurrency = concurrency
+        self._queue: List[_Job] = []
+        self._queued_keys: Dict[Hashable, asyncio.Future] = {}
+        self._seq = itertools.count()
+        self._running = 0
+        self._tasks = set()
+        self._waits = {PRIORITY_COMMAND: _WaitStats(), PRIORITY_POLL: _WaitStats()}
+        self.max_depth = 0
+        self.merged = 0
+    
+    @property
+    def depth(self) -> int:
+        """Return number of queued requests."""
+        return len(self._queue)
+    
+    @property
+    def running(self) -> int:
+        """Return number of running requests."""
+        return self._running
+    
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Return queue statistics."""
+        return {
+            "depth": self.depth,
+            "running": self._running,
+            "max_depth": self.max_depth,
+            "merged": self.merged,
+            "commands": self._waits[PRIORITY_COMMAND].as_dict(),
+            "polls": self._waits[PRIORITY_POLL].as_dict(),
+        }
+    
+    async def submit(
+        self,
+        func: Callable[[], Awaitable[Any]],
+        priority: int = PRIORITY_POLL,
+        key: Optional[Hashable] = None
+    ) -> Any:
+        """Queue a request and wait for its result.
+        
+        ``func`` is called once a slot is free. Requests queued with the
+        same ``key`` share one call.
+        """
+        if key is not None:
+            future = self._queued_keys.get(key)
+            if future is not None:
+                self.merged += 1
+                return await asyncio.shield(future)
+        
+        future = asyncio.get_running_loop().create_future()
+        job = _Job(priority, next(self._seq), func, future, key, time.monotonic())
+        heapq.heappush(self._queue, job)
+        if key is not None:
+            self._queued_keys[key] = future
+        
+        self.max_depth = max(self.max_depth, len(self._queue))
+        self._dispatch()
+        
+        return await asyncio.shield(future)
+    
+    def _dispatch(self) -> None:
+        """Start queued requests while slots are free."""
+        while self._queue and self._running < max(1, self.concurrency):
+            job = heapq.heappop(self._queue)
+            if job.key is not None:
+                self._queued_keys.pop(job.key, None)
+            
+            wait = time.monotonic() - job.queued_at
+            self._waits[job.priority].add(wait)
+            if wait > 1:
+                _LOGGER.debug(
+                    "%s: request waited %.2f s, %s still queued",
+                    self._name, wait, len(self._queue)
+                )
+            
+            self._running += 1
+            task = asyncio.create_task(self._run(job))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+    
+    async def _run(self, job: _Job) -> None:
+        """Run one request and resolve its future."""
+        try:
+            result = await job.func()
+        except asyncio.CancelledError:
+            job.future.cancel()
+            raise
+        except Exception as e:
+            if not job.future.done():
+                job.future.set_exception(e)
+        else:
+            if not job.future.done():
+                job.future.set_result(result)
+        finally:
+            self._running -= 1
+            self._dispatch()
+
+# One scheduler per controller host
+_SCHEDULERS: Dict[str, HiDOMRequestScheduler] = {}
+
+def get_request_scheduler(
+    host: str,
+    concurrency: int = REQUEST_CONCURRENCY
+) -> HiDOMRequestScheduler:
+    """Return the shared request scheduler of a controller host.
+    
+    The scheduler keeps the highest ``concurrency`` any client of the
+    host asked for, so a later client cannot lower the limit of others.
+    """
+    scheduler = _SCHEDULERS.get(host)
+    if scheduler is None:
+        scheduler = _SCHEDULERS[host] = HiDOMRequestScheduler(f"HiDOM {host}", concurrency)
+    else:
+        scheduler.concurrency = max(scheduler.concurrency, concurrency)
+    
+    return scheduler
\ No newline at end of file
@@ -0,0 +1,106 @@
+"""Per-endpoint request statistics for HiDOM API."""
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from ..const import STATS_LATENCY_BUCKETS
+
+class EndpointStats:
+    """Latency histogram and outcome counters of one endpoint.
+    
+    Latency is recorded per HTTP request, outcomes per decoded reply.
+    """
+    
+    def __init__(self, name: str, buckets: Sequence[float] = STATS_LATENCY_BUCKETS):
+        """Initialize."""
+        self.name = name
+        self.buckets = tuple(buckets)
+        # Last bucket counts requests slower than all bounds
+        self.histogram: List[int] = [0] * (len(self.buckets) + 1)
+        self.requests = 0
+        self.successes = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.parse_errors = 0
+        self.bytes_received = 0
+        self.total_latency: float = 0
+        self.last_latency: Optional[float] = None
+        self.last_success: Optional[float] = None
+    
+    def record_latency(self, latency: float, size: int = 0) -> None:
+        """Record a finished HTTP request."""
+        self.requests += 1
+        self.total_latency += latency
+        self.last_latency = latency
+        self.bytes_received += size
+        
+        for index, bound in enumerate(self.buckets):
+            if latency <= bound:
+                self.histogram[index] += 1
+                return
+        self.histogram[-1] += 1
+    
+    def record_success(self) -> None:
+        """Record a usable reply."""
+        self.successes += 1
+        self.last_success = time.time()
+    
+    def record_timeout(self, latency: float) -> None:
+        """Record a timed out request."""
+        self.record_latency(latency)
+        self.timeouts += 1
+    
+    def record_error(self, latency: Optional[float] = None) -> None:
+        """Record a connection error, HTTP error or failed status."""
+        if latency is not None:
+            self.record_latency(latency)
+        self.errors += 1
+    
+    def record_parse_error(self) -> None:
+        """Record a reply that could not be decoded."""
+        self.parse_errors += 1
+    
+    @property
+    def mean_latency(self) -> Optional[float]:
+        """Return mean latency in seconds."""
+        if not self.requests:
+            return None
+        return self.total_latency / self.requests
+    
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Return the histogram bucket bound holding the given fraction."""
+        if not self.requests:
+            return None
+        
+        target = fraction * self.requests
+        seen = 0
+        for index, count in enumerate(self.histogram[:-1]):
+            seen += count
+            if seen >= target:
+                return self.buckets[index]
+        
+        # Beyond the largest bound
+        return None
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Return statistics as dictionary."""
+        mean = self.mean_latency
+        histogram = {
+            f"le_{bound:g}": count
+            for bound, count in zip(self.buckets, self.histogram)
+        }
+        histogram["gt_max"] = self.histogram[-1]
+        
+        return {
+            "requests": self.requests,
+            "successes": self.successes,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "parse_errors": self.parse_errors,
+            "bytes_received": self.bytes_received,
+            "mean_latency": round(mean, 4) if mean is not None else None,
+            "last_latency": round(self.last_latency, 4) if self.last_latency is not None else None,
+            "p50_latency": self.percentile(0.5),
+            "p95_latency": self.percentile(0.95),
+            "last_success": self.last_success,
+            "histogram": histogram,
+        }
\ No newline at end of file
@@ -1,37 +1,81 @@
 """Configuration classes for HiDOM."""
-from dataclasses import dataclass
-from typing import Dict, Any
+from dataclasses import dataclass, field
+from typing import Dict, Any, List
+
+from .const import (
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SENSOR_SCAN_INTERVAL,
+    DEFAULT_TIMEOUT,
+    DEFAULT_METER_IDS,
+    TOPOLOGY_CACHE_TTL,
+    SET_IDU_MAX_BATCH,
+    COMMAND_DEBOUNCE_DELAY,
+    POLL_CHUNK_SIZE,
+    POLL_CONCURRENCY,
+    IDU_DATA_TIMEOUT,
+    REQUEST_CONCURRENCY,
+    POWER_METHOD_EMA,
+    POWER_EMA_ALPHA,
+    HISTORY_SAMPLES,
+    RETRY_ATTEMPTS,
+)
 
 @dataclass
 class HiDOMConfig:
     """Main HiDOM configuration."""
     host: str
-    scan_interval_climate: int = 10
-    scan_interval_sensor: int = 30
-    timeout: int = 10
+    scan_interval_climate: int = DEFAULT_SCAN_INTERVAL
+    scan_interval_sensor: int = DEFAULT_SENSOR_SCAN_INTERVAL
+    timeout: int = DEFAULT_TIMEOUT
+    topology_ttl: int = TOPOLOGY_CACHE_TTL
+    max_batch_size: int = SET_IDU_MAX_BATCH
+    command_delay: float = COMMAND_DEBOUNCE_DELAY
+    meter_ids: List[str] = field(default_factory=lambda: list(DEFAULT_METER_IDS))
+    poll_chunk_size: int = POLL_CHUNK_SIZE
+    poll_by_system: bool = False
+    poll_concurrency: int = POLL_CONCURRENCY
+    poll_timeout: float = IDU_DATA_TIMEOUT
+    adaptive_polling: bool = True
+    request_concurrency: int = REQUEST_CONCURRENCY
+    power_method: str = POWER_METHOD_EMA
+    power_ema_alpha: float = POWER_EMA_ALPHA
+    history_samples: int = HISTORY_SAMPLES
     
     @classmethod
     def from_entry_data(cls, data: Dict[str, Any]) -> 'HiDOMConfig':
         """Create configuration from config entry data."""
         return cls(
             host=data["host"],
-            scan_interval_climate=data.get("scan_interval", 10),
-            scan_interval_sensor=data.get("sensor_scan_interval", 30),
-            timeout=data.get("timeout", 10)
+            scan_interval_climate=data.get("scan_interval", DEFAULT_SCAN_INTERVAL),
+            scan_interval_sensor=data.get("sensor_scan_interval", DEFAULT_SENSOR_SCAN_INTERVAL),
+            timeout=data.get("timeout", DEFAULT_TIMEOUT),
+            topology_ttl=data.get("topology_ttl", TOPOLOGY_CACHE_TTL),
+            max_batch_size=data.get("max_batch_size", SET_IDU_MAX_BATCH),
+            command_delay=data.get("command_delay", COMMAND_DEBOUNCE_DELAY),
+            meter_ids=data.get("meter_ids", list(DEFAULT_METER_IDS)),
+            poll_chunk_size=data.get("poll_chunk_size", POLL_CHUNK_SIZE),
+            poll_by_system=data.get("poll_by_system", False),
+            poll_concurrency=data.get("poll_concurrency", POLL_CONCURRENCY),
+            poll_timeout=data.get("poll_timeout", IDU_DATA_TIMEOUT),
+            adaptive_polling=data.get("adaptive_polling", True),
+            request_concurrency=data.get("request_concurrency", REQUEST_CONCURRENCY),
+            power_method=data.get("power_method", POWER_METHOD_EMA),
+            power_ema_alpha=data.get("power_ema_alpha", POWER_EMA_ALPHA),
+            history_samples=data.get("history_samples", HISTORY_SAMPLES)
         )
 
 @dataclass
 class DeviceConfig:
     """Device configuration."""
     name: str
-    scan_interval: int = 10
-    retry_count: int = 3
+    scan_interval: int = DEFAULT_SCAN_INTERVAL
+    retry_count: int = RETRY_ATTEMPTS
     
     @classmethod
     def from_device_data(cls, data: Dict[str, Any]) -> 'DeviceConfig':
         """Create configuration from device data."""
         return cls(
             name=data.get("name", "Unknown Device"),
-            scan_interval=data.get("scan_interval", 10),
-            retry_count=data.get("retry_count", 3)
+            scan_interval=data.get("scan_interval", DEFAULT_SCAN_INTERVAL),
+            retry_count=data.get("retry_count", RETRY_ATTEMPTS)
         )
\ No newline at end of file
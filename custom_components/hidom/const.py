@@ -4,6 +4,86 @@ DOMAIN = "hidom"
 # Configuration
 CONF_HOST = "host"
 
+# Power meters queried by get_meter_pwr
+DEFAULT_METER_IDS = ("1", "2")
+
+# Command register block written by set_idu
+SET_IDU_REG_ADDR = 78
+
+# Maximum number of commands in a single set_idu request
+SET_IDU_MAX_BATCH = 32
+
+# Energy meter polling and request timeout (seconds)
+DEFAULT_SENSOR_SCAN_INTERVAL = 30
+DEFAULT_TIMEOUT = 10
+
+# Command coalescing window (seconds)
+COMMAND_DEBOUNCE_DELAY = 0.5
+COMMAND_MAX_DELAY = 2.0
+
+# IDU state polling
+DEFAULT_SCAN_INTERVAL = 10
+IDU_DATA_TIMEOUT = 15
+POLL_CHUNK_SIZE = 0
+POLL_CONCURRENCY = 2
+
+# Adaptive polling (seconds)
+POLL_FAST_INTERVAL = 3
+POLL_IDLE_INTERVAL = 60
+POLL_BOOST_DURATION = 60
+POLL_BACKOFF_FACTOR = 1.5
+OFFLINE_POLL_EVERY = 6
+
+# Requests running at once per controller
+REQUEST_CONCURRENCY = 2
+
+# Request retries for reads (seconds)
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 5
+
+# Circuit breaker
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_TIMEOUT = 30
+
+# Request latency histogram bucket bounds (seconds)
+STATS_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+# Power estimation from the energy counter
+POWER_METHOD_EMA = "ema"
+POWER_METHOD_REGRESSION = "regression"
+POWER_EMA_ALPHA = 0.3
+POWER_WINDOW_SAMPLES = 10
+POWER_WINDOW_SECONDS = 900
+
+# Samples kept per unit for runtime statistics (0 disables)
+HISTORY_SAMPLES = 360
+
+# Time span of history before on-time and cycle rates are reported (seconds)
+HISTORY_MIN_SPAN = 900
+
+# Event fired on unit state transitions
+EVENT_UNIT_TRANSITION = "hidom_unit_event"
+
+# Unit group kinds built from the topology
+GROUP_BUILDING = "building"
+GROUP_FLOOR = "floor"
+GROUP_ROOM = "room"
+GROUP_TENANT = "tenant"
+
+# Entries kept for diagnostics
+DIAGNOSTICS_HISTORY = 20
+
+# Minimum time between repeated error log messages (seconds)
+ERROR_LOG_INTERVAL = 300
+
+# Cache lifetimes (seconds)
+TOPOLOGY_CACHE_TTL = 3600
+
+# Topology storage
+TOPOLOGY_STORAGE_VERSION = 1
+TOPOLOGY_SAVE_DELAY = 5
+
 # Data indices in data[] array
 DATA_ONOFF = 28
 DATA_MODE = 29
@@ -12,6 +92,11 @@ DATA_SET_TEMP = 31
 DATA_ERROR_CODE = 35
 DATA_PIPE_TEMP = 38
 DATA_ROOM_TEMP = 39
+DATA_MODEL1 = 72
+DATA_MODEL2 = 73
+DATA_MODEL3 = 74
+DATA_MODEL4 = 75
+DATA_MODEL5 = 77
 
 # Operation mode codes
 MODE_COOL = 2
@@ -29,6 +114,12 @@ FAN_HIGH = 2
 FAN_MID = 4
 FAN_LOW = 8
 
+# Extra fan speed codes reported as high
+FAN_HIGH_EXTRA_CODES = (16, 32, 64)
+
+# Error codes of units that lost communication
+OFFLINE_ERROR_CODES = (60, 61, 64, 65)
+
 # Mode mapping
 MODE_MAP = {
     MODE_COOL: "cool",
@@ -0,0 +1,152 @@
+"""Hub coordinator for HiDOM."""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field, replace
+from datetime import timedelta
+from typing import Any, Dict, Iterable, Optional, Union
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+from .api.client import HiDOMAPIClient
+from .api.models import IDUDevice
+from .const import DOMAIN
+from .device.manager import HiDOMDeviceManager
+from .device.power import HiDOMPowerEstimator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Refresh timers fire up to a second early (seconds)
+DUE_SLACK = 1.0
+
+@dataclass
+class HiDOMHubData:
+    """State of a controller after one update cycle."""
+    devices: Dict[str, IDUDevice] = field(default_factory=dict)
+    power: Any = None
+    devices_updated: bool = False
+    power_updated: bool = False
+
+class HiDOMHubCoordinator(DataUpdateCoordinator):
+    """Single update cycle for IDU state and the energy meter.
+    
+    IDU state follows the adaptive poll interval, the meter its own scan
+    interval. Each cycle fetches what is due, both at once when both are,
+    and publishes one snapshot to all entity platforms.
+    """
+    
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api_client: HiDOMAPIClient,
+        device_manager: HiDOMDeviceManager,
+        power_estimator: HiDOMPowerEstimator,
+        meter_interval: float
+    ):
+        """Initialize."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN}_hub",
+            update_interval=timedelta(
+                seconds=device_manager.scheduler.current_interval
+            ),
+        )
+        self._api_client = api_client
+        self._device_manager = device_manager
+        self._power_estimator = power_estimator
+        self._meter_interval = meter_interval
+        self._devices_due: float = 0
+        self._meter_due: float = 0
+    
+    async def async_refresh_devices(self) -> None:
+        """Refresh IDU state now, regardless of the poll interval."""
+        self._devices_due = 0
+        await self.async_refresh()
+    
+    def async_push_devices(self, device_ids: Iterable[str]) -> None:
+        """Publish cached state of commanded units without polling."""
+        if self.data is None:
+            return
+        
+        self._device_manager.mark_changed(device_ids)
+        self.async_set_updated_data(
+            replace(self.data, devices_updated=True, power_updated=False)
+        )
+    
+    async def async_command_units(
+        self,
+        device_ids: Iterable[str],
+        changes: Dict[str, Any]
+    ) -> Dict[str, Union[bool, BaseException]]:
+        """Apply the same change to many units in batched writes.
+        
+        Entities show the expected state at once and are updated again
+        once the units were read back. Returns the result per unit.
+        """
+        queued = self._device_manager.queue_bulk_command(device_ids, changes)
+        if not queued:
+            return {}
+        
+        self.async_push_devices(queued)
+        sent = await asyncio.gather(*queued.values(), return_exceptions=True)
+        self.async_push_devices(queued)
+        
+        return dict(zip(queued, sent))
+    
+    async def _async_update_data(self) -> HiDOMHubData:
+        """Fetch IDU state and meter data that are due."""
+        started = time.monotonic()
+        previous: Optional[HiDOMHubData] = self.data
+        
+        fetch_meter = previous is None or started >= self._meter_due - DUE_SLACK
+        
+        # Requested refreshes outside the schedule update the units
+        fetch_devices = (
+            previous is None
+            or started >= self._devices_due - DUE_SLACK
+            or not fetch_meter
+        )
+        
+        if fetch_devices and fetch_meter:
+            devices, power = await asyncio.gather(
+                self._device_manager.get_idu_devices(),
+                self._fetch_power(previous),
+            )
+        elif fetch_devices:
+            devices = await self._device_manager.get_idu_devices()
+            power = previous.power
+        else:
+            devices = previous.devices
+            power = await self._fetch_power(previous)
+        
+        if fetch_devices:
+            self._devices_due = started + self._device_manager.scheduler.current_interval
+        if fetch_meter:
+            self._meter_due = started + self._meter_interval
+        
+        # Next cycle when the first of both is due
+        self.update_interval = timedelta(
+            seconds=max(DUE_SLACK, min(self._devices_due, self._meter_due) - time.monotonic())
+        )
+        
+        return HiDOMHubData(
+            devices=devices,
+            power=power,
+            devices_updated=fetch_devices,
+            power_updated=fetch_meter,
+        )
+    
+    async def _fetch_power(self, previous: Optional[HiDOMHubData]) -> Any:
+        """Fetch the meter reading and feed the power estimate."""
+        power = await self._api_client.get_power_data()
+        
+        # Keep the last reading while the controller is unreachable
+        if power is None and self._api_client.circuit_open:
+            return previous.power if previous else None
+        
+        if power is not None:
+            self._power_estimator.add_sample(power, time.monotonic())
+        
+        return power
\ No newline at end of file
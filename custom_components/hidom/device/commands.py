@@ -0,0 +1,116 @@
+"""Command coalescing for HiDOM."""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from ..const import COMMAND_DEBOUNCE_DELAY, COMMAND_MAX_DELAY
+
+_LOGGER = logging.getLogger(__name__)
+
+SendCallback = Callable[[Dict[str, Dict[str, Any]]], Awaitable[Dict[str, bool]]]
+
+class HiDOMCommandBuffer:
+    """Pending command buffer merging successive writes per device.
+    
+    Every queued command is merged into the pending register state of its
+    device. Pending writes of all devices are sent together once no new
+    command arrived for ``delay`` seconds, or at the latest ``max_delay``
+    seconds after the first one.
+    """
+    
+    def __init__(
+        self,
+        send: SendCallback,
+        delay: float = COMMAND_DEBOUNCE_DELAY,
+        max_delay: float = COMMAND_MAX_DELAY
+    ):
+        """Initialize."""
+        self._send = send
+        self._delay = delay
+        self._max_delay = max_delay
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._futures: Dict[str, asyncio.Future] = {}
+        self._first_queued: float = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+    
+    @property
+    def pending(self) -> Dict[str, Dict[str, Any]]:
+        """Return pending register state per device."""
+        return self._pending
+    
+    async def async_queue(
+        self,
+        device_id: str,
+        changes: Dict[str, Any],
+        defaults: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """Queue a command and wait until the merged write was sent."""
+        return await asyncio.shield(self.queue(device_id, changes, defaults))
+    
+    def queue(
+        self,
+        device_id: str,
+        changes: Dict[str, Any],
+        defaults: Optional[Dict[str, Any]] = None
+    ) -> asyncio.Future:
+        """Queue a command.
+        
+        ``changes`` override pending values, ``defaults`` only fill
+        registers that have no pending value yet. The returned future
+        resolves to the result of the merged write.
+        """
+        loop = asyncio.get_running_loop()
+        now = time.monotonic()
+        
+        if not self._pending:
+            self._first_queued = now
+        
+        pending = self._pending.setdefault(device_id, {})
+        for key, value in (defaults or {}).items():
+            pending.setdefault(key, value)
+        pending.update(changes)
+        
+        future = self._futures.get(device_id)
+        if future is None:
+            future = self._futures[device_id] = loop.create_future()
+        
+        # Restart debounce timer, bounded by the maximum delay
+        if self._timer is not None:
+            self._timer.cancel()
+        
+        delay = min(self._delay, self._first_queued + self._max_delay - now)
+        self._timer = loop.call_later(max(0, delay), self._schedule_flush)
+        
+        return future
+    
+    def _schedule_flush(self) -> None:
+        """Start flushing pending commands."""
+        self._timer = None
+        task = asyncio.get_running_loop().create_task(self.async_flush())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def async_flush(self) -> None:
+        """Send all pending commands now."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        
+        pending, futures = self._pending, self._futures
+        self._pending, self._futures = {}, {}
+        
+        if not pending:
+            return
+        
+        results: Dict[str, bool] = {}
+        try:
+            results = await self._send(pending)
+        except Exception as e:
+            _LOGGER.error("Failed to send queued commands: %s", e)
+        finally:
+            # Also when cancelled, callers waiting on the write must return
+            for device_id, future in futures.items():
+                if not future.done():
+                    future.set_result(results.get(device_id, False))
\ No newline at end of file
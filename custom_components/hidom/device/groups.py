@@ -0,0 +1,248 @@
+"""Topology groups of indoor units for HiDOM."""
+import logging
+from collections import Counter
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from ..api.models import IDUDevice
+from ..const import GROUP_BUILDING, GROUP_FLOOR, GROUP_ROOM, GROUP_TENANT
+
+_LOGGER = logging.getLogger(__name__)
+
+# State of a unit counted in group aggregates:
+# (on, offline, room_temp, set_temp, mode, fan)
+UnitContribution = Tuple[bool, bool, Optional[float], int, str, str]
+
+def _contribution(device: Optional[IDUDevice]) -> Optional[UnitContribution]:
+    """Return the aggregate contribution of a polled unit."""
+    if device is None:
+        return None
+    
+    return (
+        device.power == 1 and device.status != "offline",
+        device.status == "offline",
+        device.room_temp,
+        device.set_temp,
+        device.mode,
+        device.fan,
+    )
+
+def _count(counter: Counter, key, delta: int) -> None:
+    """Add ``delta`` to a counter, dropping keys that reach zero."""
+    value = counter[key] + delta
+    if value:
+        counter[key] = value
+    else:
+        del counter[key]
+
+class IDUGroup:
+    """Units sharing a topology level or tenant, with aggregate state.
+    
+    Aggregates are kept as sums and value counters, so a changed unit is
+    applied by removing its previous contribution and adding the new one.
+    ``version`` increases with every aggregate change.
+    """
+    
+    def __init__(self, key: str, kind: str, name: str, parent: Optional[str] = None):
+        """Initialize."""
+        self.key = key
+        self.kind = kind
+        self.name = name
+        self.parent = parent
+        self.version = 0
+        self._reset()
+    
+    def _reset(self) -> None:
+        """Clear members and aggregates."""
+        self.uids: List[str] = []
+        self.units_polled = 0
+        self.units_on = 0
+        self.units_offline = 0
+        self._room_temps: Counter = Counter()
+        self._room_temp_sum = 0.0
+        self._setpoint_sum = 0
+        self._modes: Counter = Counter()
+        self._fans: Counter = Counter()
+    
+    def __repr__(self) -> str:
+        return f"IDUGroup({self.key!r}, units={len(self.uids)})"
+    
+    @property
+    def min_room_temp(self) -> Optional[float]:
+        """Return lowest room temperature of online units."""
+        return min(self._room_temps) if self._room_temps else None
+    
+    @property
+    def max_room_temp(self) -> Optional[float]:
+        """Return highest room temperature of online units."""
+        return max(self._room_temps) if self._room_temps else None
+    
+    @property
+    def avg_room_temp(self) -> Optional[float]:
+        """Return mean room temperature of online units."""
+        count = sum(self._room_temps.values())
+        return round(self._room_temp_sum / count, 1) if count else None
+    
+    @property
+    def avg_set_temp(self) -> Optional[float]:
+        """Return mean target temperature of running units."""
+        return round(self._setpoint_sum / self.units_on, 1) if self.units_on else None
+    
+    @property
+    def mode(self) -> Optional[str]:
+        """Return the most common mode of running units."""
+        return self._modes.most_common(1)[0][0] if self._modes else None
+    
+    @property
+    def fan(self) -> Optional[str]:
+        """Return the most common fan speed of running units."""
+        return self._fans.most_common(1)[0][0] if self._fans else None
+    
+    def _apply(self, contribution: Optional[UnitContribution], sign: int) -> None:
+        """Add (``sign`` 1) or remove (-1) a unit contribution."""
+        if contribution is None:
+            return
+        
+        on, offline, room_temp, set_temp, mode, fan = contribution
+        self.units_polled += sign
+        
+        if offline:
+            self.units_offline += sign
+        elif room_temp is not None:
+            _count(self._room_temps, room_temp, sign)
+            self._room_temp_sum += sign * room_temp
+        
+        if on:
+            self.units_on += sign
+            self._setpoint_sum += sign * set_temp
+            _count(self._modes, mode, sign)
+            _count(self._fans, fan, sign)
+    
+    def as_dict(self) -> Dict[str, object]:
+        """Return group and aggregate state."""
+        return {
+            "key": self.key,
+            "kind": self.kind,
+            "name": self.name,
+            "parent": self.parent,
+            "units": len(self.uids),
+            "units_polled": self.units_polled,
+            "units_on": self.units_on,
+            "units_offline": self.units_offline,
+            "min_room_temp": self.min_room_temp,
+            "max_room_temp": self.max_room_temp,
+            "avg_room_temp": self.avg_room_temp,
+            "avg_set_temp": self.avg_set_temp,
+            "mode": self.mode,
+            "fan": self.fan,
+        }
+
+class HiDOMGroupIndex:
+    """Building, floor, room and tenant groups built from the topology.
+    
+    Rebuilt when the topology changes. Poll results are applied per
+    changed unit to the groups it belongs to.
+    """
+    
+    def __init__(self):
+        """Initialize."""
+        self._groups: Dict[str, IDUGroup] = {}
+        self._unit_groups: Dict[str, Tuple[IDUGroup, ...]] = {}
+        self._contributions: Dict[str, Optional[UnitContribution]] = {}
+    
+    @property
+    def groups(self) -> Dict[str, IDUGroup]:
+        """Return groups by key."""
+        return self._groups
+    
+    def get(self, key: str) -> Optional[IDUGroup]:
+        """Return a group by key."""
+        return self._groups.get(key)
+    
+    def groups_of(self, uid: str) -> Tuple[IDUGroup, ...]:
+        """Return groups a unit belongs to."""
+        return self._unit_groups.get(uid, ())
+    
+    def _group(
+        self,
+        kind: str,
+        path: Tuple[str, ...],
+        parent: Optional[str],
+        previous: Dict[str, IDUGroup]
+    ) -> IDUGroup:
+        """Return the group for a topology path, creating it."""
+        key = "/".join((kind,) + path)
+        group = self._groups.get(key)
+        if group is not None:
+            return group
+        
+        # Groups of the previous topology stay the same objects
+        group = previous.get(key)
+        if group is None:
+            name = " / ".join(part for part in path if part)
+            group = IDUGroup(key, kind, name, parent)
+        else:
+            group._reset()
+            group.version += 1
+        
+        self._groups[key] = group
+        return group
+    
+    def rebuild(self, devices: Iterable[IDUDevice], polled: Mapping[str, IDUDevice]) -> None:
+        """Build groups for ``devices`` and aggregate the ``polled`` ones."""
+        previous = self._groups
+        self._groups = {}
+        self._unit_groups = {}
+        self._contributions = {}
+        
+        for device in devices:
+            groups: List[IDUGroup] = []
+            path: Tuple[str, ...] = ()
+            parent: Optional[str] = None
+            
+            # Levels without a name are skipped, deeper ones keep the path
+            for kind, name in (
+                (GROUP_BUILDING, device.pppname),
+                (GROUP_FLOOR, device.ppname),
+                (GROUP_ROOM, device.pname),
+            ):
+                path += (name or "",)
+                if not name:
+                    continue
+                
+                group = self._group(kind, path, parent, previous)
+                groups.append(group)
+                parent = group.key
+            
+            if device.tenant_name:
+                groups.append(self._group(GROUP_TENANT, (device.tenant_name,), None, previous))
+            
+            for group in groups:
+                group.uids.append(device.uid)
+            
+            self._unit_groups[device.uid] = tuple(groups)
+        
+        self.update(polled, list(self._unit_groups))
+        _LOGGER.debug("Built %s unit groups", len(self._groups))
+    
+    def update(self, polled: Mapping[str, IDUDevice], uids: Iterable[str]) -> Set[str]:
+        """Apply current state of ``uids`` and return changed group keys."""
+        changed: Set[str] = set()
+        
+        for uid in uids:
+            groups = self._unit_groups.get(uid)
+            if not groups:
+                continue
+            
+            contribution = _contribution(polled.get(uid))
+            previous = self._contributions.get(uid)
+            if contribution == previous:
+                continue
+            
+            self._contributions[uid] = contribution
+            for group in groups:
+                group._apply(previous, -1)
+                group._apply(contribution, 1)
+                group.version += 1
+                changed.add(group.key)
+        
+        return changed
\ No newline at end of file
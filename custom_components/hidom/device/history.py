@@ -0,0 +1,250 @@
+"""Per-unit sample history for HiDOM."""
+import math
+from array import array
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from ..api.models import IDUDevice
+from ..const import HISTORY_MIN_SPAN, HISTORY_SAMPLES
+
+NAN = float("nan")
+
+# (time, room_temp, pipe_temp, power, mode_code, set_temp)
+HistorySample = Tuple[float, Optional[float], Optional[float], int, int, int]
+
+def _temp(value: Optional[float]) -> float:
+    """Return a temperature for storage, NaN when unknown."""
+    return NAN if value is None else float(value)
+
+def _bounded(value: Any, low: int, high: int) -> int:
+    """Return an integer register value within the array type range."""
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return 0
+    return value if low <= value <= high else 0
+
+class IDUHistory:
+    """Fixed-size ring buffer of recent samples of one unit.
+    
+    Samples are stored in preallocated arrays, so memory does not grow
+    after construction. Running sums for the statistics are updated as
+    samples enter and leave the buffer:
+    
+    - on-time: share of the buffered time span the unit was switched on
+    - cycles: off to on switches per hour of buffered time span
+    - setpoint delta: mean room minus target temperature while on
+    
+    On-time and cycles are reported once the buffer spans ``min_span``
+    seconds; a few polls give no meaningful rate.
+    """
+    
+    __slots__ = (
+        "size", "min_span", "count", "_next",
+        "_time", "_room_temp", "_pipe_temp", "_power", "_mode", "_set_temp",
+        "_span", "_on_time", "_starts", "_delta_sum", "_delta_count",
+    )
+    
+    def __init__(self, size: int = HISTORY_SAMPLES, min_span: float = HISTORY_MIN_SPAN):
+        """Initialize."""
+        self.size = size = max(2, size)
+        self.min_span = min_span
+        self.count = 0
+        self._next = 0
+        self._time = array("d", [0.0]) * size
+        self._room_temp = array("f", [NAN]) * size
+        self._pipe_temp = array("f", [NAN]) * size
+        self._power = array("b", [0]) * size
+        self._mode = array("H", [0]) * size
+        self._set_temp = array("h", [0]) * size
+        self._span = 0.0
+        self._on_time = 0.0
+        self._starts = 0
+        self._delta_sum = 0.0
+        self._delta_count = 0
+    
+    @property
+    def memory_bytes(self) -> int:
+        """Return size of the sample arrays."""
+        return sum(
+            buffer.itemsize * len(buffer)
+            for buffer in (
+                self._time, self._room_temp, self._pipe_temp,
+                self._power, self._mode, self._set_temp,
+            )
+        )
+    
+    @property
+    def span(self) -> float:
+        """Return seconds between the oldest and newest sample."""
+        return self._span
+    
+    @property
+    def on_time_pct(self) -> Optional[float]:
+        """Return share of time the unit was on, in percent."""
+        if self._span <= 0 or self._span < self.min_span:
+            return None
+        return round(self._on_time / self._span * 100, 1)
+    
+    @property
+    def cycles_per_hour(self) -> Optional[float]:
+        """Return off to on switches per hour."""
+        if self._span <= 0 or self._span < self.min_span:
+            return None
+        return round(self._starts / (self._span / 3600), 2)
+    
+    @property
+    def mean_setpoint_delta(self) -> Optional[float]:
+        """Return mean room minus target temperature while on."""
+        if not self._delta_count:
+            return None
+        return round(self._delta_sum / self._delta_count, 2)
+    
+    def _delta(self, index: int) -> Optional[float]:
+        """Return setpoint delta of a stored sample, if it counts."""
+        room_temp = self._room_temp[index]
+        if not self._power[index] or math.isnan(room_temp):
+            return None
+        return room_temp - self._set_temp[index]
+    
+    def _evict_oldest(self) -> None:
+        """Remove the oldest sample and its share of the statistics."""
+        oldest = (self._next - self.count) % self.size
+        
+        if self.count > 1:
+            following = (oldest + 1) % self.size
+            elapsed = self._time[following] - self._time[oldest]
+            self._span -= elapsed
+            if self._power[oldest]:
+                self._on_time -= elapsed
+            elif self._power[following]:
+                self._starts -= 1
+        
+        delta = self._delta(oldest)
+        if delta is not None:
+            self._delta_sum -= delta
+            self._delta_count -= 1
+        
+        self.count -= 1
+    
+    def append(
+        self,
+        timestamp: float,
+        room_temp: Optional[float],
+        pipe_temp: Optional[float],
+        power: int,
+        mode: int,
+        set_temp: int
+    ) -> None:
+        """Add a sample taken at monotonic time ``timestamp``."""
+        power = 1 if power == 1 else 0
+        
+        if self.count:
+            newest = (self._next - 1) % self.size
+            elapsed = timestamp - self._time[newest]
+            if elapsed <= 0:
+                return
+            
+            if self.count == self.size:
+                self._evict_oldest()
+            
+            self._span += elapsed
+            if self._power[newest]:
+                self._on_time += elapsed
+            elif power:
+                self._starts += 1
+        
+        index = self._next
+        self._time[index] = timestamp
+        self._room_temp[index] = _temp(room_temp)
+        self._pipe_temp[index] = _temp(pipe_temp)
+        self._power[index] = power
+        self._mode[index] = _bounded(mode, 0, 0xFFFF)
+        self._set_temp[index] = _bounded(set_temp, -0x8000, 0x7FFF)
+        self._next = (index + 1) % self.size
+        self.count += 1
+        
+        # Sums use the stored values, so eviction subtracts exactly them
+        delta = self._delta(index)
+        if delta is not None:
+            self._delta_sum += delta
+            self._delta_count += 1
+    
+    def samples(self) -> List[HistorySample]:
+        """Return buffered samples, oldest first."""
+        result = []
+        
+        for offset in range(self.count):
+            index = (self._next - self.count + offset) % self.size
+            room_temp = self._room_temp[index]
+            pipe_temp = self._pipe_temp[index]
+            result.append((
+                self._time[index],
+                None if math.isnan(room_temp) else room_temp,
+                None if math.isnan(pipe_temp) else pipe_temp,
+                self._power[index],
+                self._mode[index],
+                self._set_temp[index],
+            ))
+        
+        return result
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return running statistics."""
+        return {
+            "on_time_pct": self.on_time_pct,
+            "cycles_per_hour": self.cycles_per_hour,
+            "mean_setpoint_delta": self.mean_setpoint_delta,
+            "history_samples": self.count,
+            "history_minutes": round(self._span / 60, 1),
+        }
+
+class HiDOMHistory:
+    """Sample history of all polled units, ``size`` samples each."""
+    
+    def __init__(self, size: int = HISTORY_SAMPLES):
+        """Initialize."""
+        self.size = size
+        self._units: Dict[str, IDUHistory] = {}
+    
+    @property
+    def enabled(self) -> bool:
+        """Check whether history is kept."""
+        return self.size > 0
+    
+    @property
+    def memory_bytes(self) -> int:
+        """Return size of all sample arrays."""
+        return sum(history.memory_bytes for history in self._units.values())
+    
+    def get(self, uid: str) -> Optional[IDUHistory]:
+        """Return history of a unit."""
+        return self._units.get(uid)
+    
+    def record(self, devices: Mapping[str, IDUDevice], uids: Iterable[str], timestamp: float) -> None:
+        """Add the current state of ``uids`` as samples at ``timestamp``."""
+        if not self.enabled:
+            return
+        
+        for uid in uids:
+            device = devices.get(uid)
+            if device is None:
+                continue
+            
+            history = self._units.get(uid)
+            if history is None:
+                history = self._units[uid] = IDUHistory(self.size)
+            
+            history.append(
+                timestamp,
+                device.room_temp,
+                device.pipe_temp,
+                device.power,
+                device.mode_code,
+                device.set_temp,
+            )
+    
+    def prune(self, uids: Iterable[str]) -> None:
+        """Keep history of ``uids`` only."""
+        keep = set(uids)
+        for uid in [uid for uid in self._units if uid not in keep]:
+            del self._units[uid]
\ No newline at end of file
@@ -1,15 +1,50 @@
 """Device manager for HiDOM."""
+import asyncio
 import logging
 import time
-from typing import Dict, Optional, List
+from collections import deque
+from itertools import chain
+from typing import Any, Awaitable, Callable, Collection, Dict, FrozenSet, Iterable, Optional, List, Sequence, Set, Tuple
 from abc import ABC, abstractmethod
 
 from ..api.client import HiDOMAPIClient
-from ..api.models import IDUDevice
-from ..const import MODE_MAP, FAN_MAP
+from ..api.decoder import IDUUnitData
+from ..api.models import IDUCommand, IDUDevice, IDUInfo, make_uid, parse_uid
+from ..api.registers import FIELD_FLAGS, topology_key
+from ..const import (
+    TOPOLOGY_CACHE_TTL,
+    SET_IDU_MAX_BATCH,
+    COMMAND_DEBOUNCE_DELAY,
+    IDU_DATA_TIMEOUT,
+    POLL_CHUNK_SIZE,
+    POLL_CONCURRENCY,
+    DEFAULT_SCAN_INTERVAL,
+    DIAGNOSTICS_HISTORY,
+    HISTORY_SAMPLES,
+)
+from .commands import HiDOMCommandBuffer
+from .groups import HiDOMGroupIndex
+from .history import HiDOMHistory
+from .transitions import (
+    IDUTransition,
+    TransitionState,
+    detect_transitions,
+    transition_state,
+)
+from .polling import HiDOMPollScheduler
 
 _LOGGER = logging.getLogger(__name__)
 
+TopologyListener = Callable[[List[Dict[str, Any]]], None]
+TransitionListener = Callable[[List[IDUTransition]], None]
+
+# get_idu_data request entries with the identifiers of their units
+PollChunk = Tuple[List[Dict[str, Any]], List[str]]
+
+# Fields whose change counts as a unit state transition
+TRANSITION_FIELDS = ("power", "mode_code", "status")
+TRANSITION_FLAGS = sum(FIELD_FLAGS[field] for field in TRANSITION_FIELDS)
+
 class DeviceManager(ABC):
     """Abstract device manager."""
     
@@ -24,131 +59,638 @@ class DeviceManager(ABC):
         pass
 
 class HiDOMDeviceManager(DeviceManager):
-    """HiDOM device manager with caching."""
+    """HiDOM device manager with separate topology and state caching.
+    
+    The topology (``get_miscdata``) rarely changes and is cached for
+    ``topology_ttl`` seconds. Unit state (``get_idu_data``) is fetched on
+    every poll so the coordinator always receives fresh values.
     
-    def __init__(self, api_client: HiDOMAPIClient):
+    Large installations can split each poll into chunks of
+    ``poll_chunk_size`` units and/or one chunk per refrigerant system.
+    Chunks are fetched with at most ``poll_concurrency`` requests in
+    flight; units of a failed chunk keep their previous state.
+    
+    The poll interval is chosen by ``scheduler``, which also decides when
+    offline units are polled. The last ``history_samples`` polls of each
+    unit are kept for runtime statistics.
+    """
+    
+    def __init__(
+        self,
+        api_client: HiDOMAPIClient,
+        topology_ttl: int = TOPOLOGY_CACHE_TTL,
+        max_batch_size: int = SET_IDU_MAX_BATCH,
+        command_delay: float = COMMAND_DEBOUNCE_DELAY,
+        poll_chunk_size: int = POLL_CHUNK_SIZE,
+        poll_by_system: bool = False,
+        poll_concurrency: int = POLL_CONCURRENCY,
+        poll_timeout: float = IDU_DATA_TIMEOUT,
+        scheduler: Optional[HiDOMPollScheduler] = None,
+        history_samples: int = HISTORY_SAMPLES
+    ):
         self._api = api_client
+        self.scheduler = scheduler or HiDOMPollScheduler(DEFAULT_SCAN_INTERVAL)
+        self._poll_chunk_size = poll_chunk_size
+        self._poll_by_system = poll_by_system
+        self._poll_concurrency = max(1, poll_concurrency)
+        self._poll_timeout = poll_timeout
+        self._topology_ttl = topology_ttl
+        self._max_batch_size = max_batch_size
+        self._commands = HiDOMCommandBuffer(self._async_write_and_confirm, command_delay)
         self._miscdata_cache: Optional[Dict] = None
         self._miscdata_timestamp: float = 0
+        self._idu_topo: List[Dict[str, Any]] = []
+        self._topo_index: Dict[Tuple[int, int], Dict[str, Any]] = {}
+        # One device object per unit, updated in place by every poll
+        self._devices: Dict[str, IDUDevice] = {}
+        self._device_index: Dict[Tuple[int, int], IDUDevice] = {}
+        self._devs: List[Dict[str, Any]] = []
+        self._chunks: List[PollChunk] = []
+        # Devices with polled state, returned to the coordinator
         self._idu_cache: Dict[str, IDUDevice] = {}
         self._idu_timestamp: float = 0
+        self._rollback: Dict[str, Tuple[Any, ...]] = {}
+        self._command_times: Dict[str, float] = {}
+        self._changed_uids: FrozenSet[str] = frozenset()
+        self._offline_uids: FrozenSet[str] = frozenset()
+        self._topology_listeners: List[TopologyListener] = []
+        self._transition_listeners: List[TransitionListener] = []
+        # Last state transitions were reported against, per unit
+        self._transition_states: Dict[str, TransitionState] = {}
+        self.groups = HiDOMGroupIndex()
+        self.history = HiDOMHistory(history_samples)
+        self.suppressed_state_writes: int = 0
+        self.failed_chunks: int = 0
+        self._last_poll_requests: int = 0
+        self.last_poll_duration: Optional[float] = None
+        self.last_poll_units: int = 0
+        # Diagnostics, filled from poll results without extra requests
+        self._raw_registers: Dict[str, Sequence[Any]] = {}
+        self.poll_history: deque = deque(maxlen=DIAGNOSTICS_HISTORY)
     
-    async def get_idu_devices(self, force_refresh: bool = False) -> Dict[str, IDUDevice]:
-        """Get all indoor units."""
+    @property
+    def topology(self) -> List[Dict[str, Any]]:
+        """Return cached IDU topology items."""
+        return self._idu_topo
+    
+    @property
+    def raw_registers(self) -> Dict[str, Sequence[Any]]:
+        """Return the last register array received per unit.
+        
+        Values may be undecoded bytes, see ``extract_idu_units``.
+        """
+        return self._raw_registers
+    
+    @property
+    def cache_ages(self) -> Dict[str, Optional[float]]:
+        """Return seconds since unit state and topology were fetched."""
+        now = time.time()
+        return {
+            "idu_data": now - self._idu_timestamp if self._idu_timestamp else None,
+            "topology": now - self._miscdata_timestamp if self._miscdata_timestamp else None,
+        }
+    
+    @property
+    def changed_uids(self) -> FrozenSet[str]:
+        """Return units whose state changed in the latest poll."""
+        return self._changed_uids
+    
+    def mark_changed(self, device_ids: Iterable[str]) -> None:
+        """Mark units changed outside a poll, e.g. by a bulk command."""
+        self._changed_uids = self._changed_uids.union(device_ids)
+    
+    def record_suppressed_write(self) -> None:
+        """Count an entity state write skipped for an unchanged unit."""
+        self.suppressed_state_writes += 1
+    
+    @property
+    def topology_uids(self) -> List[str]:
+        """Return identifiers of all units in the topology."""
+        return [
+            make_uid(item.get("sysAdr", 1), int(item.get("address", 1)))
+            for item in self._idu_topo
+        ]
+    
+    def seed_topology(self, topo: List[Dict[str, Any]]) -> None:
+        """Use a previously saved topology until the live one is fetched."""
+        self._set_topology(list(topo))
+        self._miscdata_timestamp = 0
+    
+    def _set_topology(self, idu_topo: List[Dict[str, Any]]) -> None:
+        """Store topology with its lookup indexes and request list.
+        
+        Device objects of units still in the topology are kept, so their
+        references stay valid.
+        """
+        self._idu_topo = idu_topo
+        self._topo_index = {}
+        self._device_index = {}
+        devices: Dict[str, IDUDevice] = {}
+        
+        for item in idu_topo:
+            key = topology_key(item.get("sysAdr", 1), item.get("address", 1))
+            if key is None:
+                continue
+            
+            self._topo_index[key] = item
+            info = IDUInfo.from_topology(item)
+            device = self._devices.get(info.uid)
+            if device is None:
+                device = IDUDevice(info)
+            elif device.info != info:
+                device.info = info
+            
+            devices[info.uid] = device
+            self._device_index[key] = device
+        
+        self._devices = devices
+        
+        # Forget units removed from the topology
+        for uid in [uid for uid in self._idu_cache if uid not in devices]:
+            del self._idu_cache[uid]
+            self._raw_registers.pop(uid, None)
+        
+        self._devs = [
+            {"sys": item.get("sysAdr", 1), "addr": item.get("address", "1")}
+            for item in idu_topo
+        ]
+        self._chunks = self._build_chunks(self._devs)
+        self.groups.rebuild(devices.values(), self._idu_cache)
+        self.history.prune(devices)
+    
+    def _build_chunks(self, devs: List[Dict[str, Any]]) -> List[PollChunk]:
+        """Split request entries into poll chunks."""
+        if self._poll_by_system:
+            by_system: Dict[Any, List[Dict[str, Any]]] = {}
+            for dev in devs:
+                by_system.setdefault(dev["sys"], []).append(dev)
+            groups = list(by_system.values())
+        else:
+            groups = [devs]
+        
+        chunks: List[PollChunk] = []
+        
+        for group in groups:
+            size = self._poll_chunk_size if self._poll_chunk_size > 0 else len(group)
+            
+            for start in range(0, len(group), max(1, size)):
+                chunk = group[start:start + size]
+                uids = []
+                
+                for dev in chunk:
+                    key = topology_key(dev["sys"], dev["addr"])
+                    uids.append(make_uid(*key) if key is not None else "")
+                
+                chunks.append((chunk, uids))
+        
+        return chunks
+    
+    def add_topology_listener(self, listener: TopologyListener) -> Callable[[], None]:
+        """Register a callback for topology changes."""
+        self._topology_listeners.append(listener)
+        
+        def remove_listener() -> None:
+            self._topology_listeners.remove(listener)
+        
+        return remove_listener
+    
+    def add_transition_listener(self, listener: TransitionListener) -> Callable[[], None]:
+        """Register a callback for unit state transitions."""
+        self._transition_listeners.append(listener)
+        
+        def remove_listener() -> None:
+            self._transition_listeners.remove(listener)
+        
+        return remove_listener
+    
+    def _report_transitions(self, device_ids: Iterable[str]) -> None:
+        """Compare polled units with their previous state and notify listeners.
+        
+        The first state seen of a unit only sets its baseline.
+        """
+        transitions: List[IDUTransition] = []
+        
+        for device_id in device_ids:
+            device = self._idu_cache.get(device_id)
+            if device is None:
+                self._transition_states.pop(device_id, None)
+                continue
+            
+            state = transition_state(device)
+            previous = self._transition_states.get(device_id)
+            if previous == state:
+                continue
+            
+            self._transition_states[device_id] = state
+            if previous is not None:
+                transitions.extend(detect_transitions(device, previous, state))
+        
+        if not transitions:
+            return
+        
+        for listener in list(self._transition_listeners):
+            listener(transitions)
+    
+    def invalidate_topology(self) -> None:
+        """Force topology to be rediscovered on the next poll."""
+        self._miscdata_timestamp = 0
+    
+    def get_placeholder_devices(self) -> Dict[str, IDUDevice]:
+        """Return devices of the cached topology, polled or not."""
+        return dict(self._devices)
+    
+    async def get_topology(self, force_refresh: bool = False) -> List[Dict[str, Any]]:
+        """Get IDU topology, refetching it only when expired."""
         current_time = time.time()
         
-        # Use cache if data is not stale (5 minutes)
-        if (not force_refresh and 
-            self._idu_cache and 
-            current_time - self._idu_timestamp < 300):
-            return self._idu_cache
+        if (not force_refresh and
+            self._idu_topo and
+            current_time - self._miscdata_timestamp < self._topology_ttl):
+            return self._idu_topo
+        
+        miscdata = await self._api.get_miscdata()
+        self.scheduler.record_requests()
+        if not miscdata:
+            # Keep serving the previous topology
+            return self._idu_topo
+        
+        # Filter only IDU devices
+        topo = miscdata.get("topo", [])
+        idu_topo = [item for item in topo if item.get("type") == "IDU"]
+        changed = idu_topo != self._idu_topo
+        
+        self._miscdata_cache = miscdata
+        self._miscdata_timestamp = current_time
+        self._set_topology(idu_topo)
+        
+        if changed:
+            for listener in list(self._topology_listeners):
+                listener(idu_topo)
+        
+        return self._idu_topo
+    
+    async def rediscover(self) -> Dict[str, IDUDevice]:
+        """Refetch topology and poll all indoor units."""
+        return await self.get_idu_devices(force_refresh=True)
+    
+    async def get_idu_devices(self, force_refresh: bool = False) -> Dict[str, IDUDevice]:
+        """Get all indoor units.
+        
+        ``force_refresh`` also refetches the topology.
+        """
+        self._changed_uids = frozenset()
         
         try:
-            # Get topology
-            miscdata = await self._api.get_miscdata()
-            if not miscdata:
-                return self._idu_cache or {}
+            idu_topo = await self.get_topology(force_refresh)
+            if not idu_topo:
+                return self._idu_cache
             
-            # Filter only IDU devices
-            topo = miscdata.get("topo", [])
-            idu_topo = [item for item in topo if item.get("type") == "IDU"]
+            # Get device data
+            previous_uids = frozenset(self._idu_cache)
+            poll_started = time.monotonic()
+            result = await self._poll_chunks(self.scheduler.poll_offline(), poll_started)
+            self.last_poll_duration = time.monotonic() - poll_started
+            self.poll_history.append({
+                "time": time.time(),
+                "duration": round(self.last_poll_duration, 4),
+                "requests": self._last_poll_requests,
+                "failed_chunks": self.failed_chunks,
+                "units_decoded": self.last_poll_units,
+            })
+            if result is None:
+                return self._idu_cache
             
-            if not idu_topo:
-                return {}
+            # Change flags of the poll replace a snapshot diff
+            updated, removed = result
+            changed = {
+                uid for uid, flags in updated.items()
+                if flags or uid not in previous_uids
+            }
+            changed.update(removed)
             
-            # Prepare request for device data
-            devs = [
-                {"sys": item.get("sysAdr", 1), "addr": item.get("address", "1")}
-                for item in idu_topo
-            ]
+            transitions = sum(
+                1 for uid, flags in updated.items()
+                if flags & TRANSITION_FLAGS and uid in previous_uids
+            )
             
-            # Get device data
-            idu_response = await self._api.get_idu_data(devs)
-            if not idu_response:
-                return self._idu_cache or {}
-            
-            # Process data
-            devices = {}
-            idu_dats = idu_response.get("dats", [])
-            
-            for idu_data in idu_dats:
-                # Find corresponding topology item
-                sys = idu_data.get("sys")
-                addr = idu_data.get("addr")
-                
-                topo_item = next(
-                    (t for t in idu_topo 
-                     if t.get("sysAdr") == sys and str(t.get("address")) == str(addr)),
-                    {}
-                )
-                
-                # Create device object
-                device = IDUDevice.from_api_data(topo_item, idu_data)
-                
-                # Transform codes to readable values
-                self._process_device_data(device)
-                
-                # Store
-                devices[device.uid] = device
+            self._changed_uids = frozenset(changed)
+            self.groups.update(self._idu_cache, changed)
+            self._report_transitions(chain(updated, removed))
+            self.history.record(self._idu_cache, updated, time.monotonic())
+            self._offline_uids = frozenset(
+                uid for uid, device in self._idu_cache.items() if device.status == "offline"
+            )
+            self._idu_timestamp = time.time()
             
-            # Update cache
-            self._idu_cache = devices
-            self._idu_timestamp = current_time
+            self.scheduler.observe_poll(transitions, self._last_poll_requests)
             
-            return devices
+            return self._idu_cache
             
         except Exception as e:
             _LOGGER.error("Failed to get IDU devices: %s", e)
-            return self._idu_cache or {}
+            return self._idu_cache
     
-    def _process_device_data(self, device: IDUDevice) -> None:
-        """Process device data."""
-        # Transform mode
-        if device.mode_code in MODE_MAP:
-            device.mode = MODE_MAP[device.mode_code]
-        else:
-            device.mode = "cool"
+    async def _poll_chunks(
+        self,
+        include_offline: bool = True,
+        poll_started: Optional[float] = None
+    ) -> Optional[Tuple[Dict[str, int], Set[str]]]:
+        """Fetch state of all poll chunks with bounded concurrency.
         
-        # Transform fan speed
-        if device.fan_code in FAN_MAP:
-            device.fan = FAN_MAP[device.fan_code]
-        elif device.fan_code in [16, 32, 64]:
-            device.fan = "high"
-        else:
-            device.fan = "medium"
-        
-        # Determine status
-        if device.error_code != 0:
-            if device.error_code in [60, 61, 64, 65]:
-                device.status = "offline"
-            else:
-                device.status = "alarm"
-        else:
-            device.status = "on" if device.power == 1 else "off"
+        Devices are updated in place. Units left out of the poll, in a
+        failed chunk or commanded after ``poll_started`` keep their state.
+        Returns the change flags per updated unit and the units missing
+        from their chunk's reply, or ``None`` when every chunk failed.
+        """
+        if poll_started is None:
+            poll_started = time.monotonic()
+        
+        semaphore = asyncio.Semaphore(self._poll_concurrency)
+        updated: Dict[str, int] = {}
+        removed: Set[str] = set()
+        chunks: List[PollChunk] = []
+        
+        for devs, uids in self._chunks:
+            if not include_offline and self._offline_uids:
+                polled = [
+                    (dev, uid) for dev, uid in zip(devs, uids)
+                    if uid not in self._offline_uids
+                ]
+                devs = [dev for dev, _ in polled]
+                uids = [uid for _, uid in polled]
+            
+            if devs:
+                chunks.append((devs, uids))
+        
+        self._last_poll_requests = len(chunks)
+        self.scheduler.record_requests(len(chunks))
+        
+        if not chunks:
+            return updated, removed
+        
+        async def fetch(devs: List[Dict[str, Any]]) -> Optional[List[IDUUnitData]]:
+            async with semaphore:
+                return await self._api.get_idu_data(devs, timeout=self._poll_timeout)
+        
+        responses = await asyncio.gather(
+            *(fetch(devs) for devs, _ in chunks),
+            return_exceptions=True
+        )
+        
+        # Units commanded during the poll keep their optimistic state
+        skip = set(self._rollback)
+        skip.update(
+            uid for uid, command_time in self._command_times.items()
+            if command_time > poll_started
+        )
+        
+        failed = 0
+        decoded = 0
+        
+        for (_, uids), response in zip(chunks, responses):
+            if isinstance(response, Exception) or response is None:
+                # Units of the failed chunk keep their previous state
+                failed += 1
+                continue
+            
+            chunk_updated = self._apply_units(response, skip)
+            decoded += len(chunk_updated)
+            updated.update(chunk_updated)
+            
+            # Units missing from the reply are no longer available
+            for uid in uids:
+                if uid not in chunk_updated and uid not in skip and uid in self._idu_cache:
+                    del self._idu_cache[uid]
+                    removed.add(uid)
+        
+        self.failed_chunks = failed
+        self.last_poll_units = decoded
+        
+        if failed == len(chunks):
+            return None
+        
+        if failed:
+            _LOGGER.warning(
+                "%s of %s IDU data requests failed, keeping previous state",
+                failed, len(chunks)
+            )
+        
+        return updated, removed
+    
+    def _apply_units(
+        self,
+        units: Iterable[IDUUnitData],
+        skip: Collection[str] = ()
+    ) -> Dict[str, int]:
+        """Update devices in place from get_idu_data unit entries.
+        
+        Units in ``skip`` are left untouched. Returns the change flags per
+        updated unit.
+        """
+        updated: Dict[str, int] = {}
+        device_index = self._device_index
+        
+        for sys, addr, raw_data in units:
+            device = device_index.get((sys, addr))
+            if device is None:
+                # Unknown unit, topology is out of date
+                self.invalidate_topology()
+                device = IDUDevice(IDUInfo.from_topology({}, {"sys": sys, "addr": addr}))
+                device_index[(sys, addr)] = device
+                self._devices[device.uid] = device
+            
+            uid = device.uid
+            if uid in skip:
+                continue
+            
+            updated[uid] = device.update_registers(raw_data)
+            self._raw_registers[uid] = raw_data
+            self._idu_cache.setdefault(uid, device)
+        
+        return updated
+    
+    def _request_dev(self, device_id: str) -> Optional[Dict[str, Any]]:
+        """Build get_idu_data request entry for a single unit."""
+        key = parse_uid(device_id)
+        if key is None:
+            return None
+        
+        item = self._topo_index.get(key)
+        if item is None:
+            return {"sys": key[0], "addr": key[1]}
+        
+        return {"sys": item.get("sysAdr", 1), "addr": item.get("address", "1")}
+    
+    async def read_back(self, device_ids: List[str]) -> Dict[str, IDUDevice]:
+        """Poll only the given units and update them in place.
+        
+        Units with a newer command queued keep their optimistic state.
+        Returns the updated devices.
+        """
+        devs = [dev for dev in map(self._request_dev, device_ids) if dev]
+        if not devs:
+            return {}
+        
+        units = await self._api.get_idu_data(devs)
+        self.scheduler.record_requests()
+        if not units:
+            return {}
+        
+        updated = self._apply_units(units, set(self._commands.pending))
+        self.groups.update(self._idu_cache, updated)
+        self._report_transitions(updated)
+        return {uid: self._idu_cache[uid] for uid in updated}
     
     async def update_device(self, device_id: str, **params) -> bool:
         """Update device parameters."""
-        try:
-            # Parse device identifier
-            if '_' not in device_id:
-                return False
+        results = await self.update_devices({device_id: params})
+        return results[device_id]
+    
+    async def update_devices(self, updates: Dict[str, Dict[str, Any]]) -> Dict[str, bool]:
+        """Update parameters of many devices with batched commands.
+        
+        ``updates`` maps device identifiers to ``onoff``/``mode``/``fan``/
+        ``temp`` parameters. Returns success per device identifier.
+        """
+        results: Dict[str, bool] = {}
+        device_ids: List[str] = []
+        commands: List[IDUCommand] = []
+        
+        for device_id, params in updates.items():
+            key = parse_uid(device_id)
+            if key is None:
+                _LOGGER.error("Invalid device ID format: %s", device_id)
+                results[device_id] = False
+                continue
             
-            s_part, addr_part = device_id.split('_')
-            sys = int(s_part[1:])
-            addr = int(addr_part)
+            device_ids.append(device_id)
+            commands.append(IDUCommand.from_params(*key, **params))
+        
+        if not commands:
+            return results
+        
+        # Send commands
+        sent = await self._api.set_idu_batch(commands, self._max_batch_size)
+        self.scheduler.record_requests(-(-len(commands) // max(1, self._max_batch_size)))
+        
+        for device_id, success in zip(device_ids, sent):
+            results[device_id] = success
+        
+        return results
+    
+    def queue_command(
+        self,
+        device_id: str,
+        changes: Dict[str, Any],
+        defaults: Optional[Dict[str, Any]] = None
+    ) -> Awaitable[bool]:
+        """Queue a device command, merging it with pending ones.
+        
+        The cached device reflects the command at once. The returned
+        awaitable resolves once the merged write was confirmed by a
+        read-back of the unit.
+        """
+        future = self._commands.queue(device_id, changes, defaults)
+        self._apply_optimistic(device_id, self._commands.pending[device_id])
+        self.scheduler.notify_activity()
+        return asyncio.shield(future)
+    
+    def queue_bulk_command(
+        self,
+        device_ids: Iterable[str],
+        changes: Dict[str, Any]
+    ) -> Dict[str, Awaitable[bool]]:
+        """Queue the same change for many units.
+        
+        Registers not in ``changes`` keep the current values of each unit.
+        All units go out in the same batched write. Units without polled
+        state are skipped.
+        """
+        queued = {}
+        
+        for device_id in device_ids:
+            device = self._idu_cache.get(device_id)
+            if device is None:
+                continue
             
-            # Send command
-            success = await self._api.set_idu(sys, addr, **params)
+            queued[device_id] = self.queue_command(device_id, changes, {
+                "onoff": device.power,
+                "mode": device.mode_code,
+                "fan": device.fan_code,
+                "temp": device.set_temp,
+            })
+        
+        return queued
+    
+    def _apply_optimistic(self, device_id: str, params: Dict[str, Any]) -> None:
+        """Update cached device with the expected command result."""
+        device = self._idu_cache.get(device_id)
+        if device is None:
+            return
+        
+        self._rollback.setdefault(device_id, device.snapshot())
+        device.apply_params(**params)
+        self._command_times[device_id] = time.monotonic()
+        self.groups.update(self._idu_cache, (device_id,))
+    
+    def _rollback_optimistic(self, device_id: str) -> None:
+        """Restore cached device state from before a failed command."""
+        snapshot = self._rollback.pop(device_id, None)
+        device = self._idu_cache.get(device_id)
+        if snapshot is not None and device is not None and device_id not in self._commands.pending:
+            device.restore(snapshot)
+            self.groups.update(self._idu_cache, (device_id,))
+    
+    async def _async_write_and_confirm(self, updates: Dict[str, Dict[str, Any]]) -> Dict[str, bool]:
+        """Send merged commands and confirm them by reading the units back.
+        
+        Units left unconfirmed, also when the write or read-back raises,
+        get their state from before the command back. Polls skip units
+        with a pending snapshot, so none may be left behind.
+        """
+        try:
+            return await self._async_write_and_read_back(updates)
+        finally:
+            for device_id in updates:
+                if device_id in self._rollback and device_id not in self._commands.pending:
+                    self._rollback_optimistic(device_id)
+    
+    async def _async_write_and_read_back(self, updates: Dict[str, Dict[str, Any]]) -> Dict[str, bool]:
+        """Send merged commands and check the read-back of written units."""
+        results = await self.update_devices(updates)
+        written = [device_id for device_id, success in results.items() if success]
+        
+        for device_id, success in results.items():
+            if not success:
+                self._rollback_optimistic(device_id)
+        
+        if not written:
+            return results
+        
+        confirmed = await self.read_back(written)
+        
+        for device_id in written:
+            if device_id in self._commands.pending:
+                # Newer command queued, keep its optimistic state
+                continue
             
-            # Invalidate cache on successful update
-            if success:
-                self._idu_timestamp = 0
+            self._rollback.pop(device_id, None)
+            self._command_times[device_id] = time.monotonic()
             
-            return success
+            device = confirmed.get(device_id)
+            if device is None:
+                # No read-back, next poll confirms optimistic state
+                continue
             
-        except (ValueError, KeyError) as e:
-            _LOGGER.error("Invalid device ID format: %s", e)
-            return False
+            if not device.matches_params(updates[device_id]):
+                _LOGGER.warning("Command for %s was not applied", device_id)
+                results[device_id] = False
+        
+        return results
+    
+    async def async_shutdown(self) -> None:
+        """Send pending commands."""
+        await self._commands.async_flush()
     
     async def get_devices(self, force_refresh: bool = False) -> Dict[str, IDUDevice]:
         """Alias for compatibility."""
@@ -0,0 +1,118 @@
+"""Adaptive polling for HiDOM."""
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict
+
+from ..const import (
+    POLL_FAST_INTERVAL,
+    POLL_IDLE_INTERVAL,
+    POLL_BOOST_DURATION,
+    POLL_BACKOFF_FACTOR,
+    OFFLINE_POLL_EVERY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Window for the measured request rate (seconds)
+REQUEST_WINDOW = 60
+
+class HiDOMPollScheduler:
+    """Adaptive poll interval driven by activity and unit state.
+    
+    Polls every ``fast_interval`` seconds for ``boost_duration`` seconds
+    after a command or a state transition. While the building is stable
+    the interval grows by ``backoff_factor`` per quiet poll, from
+    ``base_interval`` up to ``idle_interval``. Offline units are only
+    included in every ``offline_poll_every``-th poll.
+    """
+    
+    def __init__(
+        self,
+        base_interval: float,
+        fast_interval: float = POLL_FAST_INTERVAL,
+        idle_interval: float = POLL_IDLE_INTERVAL,
+        boost_duration: float = POLL_BOOST_DURATION,
+        backoff_factor: float = POLL_BACKOFF_FACTOR,
+        offline_poll_every: int = OFFLINE_POLL_EVERY
+    ):
+        """Initialize."""
+        self._base_interval = base_interval
+        self._fast_interval = min(fast_interval, base_interval)
+        self._idle_interval = max(idle_interval, base_interval)
+        self._boost_duration = boost_duration
+        self._backoff_factor = backoff_factor
+        self._offline_poll_every = max(1, offline_poll_every)
+        self._interval = base_interval
+        self._boost_until: float = 0
+        self._cycle = 0
+        self._requests_per_poll = 0
+        self._request_times: Deque[float] = deque()
+    
+    @property
+    def current_interval(self) -> float:
+        """Return interval until the next poll in seconds."""
+        return self._interval
+    
+    @property
+    def boosted(self) -> bool:
+        """Return whether fast polling is active."""
+        return time.monotonic() < self._boost_until
+    
+    def notify_activity(self) -> None:
+        """Poll fast for a while after a command or state transition."""
+        self._boost_until = time.monotonic() + self._boost_duration
+        self._interval = self._fast_interval
+    
+    def poll_offline(self) -> bool:
+        """Return whether the upcoming poll includes offline units."""
+        return self._cycle % self._offline_poll_every == 0
+    
+    def record_requests(self, count: int = 1) -> None:
+        """Record requests sent to the controller."""
+        now = time.monotonic()
+        self._request_times.extend([now] * count)
+        self._trim_requests(now)
+    
+    def observe_poll(self, transitions: int, requests: int) -> float:
+        """Update interval after a poll and return it."""
+        self._cycle += 1
+        self._requests_per_poll = requests
+        previous = self._interval
+        
+        if transitions:
+            self.notify_activity()
+        elif self.boosted:
+            self._interval = self._fast_interval
+        else:
+            # Stable building, back off towards the idle interval
+            interval = max(self._interval, self._base_interval) * self._backoff_factor
+            if self._interval < self._base_interval:
+                interval = self._base_interval
+            
+            self._interval = min(interval, self._idle_interval)
+        
+        if self._interval != previous:
+            _LOGGER.debug("Poll interval changed to %.1f s", self._interval)
+        
+        return self._interval
+    
+    @property
+    def request_budget(self) -> Dict[str, Any]:
+        """Return expected and measured controller load."""
+        self._trim_requests(time.monotonic())
+        
+        return {
+            "interval": round(self._interval, 1),
+            "boosted": self.boosted,
+            "requests_per_poll": self._requests_per_poll,
+            "requests_per_minute": round(
+                self._requests_per_poll * REQUEST_WINDOW / self._interval, 1
+            ),
+            "requests_last_minute": len(self._request_times),
+        }
+    
+    def _trim_requests(self, now: float) -> None:
+        """Drop requests outside the measuring window."""
+        while self._request_times and now - self._request_times[0] > REQUEST_WINDOW:
+            self._request_times.popleft()
\ No newline at end of file
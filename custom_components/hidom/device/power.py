@@ -0,0 +1,148 @@
+"""Power estimation from cumulative meter readings."""
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from ..const import (
+    POWER_METHOD_EMA,
+    POWER_METHOD_REGRESSION,
+    POWER_EMA_ALPHA,
+    POWER_WINDOW_SAMPLES,
+    POWER_WINDOW_SECONDS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+POWER_METHODS = (POWER_METHOD_EMA, POWER_METHOD_REGRESSION)
+
+class HiDOMPowerEstimator:
+    """Incremental power estimate from an energy counter in Wh.
+    
+    Fed once per new meter sample with the monotonic time the sample was
+    taken. ``ema`` smooths the power between consecutive samples,
+    ``regression`` fits the slope of energy over the last samples within
+    ``window_seconds``. A decreasing counter starts a new series.
+    """
+    
+    def __init__(
+        self,
+        method: str = POWER_METHOD_EMA,
+        alpha: float = POWER_EMA_ALPHA,
+        window_samples: int = POWER_WINDOW_SAMPLES,
+        window_seconds: float = POWER_WINDOW_SECONDS
+    ):
+        """Initialize."""
+        if method not in POWER_METHODS:
+            raise ValueError(f"Unknown power estimation method: {method}")
+        
+        self._method = method
+        self._alpha = min(1.0, max(0.0, alpha))
+        self._window_seconds = window_seconds
+        self._samples: Deque[Tuple[float, float]] = deque(maxlen=max(2, window_samples))
+        self._power_kw: Optional[float] = None
+        self._last_sample_time: Optional[float] = None
+        self._resets = 0
+    
+    @property
+    def method(self) -> str:
+        """Return estimation method."""
+        return self._method
+    
+    @property
+    def power_kw(self) -> Optional[float]:
+        """Return estimated power in kW, None before two samples."""
+        return self._power_kw
+    
+    @property
+    def last_sample_age(self) -> Optional[float]:
+        """Return seconds since the last accepted sample."""
+        if self._last_sample_time is None:
+            return None
+        return time.monotonic() - self._last_sample_time
+    
+    @property
+    def resets(self) -> int:
+        """Return number of counter resets seen."""
+        return self._resets
+    
+    def add_sample(self, energy_wh: Any, sample_time: Optional[float] = None) -> Optional[float]:
+        """Add a meter reading and return the updated estimate."""
+        try:
+            energy_wh = float(energy_wh)
+        except (TypeError, ValueError):
+            return self._power_kw
+        
+        if sample_time is None:
+            sample_time = time.monotonic()
+        
+        if self._samples:
+            last_time, last_energy = self._samples[-1]
+            
+            if sample_time <= last_time:
+                return self._power_kw
+            
+            if energy_wh < last_energy:
+                # Meter replaced or counter wrapped, keep the last estimate
+                _LOGGER.debug(
+                    "Energy counter decreased from %s to %s Wh, restarting power estimate",
+                    last_energy, energy_wh
+                )
+                self._resets += 1
+                self._samples.clear()
+        
+        self._samples.append((sample_time, energy_wh))
+        self._last_sample_time = sample_time
+        
+        # Samples older than the window do not describe the current load
+        while len(self._samples) > 2 and sample_time - self._samples[0][0] > self._window_seconds:
+            self._samples.popleft()
+        
+        if len(self._samples) < 2:
+            return self._power_kw
+        
+        if self._method == POWER_METHOD_EMA:
+            self._update_ema()
+        else:
+            self._update_regression()
+        
+        return self._power_kw
+    
+    def _update_ema(self) -> None:
+        """Smooth the power between the last two samples."""
+        (t0, e0), (t1, e1) = self._samples[-2], self._samples[-1]
+        power_kw = (e1 - e0) / ((t1 - t0) / 3600.0) / 1000.0
+        
+        if self._power_kw is None:
+            self._power_kw = power_kw
+        else:
+            self._power_kw += self._alpha * (power_kw - self._power_kw)
+    
+    def _update_regression(self) -> None:
+        """Fit the energy slope over the sample window."""
+        count = len(self._samples)
+        origin = self._samples[0][0]
+        mean_t = sum(t - origin for t, _ in self._samples) / count
+        mean_e = sum(e for _, e in self._samples) / count
+        
+        cov = 0.0
+        var = 0.0
+        for t, e in self._samples:
+            dt = t - origin - mean_t
+            cov += dt * (e - mean_e)
+            var += dt * dt
+        
+        if var > 0:
+            # Wh per second to kW
+            self._power_kw = cov / var * 3600.0 / 1000.0
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Return estimator state for attributes and diagnostics."""
+        age = self.last_sample_age
+        return {
+            "method": self._method,
+            "power_kw": None if self._power_kw is None else round(self._power_kw, 3),
+            "samples": len(self._samples),
+            "resets": self._resets,
+            "last_sample_age": None if age is None else round(age, 1),
+        }
\ No newline at end of file
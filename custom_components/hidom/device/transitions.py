@@ -0,0 +1,71 @@
+"""Unit state transitions for HiDOM."""
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Tuple
+
+from ..api.models import IDUDevice
+
+# Transition types
+TRANSITION_POWER_ON = "power_on"
+TRANSITION_POWER_OFF = "power_off"
+TRANSITION_OFFLINE = "offline"
+TRANSITION_ONLINE = "online"
+TRANSITION_ALARM = "alarm"
+TRANSITION_ALARM_CLEARED = "alarm_cleared"
+TRANSITION_ERROR_CODE = "error_code"
+
+# Unit state compared between snapshots: (power, status, error_code)
+TransitionState = Tuple[int, str, int]
+
+@dataclass(frozen=True)
+class IDUTransition:
+    """State transition of a single indoor unit."""
+    type: str
+    uid: str
+    name: str
+    old: Any
+    new: Any
+    error_code: int
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Return transition as event data."""
+        return asdict(self)
+
+def transition_state(device: IDUDevice) -> TransitionState:
+    """Return the state of a unit that transitions are detected on."""
+    return device.power, device.status, device.error_code
+
+def detect_transitions(
+    device: IDUDevice,
+    previous: TransitionState,
+    current: TransitionState
+) -> List[IDUTransition]:
+    """Return transitions between two states of a unit.
+    
+    A status change that explains a new error code is reported once, as
+    ``offline``/``alarm``/``online``/``alarm_cleared``. ``error_code`` is
+    only reported when the code changes within the same status. Power
+    toggles of offline units are not reported.
+    """
+    old_power, old_status, old_code = previous
+    power, status, code = current
+    transitions: List[IDUTransition] = []
+    
+    def add(kind: str, old: Any, new: Any) -> None:
+        transitions.append(IDUTransition(kind, device.uid, device.name, old, new, code))
+    
+    if status != old_status:
+        if status == "offline":
+            add(TRANSITION_OFFLINE, old_status, status)
+        elif status == "alarm":
+            add(TRANSITION_ALARM, old_code, code)
+        elif old_status == "offline":
+            add(TRANSITION_ONLINE, old_status, status)
+        elif old_status == "alarm":
+            add(TRANSITION_ALARM_CLEARED, old_code, code)
+    elif code != old_code:
+        add(TRANSITION_ERROR_CODE, old_code, code)
+    
+    if power != old_power and status != "offline":
+        add(TRANSITION_POWER_ON if power == 1 else TRANSITION_POWER_OFF, old_power, power)
+    
+    return transitions
\ No newline at end of file
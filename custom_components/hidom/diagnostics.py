@@ -0,0 +1,93 @@
+"""Diagnostics support for HiDOM."""
+import json
+from typing import Any, Dict, List, Optional, Sequence
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, CONF_HOST, DIAGNOSTICS_HISTORY
+
+REDACTED = "**REDACTED**"
+
+TO_REDACT = {CONF_HOST, "ip", "ip_address", "configuration_url"}
+
+def _redact_host(data: Any, host: str) -> Any:
+    """Replace the controller address wherever it appears in text."""
+    if isinstance(data, dict):
+        return {key: _redact_host(value, host) for key, value in data.items()}
+    if isinstance(data, list):
+        return [_redact_host(value, host) for value in data]
+    if isinstance(data, str):
+        # Replace host with port first, then the bare address
+        for address in (host, host.partition(":")[0]):
+            if address:
+                data = data.replace(address, REDACTED)
+    return data
+
+def _register_values(values: Optional[Sequence[Any]]) -> Optional[List[Any]]:
+    """Return register values as numbers, decoding raw bytes."""
+    if not values or not isinstance(values[0], bytes):
+        return values
+    
+    try:
+        return json.loads(b"[" + b",".join(values) + b"]")
+    except ValueError:
+        return [value.decode(errors="replace") for value in values]
+
+def _history(device_manager, uid: str) -> Optional[Dict[str, Any]]:
+    """Return runtime statistics and samples of a unit."""
+    history = device_manager.history.get(uid)
+    if history is None:
+        return None
+    
+    # Latest samples only, the statistics cover the whole buffer
+    return {**history.stats(), "samples": history.samples()[-DIAGNOSTICS_HISTORY:]}
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant,
+    entry: ConfigEntry
+) -> Dict[str, Any]:
+    """Return diagnostics for a config entry.
+    
+    Built from data kept in memory; no controller requests are made.
+    """
+    data = hass.data[DOMAIN][entry.entry_id]
+    api_client = data["api_client"]
+    device_manager = data["device_manager"]
+    coordinator = data["coordinator"]
+    raw_registers = device_manager.raw_registers
+    
+    devices = {
+        uid: {
+            "decoded": device.as_dict(),
+            "raw_registers": _register_values(raw_registers.get(uid)),
+            "history": _history(device_manager, uid),
+        }
+        for uid, device in (coordinator.data.devices if coordinator.data else {}).items()
+    }
+    
+    diagnostics = {
+        "entry": dict(entry.data),
+        "topology": device_manager.topology,
+        "devices": devices,
+        "cache_ages": device_manager.cache_ages,
+        "polls": {
+            "history": list(device_manager.poll_history),
+            "request_budget": device_manager.scheduler.request_budget,
+            "suppressed_state_writes": device_manager.suppressed_state_writes,
+            "history_bytes": device_manager.history.memory_bytes,
+        },
+        "requests": {
+            "endpoints": {
+                name: stats.as_dict() for name, stats in api_client.stats.items()
+            },
+            "queue": api_client.queue_stats,
+            "circuit": api_client.circuit_state,
+            "recent_errors": list(api_client.recent_errors),
+        },
+        "power": data["power_estimator"].as_dict(),
+        "groups": [group.as_dict() for group in device_manager.groups.groups.values()],
+    }
+    
+    return _redact_host(async_redact_data(diagnostics, TO_REDACT), data["host"])
\ No newline at end of file
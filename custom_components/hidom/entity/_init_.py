@@ -2,17 +2,29 @@
 from .base import HiDOMBaseEntity
 from .factory import HiDOMEntityFactory
 from .climate import HiDOMClimateEntity
+from .group import HiDOMGroupClimateEntity
 from .sensor import (
     HiDOMRawMeterSensor,
     HiDOMEnergyMeterSensor,
     HiDOMPowerSensor
 )
+from .diagnostic import (
+    HiDOMEndpointLatencySensor,
+    HiDOMPollDurationSensor,
+    HiDOMUnitsDecodedSensor,
+    HiDOMUnitStatSensor
+)
 
 __all__ = [
     "HiDOMBaseEntity",
     "HiDOMEntityFactory",
     "HiDOMClimateEntity",
+    "HiDOMGroupClimateEntity",
     "HiDOMRawMeterSensor",
     "HiDOMEnergyMeterSensor",
-    "HiDOMPowerSensor"
+    "HiDOMPowerSensor",
+    "HiDOMEndpointLatencySensor",
+    "HiDOMPollDurationSensor",
+    "HiDOMUnitsDecodedSensor",
+    "HiDOMUnitStatSensor"
 ]
\ No newline at end of file
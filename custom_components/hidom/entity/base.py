@@ -64,7 +64,13 @@ class HiDOMBaseEntity(CoordinatorEntity, ABC):
         await super().async_added_to_hass()
         self._update_from_coordinator()
     
+    def _has_state_changed(self) -> bool:
+        """Check whether the coordinator update changed entity state."""
+        return True
+    
     def _handle_coordinator_update(self) -> None:
         """Handle coordinator update."""
         self._update_from_coordinator()
-        self.async_write_ha_state()
\ No newline at end of file
+        
+        if self._has_state_changed():
+            self.async_write_ha_state()
\ No newline at end of file
@@ -7,6 +7,7 @@ from homeassistant.components.climate import (
     HVACMode,
 )
 from homeassistant.const import ATTR_TEMPERATURE, UnitOfTemperature
+from homeassistant.exceptions import HomeAssistantError
 
 from .base import HiDOMBaseEntity
 from ..device.manager import HiDOMDeviceManager
@@ -83,6 +84,7 @@ class HiDOMClimateEntity(HiDOMBaseEntity, ClimateEntity):
         
         # Current data cache
         self._current_data = device_data
+        self._last_available = None
         self._saved_settings = {
             "temp": 24,
             "mode": MODE_COOL,
@@ -102,7 +104,7 @@ class HiDOMClimateEntity(HiDOMBaseEntity, ClimateEntity):
         if not self.coordinator.data:
             return
         
-        device_data = self.coordinator.data.get(self._device_uid)
+        device_data = self.coordinator.data.devices.get(self._device_uid)
         if device_data:
             self._current_data = device_data
             
@@ -116,7 +118,24 @@ class HiDOMClimateEntity(HiDOMBaseEntity, ClimateEntity):
     
     def _is_device_data_available(self) -> bool:
         """Check if device data is available."""
-        return self._device_uid in self.coordinator.data
+        return bool(self.coordinator.data) and self._device_uid in self.coordinator.data.devices
+    
+    def _has_state_changed(self) -> bool:
+        """Skip state writes for units unchanged since the previous poll."""
+        available = self.available
+        
+        # Cycles that only read the meter leave units untouched
+        data = self.coordinator.data
+        if data and not data.devices_updated and available == self._last_available:
+            return False
+        
+        if (available != self._last_available or
+            self._device_uid in self._device_manager.changed_uids):
+            self._last_available = available
+            return True
+        
+        self._device_manager.record_suppressed_write()
+        return False
     
     @property
     def target_temperature(self) -> float:
@@ -157,6 +176,44 @@ class HiDOMClimateEntity(HiDOMBaseEntity, ClimateEntity):
             return fan
         return "auto"
     
+    async def _async_send_command(self, changes, defaults) -> None:
+        """Queue a command and show its result optimistically.
+        
+        Successive commands within the coalescing window are merged into
+        a single write of the latest register state. The state is written
+        again once the unit was read back. Raises ``HomeAssistantError``
+        when the write failed or was not applied.
+        """
+        applied = self._device_manager.queue_command(
+            self._device_uid, changes, defaults
+        )
+        self._update_from_coordinator()
+        self.async_write_ha_state()
+        
+        success = await applied
+        self._update_from_coordinator()
+        self.async_write_ha_state()
+        
+        if not success:
+            raise HomeAssistantError(f"Command for {self._attr_name} was not applied")
+    
+    def _current_settings(self):
+        """Return registers of the running device."""
+        return {
+            "onoff": 1,
+            "mode": self._current_data.mode_code,
+            "fan": self._current_data.fan_code,
+            "temp": self._current_data.set_temp
+        }
+    
+    def _stored_settings(self):
+        """Return registers from saved settings."""
+        return {
+            "mode": self._saved_settings["mode"],
+            "fan": self._saved_settings["fan"],
+            "temp": self._saved_settings["temp"]
+        }
+    
     async def async_set_temperature(self, **kwargs):
         """Set target temperature."""
         temperature = kwargs.get(ATTR_TEMPERATURE)
@@ -167,27 +224,18 @@ class HiDOMClimateEntity(HiDOMBaseEntity, ClimateEntity):
         
         # If device is on, send command
         if self._current_data and self._current_data.power == 1:
-            success = await self._device_manager.update_device(
-                device_id=self._device_uid,
-                onoff=1,
-                mode=self._current_data.mode_code,
-                fan=self._current_data.fan_code,
-                temp=int(temperature)
+            await self._async_send_command(
+                {"temp": int(temperature)},
+                self._current_settings()
             )
-            
-            if success:
-                await self.coordinator.async_request_refresh()
     
     async def async_set_hvac_mode(self, hvac_mode):
         """Set HVAC mode."""
         if hvac_mode == HVACMode.OFF:
             # Turn off device
-            success = await self._device_manager.update_device(
-                device_id=self._device_uid,
-                onoff=0,
-                mode=self._saved_settings["mode"],
-                fan=self._saved_settings["fan"],
-                temp=self._saved_settings["temp"]
+            await self._async_send_command(
+                {"onoff": 0},
+                self._stored_settings()
             )
         else:
             # Turn on with selected mode
@@ -196,16 +244,10 @@ class HiDOMClimateEntity(HiDOMBaseEntity, ClimateEntity):
             
             self._saved_settings["mode"] = mode_code
             
-            success = await self._device_manager.update_device(
-                device_id=self._device_uid,
-                onoff=1,
-                mode=mode_code,
-                fan=self._saved_settings["fan"],
-                temp=self._saved_settings["temp"]
+            await self._async_send_command(
+                {"onoff": 1, "mode": mode_code},
+                self._stored_settings()
             )
-        
-        if success:
-            await self.coordinator.async_request_refresh()
     
     async def async_set_fan_mode(self, fan_mode):
         """Set fan mode."""
@@ -213,42 +255,24 @@ class HiDOMClimateEntity(HiDOMBaseEntity, ClimateEntity):
         self._saved_settings["fan"] = fan_code
         
         if self._current_data and self._current_data.power == 1:
-            success = await self._device_manager.update_device(
-                device_id=self._device_uid,
-                onoff=1,
-                mode=self._current_data.mode_code,
-                fan=fan_code,
-                temp=self._current_data.set_temp
+            await self._async_send_command(
+                {"fan": fan_code},
+                self._current_settings()
             )
-            
-            if success:
-                await self.coordinator.async_request_refresh()
     
     async def async_turn_on(self):
         """Turn on device."""
-        success = await self._device_manager.update_device(
-            device_id=self._device_uid,
-            onoff=1,
-            mode=self._saved_settings["mode"],
-            fan=self._saved_settings["fan"],
-            temp=self._saved_settings["temp"]
+        await self._async_send_command(
+            {"onoff": 1},
+            self._stored_settings()
         )
-        
-        if success:
-            await self.coordinator.async_request_refresh()
     
     async def async_turn_off(self):
         """Turn off device."""
-        success = await self._device_manager.update_device(
-            device_id=self._device_uid,
-            onoff=0,
-            mode=self._saved_settings["mode"],
-            fan=self._saved_settings["fan"],
-            temp=self._saved_settings["temp"]
+        await self._async_send_command(
+            {"onoff": 0},
+            self._stored_settings()
         )
-        
-        if success:
-            await self.coordinator.async_request_refresh()
     
     @property
     def extra_state_attributes(self):
@@ -0,0 +1,178 @@
+"""Diagnostic sensor entities for HiDOM."""
+import logging
+from typing import Any, Dict, Optional
+
+from homeassistant.components.sensor import (
+    SensorEntity,
+    SensorDeviceClass,
+    SensorStateClass,
+)
+from homeassistant.const import EntityCategory, PERCENTAGE, UnitOfTemperature, UnitOfTime
+from homeassistant.util import dt as dt_util
+
+from ..api.client import HiDOMAPIClient
+from ..device.manager import HiDOMDeviceManager
+from .base import HiDOMBaseEntity
+
+_LOGGER = logging.getLogger(__name__)
+
+# Runtime statistics of a unit: name suffix, unit, icon
+UNIT_STATS = {
+    "on_time_pct": ("On Time", PERCENTAGE, "mdi:clock-check-outline"),
+    "cycles_per_hour": ("Cycles Per Hour", "cycles/h", "mdi:sync"),
+    "mean_setpoint_delta": ("Setpoint Delta", UnitOfTemperature.CELSIUS, "mdi:thermometer-lines"),
+}
+
+class HiDOMDiagnosticSensor(HiDOMBaseEntity, SensorEntity):
+    """Base class for hub diagnostic sensors.
+    
+    Stays available while the controller is unreachable, which is when
+    the diagnostics matter most.
+    """
+    
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    
+    @property
+    def unique_id(self) -> str:
+        return self._attr_unique_id
+    
+    @property
+    def name(self) -> str:
+        return self._attr_name
+    
+    def _update_from_coordinator(self) -> None:
+        """Update data from coordinator."""
+        pass
+    
+    def _is_device_data_available(self) -> bool:
+        return True
+    
+    @property
+    def available(self) -> bool:
+        """Diagnostic sensors are always available."""
+        return True
+
+class HiDOMEndpointLatencySensor(HiDOMDiagnosticSensor):
+    """Mean request latency of one controller endpoint."""
+    
+    _attr_icon = "mdi:timer-outline"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_suggested_display_precision = 0
+    
+    def __init__(self, coordinator, host: str, api_client: HiDOMAPIClient, endpoint: str):
+        """Initialize."""
+        super().__init__(coordinator, host)
+        self._api_client = api_client
+        self._endpoint = endpoint
+        self._attr_unique_id = f"hidom_{endpoint}_latency_{host.replace('.', '_')}"
+        self._attr_name = f"HiDOM {endpoint} Latency"
+    
+    @property
+    def native_value(self) -> Optional[float]:
+        """Return mean latency in milliseconds."""
+        mean = self._api_client.stats[self._endpoint].mean_latency
+        if mean is None:
+            return None
+        return round(mean * 1000, 1)
+    
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any]:
+        """Return counters and latency histogram."""
+        attrs = self._api_client.stats[self._endpoint].as_dict()
+        
+        if attrs["last_success"] is not None:
+            attrs["last_success"] = dt_util.utc_from_timestamp(attrs["last_success"]).isoformat()
+        
+        return attrs
+
+class HiDOMPollDurationSensor(HiDOMDiagnosticSensor):
+    """Duration of the last climate poll cycle."""
+    
+    _attr_icon = "mdi:timer-sync-outline"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_suggested_display_precision = 0
+    
+    def __init__(self, coordinator, host: str, device_manager: HiDOMDeviceManager):
+        """Initialize."""
+        super().__init__(coordinator, host)
+        self._device_manager = device_manager
+        self._attr_unique_id = f"hidom_poll_duration_{host.replace('.', '_')}"
+        self._attr_name = "HiDOM Poll Duration"
+    
+    @property
+    def native_value(self) -> Optional[float]:
+        """Return poll duration in milliseconds."""
+        duration = self._device_manager.last_poll_duration
+        if duration is None:
+            return None
+        return round(duration * 1000, 1)
+    
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any]:
+        """Return poll request details."""
+        return {
+            "failed_chunks": self._device_manager.failed_chunks,
+            **self._device_manager.scheduler.request_budget,
+        }
+
+class HiDOMUnitsDecodedSensor(HiDOMDiagnosticSensor):
+    """Number of units decoded in the last climate poll."""
+    
+    _attr_icon = "mdi:counter"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    
+    def __init__(self, coordinator, host: str, device_manager: HiDOMDeviceManager):
+        """Initialize."""
+        super().__init__(coordinator, host)
+        self._device_manager = device_manager
+        self._attr_unique_id = f"hidom_units_decoded_{host.replace('.', '_')}"
+        self._attr_name = "HiDOM Units Decoded"
+    
+    @property
+    def native_value(self) -> int:
+        """Return number of decoded units."""
+        return self._device_manager.last_poll_units
+    
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any]:
+        """Return topology size."""
+        return {"topology_units": len(self._device_manager.topology)}
+
+class HiDOMUnitStatSensor(HiDOMDiagnosticSensor):
+    """Runtime statistic of one unit from its sample history."""
+    
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    
+    def __init__(
+        self,
+        coordinator,
+        host: str,
+        device_manager: HiDOMDeviceManager,
+        device_uid: str,
+        device_name: str,
+        stat: str
+    ):
+        """Initialize."""
+        super().__init__(coordinator, host)
+        self._device_manager = device_manager
+        self._device_uid = device_uid
+        self._stat = stat
+        
+        suffix, unit, icon = UNIT_STATS[stat]
+        self._attr_unique_id = f"hidom_{device_uid}_{stat}"
+        self._attr_name = f"{device_name} {suffix}"
+        self._attr_native_unit_of_measurement = unit
+        self._attr_icon = icon
+    
+    @property
+    def native_value(self) -> Optional[float]:
+        """Return the statistic, None until the history covers enough time."""
+        history = self._device_manager.history.get(self._device_uid)
+        if history is None:
+            return None
+        return getattr(history, self._stat)
\ No newline at end of file
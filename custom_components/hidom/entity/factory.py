@@ -4,16 +4,24 @@ from typing import List
 
 from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
+from ..api.client import ENDPOINT_NAMES
 from ..device.manager import HiDOMDeviceManager
-from ..const import DOMAIN
+from ..const import DOMAIN, GROUP_ROOM
 from .climate import HiDOMClimateEntity
+from .group import HiDOMGroupClimateEntity
 from .sensor import (
     HiDOMRawMeterSensor,
     HiDOMEnergyMeterSensor,
     HiDOMPowerSensor
 )
+from .diagnostic import (
+    UNIT_STATS,
+    HiDOMEndpointLatencySensor,
+    HiDOMPollDurationSensor,
+    HiDOMUnitsDecodedSensor,
+    HiDOMUnitStatSensor
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,14 +36,20 @@ class HiDOMEntityFactory:
     ) -> None:
         """Create climate entities."""
         data = hass.data[DOMAIN][entry.entry_id]
-        coordinator = data["coordinator_climate"]
+        coordinator = data["coordinator"]
         device_manager = data["device_manager"]
         host = data["host"]
         
         entities = []
         
+        # Before the first poll, entities come from the saved topology
         if coordinator.data:
-            for uid, device_data in coordinator.data.items():
+            devices = coordinator.data.devices
+        else:
+            devices = device_manager.get_placeholder_devices()
+        
+        if devices:
+            for uid, device_data in devices.items():
                 entity = HiDOMClimateEntity(
                     coordinator=coordinator,
                     device_manager=device_manager,
@@ -45,6 +59,18 @@ class HiDOMEntityFactory:
                 )
                 entities.append(entity)
         
+        # Group control, rooms only when they hold several units
+        for group in device_manager.groups.groups.values():
+            if group.kind == GROUP_ROOM and len(group.uids) < 2:
+                continue
+            
+            entities.append(HiDOMGroupClimateEntity(
+                coordinator=coordinator,
+                device_manager=device_manager,
+                group=group,
+                host=host
+            ))
+        
         if entities:
             async_add_entities(entities)
             _LOGGER.info("Created %s climate entities", len(entities))
@@ -57,14 +83,39 @@ class HiDOMEntityFactory:
     ) -> None:
         """Create sensor entities."""
         data = hass.data[DOMAIN][entry.entry_id]
-        coordinator = data["coordinator_sensor"]
+        coordinator = data["coordinator"]
         host = data["host"]
         
         entities = [
             HiDOMRawMeterSensor(coordinator, host),
             HiDOMEnergyMeterSensor(coordinator, host),
-            HiDOMPowerSensor(coordinator, host),
+            HiDOMPowerSensor(coordinator, host, data["power_estimator"]),
         ]
         
+        # Diagnostics refresh with every hub cycle
+        api_client = data["api_client"]
+        device_manager = data["device_manager"]
+        
+        entities.extend(
+            HiDOMEndpointLatencySensor(coordinator, host, api_client, endpoint)
+            for endpoint in ENDPOINT_NAMES.values()
+        )
+        entities.append(HiDOMPollDurationSensor(coordinator, host, device_manager))
+        entities.append(HiDOMUnitsDecodedSensor(coordinator, host, device_manager))
+        
+        # Runtime statistics per unit from the sample history
+        if device_manager.history.enabled:
+            if coordinator.data:
+                devices = coordinator.data.devices
+            else:
+                devices = device_manager.get_placeholder_devices()
+            
+            for uid, device_data in devices.items():
+                name = device_data.name or f"IDU {uid}"
+                entities.extend(
+                    HiDOMUnitStatSensor(coordinator, host, device_manager, uid, name, stat)
+                    for stat in UNIT_STATS
+                )
+        
         async_add_entities(entities)
         _LOGGER.info("Created %s sensor entities", len(entities))
\ No newline at end of file
@@ -0,0 +1,166 @@
+"""Group climate entities for HiDOM."""
+import logging
+
+from homeassistant.components.climate import (
+    ClimateEntity,
+    ClimateEntityFeature,
+    HVACMode,
+)
+from homeassistant.const import ATTR_TEMPERATURE, UnitOfTemperature
+from homeassistant.util import slugify
+
+from .base import HiDOMBaseEntity
+from .climate import DEVICE_TO_HVAC, HVAC_TO_DEVICE
+from ..device.groups import IDUGroup
+from ..device.manager import HiDOMDeviceManager
+from ..const import MODE_REVERSE_MAP, FAN_REVERSE_MAP, MODE_COOL
+
+_LOGGER = logging.getLogger(__name__)
+
+class HiDOMGroupClimateEntity(HiDOMBaseEntity, ClimateEntity):
+    """All units of a building, floor, room or tenant.
+    
+    State is read from the group aggregates. Every action is sent to
+    all online units of the group as one batched command; registers the
+    action does not set keep each unit's own value.
+    """
+    
+    _attr_icon = "mdi:home-thermometer"
+    _attr_temperature_unit = UnitOfTemperature.CELSIUS
+    _attr_supported_features = (
+        ClimateEntityFeature.TARGET_TEMPERATURE |
+        ClimateEntityFeature.FAN_MODE |
+        ClimateEntityFeature.TURN_OFF |
+        ClimateEntityFeature.TURN_ON
+    )
+    _attr_hvac_modes = [
+        HVACMode.OFF, HVACMode.COOL, HVACMode.HEAT,
+        HVACMode.DRY, HVACMode.FAN_ONLY
+    ]
+    _attr_fan_modes = ["auto", "low", "medium", "high"]
+    _attr_min_temp = 16
+    _attr_max_temp = 30
+    _attr_target_temperature_step = 1
+    
+    def __init__(
+        self,
+        coordinator,
+        device_manager: HiDOMDeviceManager,
+        group: IDUGroup,
+        host: str
+    ):
+        """Initialize."""
+        super().__init__(coordinator, host)
+        self._device_manager = device_manager
+        self._group = group
+        self._written_version = None
+        self._last_available = None
+        self._attr_unique_id = f"hidom_group_{host.replace('.', '_')}_{slugify(group.key)}"
+        self._attr_name = f"HiDOM {group.kind.capitalize()} {group.name}"
+    
+    @property
+    def unique_id(self) -> str:
+        return self._attr_unique_id
+    
+    @property
+    def name(self) -> str:
+        return self._attr_name
+    
+    def _update_from_coordinator(self) -> None:
+        """Aggregates are kept up to date by the device manager."""
+        pass
+    
+    def _is_device_data_available(self) -> bool:
+        return self._group.units_polled > 0
+    
+    def _has_state_changed(self) -> bool:
+        """Write state only when the group aggregates changed."""
+        available = self.available
+        
+        if available != self._last_available or self._group.version != self._written_version:
+            self._last_available = available
+            self._written_version = self._group.version
+            return True
+        
+        return False
+    
+    @property
+    def current_temperature(self):
+        return self._group.avg_room_temp
+    
+    @property
+    def target_temperature(self):
+        return self._group.avg_set_temp
+    
+    @property
+    def hvac_mode(self) -> HVACMode:
+        if not self._group.units_on:
+            return HVACMode.OFF
+        return DEVICE_TO_HVAC.get(self._group.mode, HVACMode.COOL)
+    
+    @property
+    def fan_mode(self):
+        fan = self._group.fan
+        return fan if fan in self._attr_fan_modes else None
+    
+    async def _async_send_group_command(self, changes) -> None:
+        """Send one change to all online units of the group."""
+        cache = self._device_manager.get_placeholder_devices()
+        targets = [
+            uid for uid in self._group.uids
+            if uid in cache and cache[uid].status != "offline"
+        ]
+        
+        results = await self.coordinator.async_command_units(targets, changes)
+        failed = [uid for uid, success in results.items() if success is not True]
+        if failed:
+            _LOGGER.warning(
+                "Command for group %s failed for %s of %s units",
+                self._group.name, len(failed), len(results)
+            )
+    
+    async def async_set_temperature(self, **kwargs):
+        """Set target temperature of all units."""
+        temperature = kwargs.get(ATTR_TEMPERATURE)
+        if temperature is None:
+            return
+        
+        await self._async_send_group_command({"temp": int(temperature)})
+    
+    async def async_set_hvac_mode(self, hvac_mode):
+        """Set HVAC mode of all units."""
+        if hvac_mode == HVACMode.OFF:
+            await self._async_send_group_command({"onoff": 0})
+            return
+        
+        device_mode = HVAC_TO_DEVICE.get(hvac_mode, "cool")
+        await self._async_send_group_command({
+            "onoff": 1,
+            "mode": MODE_REVERSE_MAP.get(device_mode, MODE_COOL),
+        })
+    
+    async def async_set_fan_mode(self, fan_mode):
+        """Set fan speed of all units."""
+        await self._async_send_group_command({"fan": FAN_REVERSE_MAP.get(fan_mode, 4)})
+    
+    async def async_turn_on(self):
+        """Turn on all units."""
+        await self._async_send_group_command({"onoff": 1})
+    
+    async def async_turn_off(self):
+        """Turn off all units."""
+        await self._async_send_group_command({"onoff": 0})
+    
+    @property
+    def extra_state_attributes(self):
+        """Return group aggregates."""
+        group = self._group
+        return {
+            "group_kind": group.kind,
+            "units": len(group.uids),
+            "units_on": group.units_on,
+            "units_offline": group.units_offline,
+            "min_room_temp": group.min_room_temp,
+            "max_room_temp": group.max_room_temp,
+            "avg_room_temp": group.avg_room_temp,
+        }
\ No newline at end of file
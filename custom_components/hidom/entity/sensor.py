@@ -1,6 +1,5 @@
 """Sensor entities for HiDOM."""
 import logging
-import time
 
 from homeassistant.components.sensor import (
     SensorEntity,
@@ -9,10 +8,16 @@ from homeassistant.components.sensor import (
 )
 from homeassistant.const import UnitOfEnergy, UnitOfPower
 
+from ..device.power import HiDOMPowerEstimator
 from .base import HiDOMBaseEntity
 
 _LOGGER = logging.getLogger(__name__)
 
+def _meter_reading(coordinator):
+    """Return the last meter reading of the hub."""
+    data = coordinator.data
+    return data.power if data else None
+
 class HiDOMRawMeterSensor(HiDOMBaseEntity, SensorEntity):
     """Raw power meter sensor."""
     
@@ -24,17 +29,25 @@ class HiDOMRawMeterSensor(HiDOMBaseEntity, SensorEntity):
         self._attr_unique_id = f"hidom_raw_meter_{host.replace('.', '_')}"
         self._attr_name = "HiDOM Raw Power Meter"
     
+    @property
+    def unique_id(self) -> str:
+        return self._attr_unique_id
+    
+    @property
+    def name(self) -> str:
+        return self._attr_name
+    
     def _update_from_coordinator(self) -> None:
         """Update data from coordinator."""
         pass
     
     def _is_device_data_available(self) -> bool:
-        return self.coordinator.data is not None
+        return _meter_reading(self.coordinator) is not None
     
     @property
     def native_value(self):
         """Return raw value."""
-        data = self.coordinator.data
+        data = _meter_reading(self.coordinator)
         if data is None:
             return None
         
@@ -65,17 +78,25 @@ class HiDOMEnergyMeterSensor(HiDOMBaseEntity, SensorEntity):
         self._attr_unique_id = f"hidom_energy_meter_{host.replace('.', '_')}"
         self._attr_name = "HiDOM Energy Meter"
     
+    @property
+    def unique_id(self) -> str:
+        return self._attr_unique_id
+    
+    @property
+    def name(self) -> str:
+        return self._attr_name
+    
     def _update_from_coordinator(self) -> None:
         """Update data from coordinator."""
         pass
     
     def _is_device_data_available(self) -> bool:
-        return self.coordinator.data is not None
+        return _meter_reading(self.coordinator) is not None
     
     @property
     def native_value(self):
         """Return value in kWh."""
-        data = self.coordinator.data
+        data = _meter_reading(self.coordinator)
         if data is None:
             return None
         
@@ -94,7 +115,7 @@ class HiDOMEnergyMeterSensor(HiDOMBaseEntity, SensorEntity):
             "ip_address": self._host,
         }
         
-        data = self.coordinator.data
+        data = _meter_reading(self.coordinator)
         if data is not None:
             try:
                 attrs["raw_value_wh"] = float(data)
@@ -112,64 +133,45 @@ class HiDOMPowerSensor(HiDOMBaseEntity, SensorEntity):
     _attr_native_unit_of_measurement = UnitOfPower.KILO_WATT
     _attr_suggested_display_precision = 3
     
-    def __init__(self, coordinator, host: str):
+    def __init__(self, coordinator, host: str, estimator: HiDOMPowerEstimator):
         """Initialize."""
         super().__init__(coordinator, host)
         self._attr_unique_id = f"hidom_power_{host.replace('.', '_')}"
         self._attr_name = "HiDOM Current Power"
-        
-        # For power calculation
-        self._last_energy = None
-        self._last_update_time = None
-        self._current_power = 0.0
+        self._estimator = estimator
+    
+    @property
+    def unique_id(self) -> str:
+        return self._attr_unique_id
+    
+    @property
+    def name(self) -> str:
+        return self._attr_name
     
     def _update_from_coordinator(self) -> None:
         """Update data from coordinator."""
         pass
     
     def _is_device_data_available(self) -> bool:
-        return self.coordinator.data is not None
+        return _meter_reading(self.coordinator) is not None
     
     @property
     def native_value(self):
-        """Calculate current power."""
-        data = self.coordinator.data
-        
-        if data is None:
-            return round(self._current_power, 3)
-        
-        try:
-            current_energy = float(data)
-            current_time = time.time()
-            
-            if self._last_energy is not None and self._last_update_time is not None:
-                # Calculate difference
-                energy_diff_wh = current_energy - self._last_energy
-                time_diff_hours = (current_time - self._last_update_time) / 3600.0
-                
-                if time_diff_hours > 0:
-                    power_kw = (energy_diff_wh / time_diff_hours) / 1000.0
-                    
-                    # Smoothing
-                    if self._current_power == 0:
-                        self._current_power = power_kw
-                    else:
-                        self._current_power = 0.7 * self._current_power + 0.3 * power_kw
-            
-            # Update previous values
-            self._last_energy = current_energy
-            self._last_update_time = current_time
-            
-            return round(self._current_power, 3)
-            
-        except (ValueError, TypeError):
-            return round(self._current_power, 3)
+        """Return power estimated from the meter samples."""
+        power_kw = self._estimator.power_kw
+        if power_kw is None:
+            return None
+        return round(power_kw, 3)
     
     @property
     def extra_state_attributes(self):
         """Return extra state attributes."""
+        estimate = self._estimator.as_dict()
         return {
             "data_source": "HiDOM Power Calculation",
             "ip_address": self._host,
-            "calculated_power_kw": round(self._current_power, 3),
+            "calculated_power_kw": estimate["power_kw"],
+            "estimation_method": estimate["method"],
+            "samples": estimate["samples"],
+            "counter_resets": estimate["resets"],
         }
\ No newline at end of file
@@ -1,7 +1,10 @@
 """Error handling for HiDOM."""
 import logging
+import time
 from functools import wraps
-from typing import Type, Tuple
+from typing import Dict, Optional, Type, Tuple
+
+from .const import ERROR_LOG_INTERVAL
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -17,23 +20,84 @@ class DeviceError(HiDOMError):
     """Device specific errors."""
     pass
 
+class CircuitOpenError(ConnectionError):
+    """Request refused because the controller is marked unreachable."""
+    pass
+
+class RateLimitedLogger:
+    """Logger that repeats the same message at most once per interval."""
+    
+    def __init__(self, logger: logging.Logger, interval: float = ERROR_LOG_INTERVAL):
+        """Initialize."""
+        self._logger = logger
+        self._interval = interval
+        self._last: Dict[str, float] = {}
+        self._suppressed: Dict[str, int] = {}
+    
+    def log(self, level: int, key: str, msg: str, *args) -> None:
+        """Log unless ``key`` was logged within the interval."""
+        now = time.monotonic()
+        last = self._last.get(key)
+        
+        if last is not None and now - last < self._interval:
+            self._suppressed[key] = self._suppressed.get(key, 0) + 1
+            return
+        
+        self._last[key] = now
+        suppressed = self._suppressed.pop(key, 0)
+        if suppressed:
+            msg += " (%s similar messages suppressed)"
+            args = (*args, suppressed)
+        
+        self._logger.log(level, msg, *args)
+    
+    def error(self, key: str, msg: str, *args) -> None:
+        """Log an error."""
+        self.log(logging.ERROR, key, msg, *args)
+    
+    def reset(self, prefix: str) -> None:
+        """Forget keys starting with ``prefix`` so their next message is logged."""
+        if not self._last:
+            return
+        
+        for key in [key for key in self._last if key.startswith(prefix)]:
+            self._last.pop(key, None)
+            self._suppressed.pop(key, None)
+
+_RATE_LIMITED = RateLimitedLogger(_LOGGER)
+
 def handle_errors(
     exceptions: Tuple[Type[Exception], ...] = (Exception,),
-    default_return=None
+    default_return=None,
+    message: Optional[str] = None
 ):
-    """Decorator for error handling."""
+    """Decorator for error handling.
+    
+    Repeated errors of the same kind are logged at most once per
+    ``ERROR_LOG_INTERVAL`` and controller ``host``. A successful call
+    ends the suppression, so the next failure is logged at once.
+    """
     def decorator(func):
+        text = message or f"Error in {func.__name__}"
+        
         @wraps(func)
         async def wrapper(*args, **kwargs):
+            host = getattr(args[0], "host", "") if args else ""
+            prefix = f"{host}:{func.__qualname__}:"
+            
             try:
-                return await func(*args, **kwargs)
+                result = await func(*args, **kwargs)
             except exceptions as e:
-                _LOGGER.error(
-                    "Error in %s: %s",
-                    func.__name__,
-                    str(e)
+                _RATE_LIMITED.error(
+                    f"{prefix}{type(e).__name__}",
+                    "%s: %s",
+                    text,
+                    str(e) or type(e).__name__
                 )
                 return default_return
+            
+            _RATE_LIMITED.reset(prefix)
+            return result
         return wrapper
     return decorator
 
@@ -1,55 +1,138 @@
 """Services for HiDOM integration."""
+import asyncio
+import logging
+from typing import Any, Dict
+
 import voluptuous as vol
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
 from homeassistant.helpers import config_validation as cv
 
+from .api.models import IDUDevice
 from .const import DOMAIN
 
+_LOGGER = logging.getLogger(__name__)
+
 SERVICE_REFRESH_DEVICES = "refresh_devices"
+SERVICE_REDISCOVER_DEVICES = "rediscover_devices"
 SERVICE_SYNC_TIME = "sync_time"
 SERVICE_SET_GLOBAL_TEMP = "set_global_temperature"
 
 SERVICE_SCHEMA_REFRESH_DEVICES = vol.Schema({})
 
+SERVICE_SCHEMA_REDISCOVER_DEVICES = vol.Schema({})
+
 SERVICE_SCHEMA_SYNC_TIME = vol.Schema({})
 
 SERVICE_SCHEMA_SET_GLOBAL_TEMP = vol.Schema({
     vol.Required("temperature"): vol.All(vol.Coerce(int), vol.Range(16, 30)),
+    vol.Optional("turn_on", default=True): cv.boolean,
+    vol.Optional("sys"): vol.All(cv.ensure_list, [vol.Coerce(int)]),
+    vol.Optional("pname"): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional("tenant_name"): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional("uids"): vol.All(cv.ensure_list, [cv.string]),
 })
 
+# Service fields matched against unit attributes
+FILTER_FIELDS = ("sys", "pname", "tenant_name")
+
+def _matches_filters(uid: str, device: IDUDevice, filters: Dict[str, Any]) -> bool:
+    """Check whether a unit matches all given target filters."""
+    if "uids" in filters and uid not in filters["uids"]:
+        return False
+    
+    return all(
+        getattr(device, field) in filters[field]
+        for field in FILTER_FIELDS
+        if field in filters
+    )
+
+async def _async_set_hub_temperature(
+    data: Dict[str, Any],
+    params: Dict[str, Any]
+) -> Dict[str, Dict[str, Any]]:
+    """Set the target temperature of matching units of one hub.
+    
+    All units of the hub are written in batched set_idu requests and
+    confirmed by a read-back. Mode and fan are kept. Units are switched
+    on as before unless ``turn_on`` is false.
+    """
+    coordinator = data["coordinator"]
+    devices = coordinator.data.devices if coordinator.data else {}
+    
+    changes: Dict[str, Any] = {"temp": params["temperature"]}
+    if params["turn_on"]:
+        changes["onoff"] = 1
+    
+    results: Dict[str, Dict[str, Any]] = {}
+    targets = []
+    
+    for uid, device in devices.items():
+        if not _matches_filters(uid, device, params):
+            continue
+        
+        if device.status == "offline":
+            results[uid] = {"name": device.name, "success": False, "error": "offline"}
+            continue
+        
+        targets.append(uid)
+    
+    sent = await coordinator.async_command_units(targets, changes)
+    for uid, success in sent.items():
+        result: Dict[str, Any] = {"name": devices[uid].name, "success": success is True}
+        if isinstance(success, BaseException):
+            # Cancelled writes come back as CancelledError, not Exception
+            error = str(success) or type(success).__name__
+            _LOGGER.error("Failed to set temperature of %s: %s", uid, error)
+            result["error"] = error
+        elif not success:
+            result["error"] = "not applied"
+        results[uid] = result
+    
+    return results
+
 async def async_setup_services(hass: HomeAssistant) -> None:
     """Set up services for HiDOM."""
     
     async def handle_refresh_devices(call: ServiceCall) -> None:
         """Handle refresh_devices service call."""
         for entry_id in hass.data[DOMAIN]:
-            coordinator = hass.data[DOMAIN][entry_id]["coordinator_climate"]
-            await coordinator.async_refresh()
+            coordinator = hass.data[DOMAIN][entry_id]["coordinator"]
+            await coordinator.async_refresh_devices()
+    
+    async def handle_rediscover_devices(call: ServiceCall) -> None:
+        """Handle rediscover_devices service call."""
+        for entry_id in hass.data[DOMAIN]:
+            device_manager = hass.data[DOMAIN][entry_id]["device_manager"]
+            coordinator = hass.data[DOMAIN][entry_id]["coordinator"]
+            
+            # Topology is refetched by the next poll
+            device_manager.invalidate_topology()
+            await coordinator.async_refresh_devices()
     
     async def handle_sync_time(call: ServiceCall) -> None:
         """Handle sync_time service call."""
         # Placeholder for time synchronization service
         pass
     
-    async def handle_set_global_temp(call: ServiceCall) -> None:
+    async def handle_set_global_temp(call: ServiceCall) -> ServiceResponse:
         """Handle set_global_temperature service call."""
-        temperature = call.data["temperature"]
+        hubs = list(hass.data[DOMAIN].values())
+        results = await asyncio.gather(*(
+            _async_set_hub_temperature(data, call.data) for data in hubs
+        ))
         
-        for entry_id in hass.data[DOMAIN]:
-            coordinator = hass.data[DOMAIN][entry_id]["coordinator_climate"]
-            device_manager = hass.data[DOMAIN][entry_id]["device_manager"]
-            
-            if coordinator.data:
-                for device_uid in coordinator.data:
-                    # Update each device
-                    await device_manager.update_device(
-                        device_id=device_uid,
-                        temp=temperature,
-                        onoff=1  # Ensure device is on
-                    )
-            
-            # Refresh coordinator
-            await coordinator.async_refresh()
+        # Unit identifiers repeat between hubs
+        units = [
+            {"hub": data["host"], "uid": uid, **result}
+            for data, hub in zip(hubs, results)
+            for uid, result in hub.items()
+        ]
+        succeeded = sum(1 for result in units if result["success"])
+        return {
+            "units": units,
+            "succeeded": succeeded,
+            "failed": len(units) - succeeded,
+        }
     
     hass.services.async_register(
         DOMAIN,
@@ -58,6 +141,13 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         schema=SERVICE_SCHEMA_REFRESH_DEVICES,
     )
     
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REDISCOVER_DEVICES,
+        handle_rediscover_devices,
+        schema=SERVICE_SCHEMA_REDISCOVER_DEVICES,
+    )
+    
     hass.services.async_register(
         DOMAIN,
         SERVICE_SYNC_TIME,
@@ -70,10 +160,12 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         SERVICE_SET_GLOBAL_TEMP,
         handle_set_global_temp,
         schema=SERVICE_SCHEMA_SET_GLOBAL_TEMP,
+        supports_response=SupportsResponse.OPTIONAL,
     )
 
 async def async_unload_services(hass: HomeAssistant) -> None:
     """Unload HiDOM services."""
     hass.services.async_remove(DOMAIN, SERVICE_REFRESH_DEVICES)
+    hass.services.async_remove(DOMAIN, SERVICE_REDISCOVER_DEVICES)
     hass.services.async_remove(DOMAIN, SERVICE_SYNC_TIME)
     hass.services.async_remove(DOMAIN, SERVICE_SET_GLOBAL_TEMP)
\ No newline at end of file
@@ -0,0 +1,62 @@
+"""Persistent storage for HiDOM."""
+import logging
+from typing import Any, Dict, List
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, TOPOLOGY_STORAGE_VERSION, TOPOLOGY_SAVE_DELAY
+
+_LOGGER = logging.getLogger(__name__)
+
+# Topology fields worth keeping between restarts
+TOPOLOGY_FIELDS = (
+    "type",
+    "sysAdr",
+    "address",
+    "code",
+    "name",
+    "pname",
+    "ppname",
+    "pppname",
+    "indoorName",
+    "tenantName",
+)
+
+class HiDOMTopologyStore:
+    """Saved IDU topology of a config entry."""
+    
+    def __init__(self, hass: HomeAssistant, entry_id: str):
+        """Initialize."""
+        self._store = Store(
+            hass,
+            TOPOLOGY_STORAGE_VERSION,
+            f"{DOMAIN}.{entry_id}.topology"
+        )
+    
+    async def async_load(self) -> List[Dict[str, Any]]:
+        """Load saved topology items."""
+        try:
+            data = await self._store.async_load()
+        except Exception as e:
+            _LOGGER.warning("Failed to load saved topology: %s", e)
+            return []
+        
+        if not data:
+            return []
+        
+        return data.get("topo", [])
+    
+    def async_delay_save(self, topo: List[Dict[str, Any]]) -> None:
+        """Schedule saving of topology items."""
+        data = {
+            "topo": [
+                {key: item[key] for key in TOPOLOGY_FIELDS if key in item}
+                for item in topo
+            ]
+        }
+        self._store.async_delay_save(lambda: data, TOPOLOGY_SAVE_DELAY)
+    
+    async def async_remove(self) -> None:
+        """Remove saved topology."""
+        await self._store.async_remove()
\ No newline at end of file
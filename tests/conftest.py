@@ -0,0 +1,77 @@
+"""Shared fixtures for HiDOM tests."""
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "tools"))
+
+from custom_components.hidom.api.decoder import extract_idu_units  # noqa: E402
+from custom_components.hidom.const import SET_IDU_REG_ADDR  # noqa: E402
+from simulator import HiDOMSimulator, SimulatorConfig  # noqa: E402
+
+class FakeHiDOMClient:
+    """API client answering from an in-memory simulator.
+    
+    ``failing_systems`` makes get_idu_data requests including those
+    systems fail, ``write_result`` decides what set_idu reports:
+    ``True`` applies the commands, ``False`` reports a failed write,
+    ``None`` reports success without applying them and an exception
+    instance is raised instead.
+    """
+    
+    def __init__(self, systems: int = 2, idus_per_system: int = 4):
+        """Initialize."""
+        self.simulator = HiDOMSimulator(SimulatorConfig(
+            systems=systems,
+            idus_per_system=idus_per_system,
+            seed=0,
+        ))
+        self.failing_systems = set()
+        self.write_result = True
+        self.circuit_open = False
+        self.power = 1000.0
+        self.idu_requests = []
+        self.writes = []
+        self.power_requests = 0
+    
+    async def get_miscdata(self):
+        """Return the simulated topology."""
+        return self.simulator.miscdata()["miscdata"]
+    
+    async def get_idu_data(self, devs, timeout=None):
+        """Return unit entries, or None when a failing system is requested."""
+        self.idu_requests.append(devs)
+        if any(int(dev["sys"]) in self.failing_systems for dev in devs):
+            return None
+        return extract_idu_units(json.dumps(self.simulator.idu_data(devs)).encode())
+    
+    async def set_idu_batch(self, commands, max_batch_size=None):
+        """Apply commands according to ``write_result``."""
+        self.writes.append(commands)
+        if isinstance(self.write_result, BaseException):
+            raise self.write_result
+        if self.write_result:
+            self.simulator.set_idu([
+                {
+                    "sys": command.sys,
+                    "iduAddr": command.addr,
+                    "regAddr": SET_IDU_REG_ADDR,
+                    "regVal": command.reg_values,
+                }
+                for command in commands
+            ])
+        return [self.write_result is not False] * len(commands)
+    
+    async def get_power_data(self):
+        """Return the configured meter reading."""
+        self.power_requests += 1
+        return self.power
+
+@pytest.fixture
+def fake_client():
+    """Return an API client backed by a simulator with 2 systems of 4 units."""
+    return FakeHiDOMClient()
@@ -0,0 +1,111 @@
+"""Tests for command coalescing."""
+import asyncio
+
+from custom_components.hidom.device.commands import HiDOMCommandBuffer
+
+def test_cancelled_flush_resolves_futures():
+    """Callers get False when the flush is cancelled during the write."""
+    async def run():
+        started = asyncio.Event()
+        
+        async def send(pending):
+            started.set()
+            await asyncio.sleep(10)
+            return {device_id: True for device_id in pending}
+        
+        buffer = HiDOMCommandBuffer(send, delay=60, max_delay=60)
+        applied = buffer.queue("S1_1", {"temp": 22})
+        flush = asyncio.create_task(buffer.async_flush())
+        await started.wait()
+        
+        flush.cancel()
+        result = await asyncio.wait_for(applied, 1)
+        return result, flush.cancelled()
+    
+    assert asyncio.run(run()) == (False, True)
+
+def _recording_send(sent):
+    """Return a send callback recording every flushed batch."""
+    async def send(pending):
+        sent.append({device_id: dict(regs) for device_id, regs in pending.items()})
+        return {device_id: True for device_id in pending}
+    return send
+
+def test_commands_merge_per_device():
+    """Successive changes of one device are sent as one write."""
+    async def run():
+        sent = []
+        buffer = HiDOMCommandBuffer(_recording_send(sent), delay=60, max_delay=60)
+        first = buffer.queue("S1_1", {"temp": 22, "mode": 1})
+        second = buffer.queue("S1_1", {"temp": 24})
+        other = buffer.queue("S1_2", {"power": False})
+        
+        assert first is second
+        await buffer.async_flush()
+        return sent, await first, await other
+    
+    sent, first, other = asyncio.run(run())
+    assert sent == [{"S1_1": {"temp": 24, "mode": 1}, "S1_2": {"power": False}}]
+    assert first is True and other is True
+
+def test_defaults_only_fill_missing_registers():
+    """Defaults never override a pending change."""
+    async def run():
+        sent = []
+        buffer = HiDOMCommandBuffer(_recording_send(sent), delay=60, max_delay=60)
+        buffer.queue("S1_1", {"temp": 24})
+        buffer.queue("S1_1", {"mode": 2}, defaults={"temp": 20, "fan": 1})
+        await buffer.async_flush()
+        return sent
+    
+    assert asyncio.run(run()) == [{"S1_1": {"temp": 24, "mode": 2, "fan": 1}}]
+
+def test_debounce_sends_once_per_window():
+    """Commands arriving within the delay are flushed together."""
+    async def run():
+        sent = []
+        buffer = HiDOMCommandBuffer(_recording_send(sent), delay=0.05, max_delay=5)
+        first = buffer.queue("S1_1", {"temp": 22})
+        await asyncio.sleep(0.02)
+        second = buffer.queue("S1_2", {"temp": 23})
+        await asyncio.sleep(0.02)
+        
+        # Timer was restarted by the second command
+        assert sent == []
+        await asyncio.wait_for(asyncio.gather(first, second), 1)
+        return sent
+    
+    assert asyncio.run(run()) == [{"S1_1": {"temp": 22}, "S1_2": {"temp": 23}}]
+
+def test_max_delay_bounds_debounce():
+    """A steady stream of commands is flushed after the maximum delay."""
+    async def run():
+        sent = []
+        buffer = HiDOMCommandBuffer(_recording_send(sent), delay=0.05, max_delay=0.1)
+        applied = buffer.queue("S1_1", {"temp": 20})
+        
+        for temp in range(21, 30):
+            await asyncio.sleep(0.03)
+            if sent:
+                break
+            buffer.queue("S1_1", {"temp": temp})
+        
+        await asyncio.wait_for(applied, 1)
+        return sent
+    
+    sent = asyncio.run(run())
+    assert len(sent) == 1
+    assert sent[0]["S1_1"]["temp"] < 29
+
+def test_failed_send_resolves_false():
+    """Callers get False when the write raises."""
+    async def run():
+        async def send(pending):
+            raise ConnectionError("unreachable")
+        
+        buffer = HiDOMCommandBuffer(send, delay=60, max_delay=60)
+        applied = buffer.queue("S1_1", {"temp": 22})
+        await buffer.async_flush()
+        return await applied, buffer.pending
+    
+    assert asyncio.run(run()) == (False, {})
@@ -0,0 +1,117 @@
+"""Tests for the hub update cycle."""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.hidom import coordinator as hub  # noqa: E402
+from custom_components.hidom.device.manager import HiDOMDeviceManager  # noqa: E402
+from custom_components.hidom.device.polling import HiDOMPollScheduler  # noqa: E402
+from custom_components.hidom.device.power import HiDOMPowerEstimator  # noqa: E402
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace the monotonic clock of the coordinator with a settable one."""
+    now = SimpleNamespace(value=0.0)
+    monkeypatch.setattr(hub, "time", SimpleNamespace(monotonic=lambda: now.value))
+    return now
+
+def _coordinator(client):
+    """Return a coordinator polling units every 10 s and the meter every 30 s."""
+    manager = HiDOMDeviceManager(
+        client,
+        scheduler=HiDOMPollScheduler(10, backoff_factor=1)
+    )
+    return hub.HiDOMHubCoordinator(
+        None,
+        client,
+        manager,
+        HiDOMPowerEstimator(),
+        meter_interval=30
+    )
+
+def _cycles(coordinator, clock, times):
+    """Run update cycles at the given times.
+    
+    Returns what each cycle fetched and the interval until the next one.
+    """
+    async def run():
+        cycles = []
+        
+        for now in times:
+            clock.value = now
+            coordinator.data = await coordinator._async_update_data()
+            cycles.append((
+                coordinator.data.devices_updated,
+                coordinator.data.power_updated,
+                coordinator.update_interval.total_seconds(),
+            ))
+        
+        return cycles
+    
+    return asyncio.run(run())
+
+def test_first_cycle_fetches_both(fake_client, clock):
+    """The first cycle fetches units and meter together."""
+    coordinator = _coordinator(fake_client)
+    
+    assert _cycles(coordinator, clock, [0]) == [(True, True, 10)]
+    assert len(coordinator.data.devices) == 8
+    assert coordinator.data.power == 1000.0
+
+def test_units_and_meter_follow_own_intervals(fake_client, clock):
+    """Each cycle fetches only what is due and waits for the next due time."""
+    coordinator = _coordinator(fake_client)
+    
+    assert _cycles(coordinator, clock, [0, 10, 20, 30, 40]) == [
+        (True, True, 10),
+        (True, False, 10),
+        (True, False, 10),
+        (True, True, 10),
+        (True, False, 10),
+    ]
+    assert len(fake_client.idu_requests) == 5
+    assert fake_client.power_requests == 2
+
+def test_timer_slack_counts_as_due(fake_client, clock):
+    """A timer firing slightly early still fetches the meter."""
+    coordinator = _coordinator(fake_client)
+    
+    assert _cycles(coordinator, clock, [0, 29.5]) == [
+        (True, True, 10),
+        (True, True, 10),
+    ]
+
+def test_refresh_outside_schedule_updates_units(fake_client, clock):
+    """A cycle with nothing due refreshes the units, not the meter."""
+    coordinator = _coordinator(fake_client)
+    
+    assert _cycles(coordinator, clock, [0, 5]) == [
+        (True, True, 10),
+        (True, False, 10),
+    ]
+    assert fake_client.power_requests == 1
+
+def test_meter_only_cycle_keeps_units(fake_client, clock):
+    """A cycle where only the meter is due reuses the unit state."""
+    coordinator = _coordinator(fake_client)
+    coordinator._meter_interval = 5
+    
+    cycles = _cycles(coordinator, clock, [0, 5])
+    
+    assert cycles == [(True, True, 5), (False, True, 5)]
+    assert len(fake_client.idu_requests) == 1
+
+def test_open_circuit_keeps_power(fake_client, clock):
+    """The last reading is kept while the controller is unreachable."""
+    coordinator = _coordinator(fake_client)
+    _cycles(coordinator, clock, [0])
+    
+    fake_client.power = None
+    fake_client.circuit_open = True
+    _cycles(coordinator, clock, [30])
+    
+    assert coordinator.data.power_updated
+    assert coordinator.data.power == 1000.0
@@ -0,0 +1,134 @@
+"""Tests for get_idu_data response decoding."""
+import json
+
+import pytest
+
+from custom_components.hidom.api import decoder
+from custom_components.hidom.api.registers import decode_registers
+
+from custom_components.hidom.const import (
+    DATA_ERROR_CODE,
+    DATA_FAN,
+    DATA_MODE,
+    DATA_ONOFF,
+    DATA_PIPE_TEMP,
+    DATA_ROOM_TEMP,
+    DATA_SET_TEMP,
+)
+
+def _registers(values, fill=0):
+    """Return a register array with ``values`` by offset set."""
+    data = [fill] * (DATA_ROOM_TEMP + 1)
+    for offset, value in values.items():
+        data[offset] = value
+    return data
+
+# Plain, quoted, decimal and invalid register values
+PAYLOAD = json.dumps({
+    "status": "success",
+    "dats": [
+        {"sys": 1, "addr": 1, "data": _registers({
+            DATA_ONOFF: 1, DATA_MODE: 2, DATA_FAN: 4, DATA_SET_TEMP: 26,
+            DATA_PIPE_TEMP: 18, DATA_ROOM_TEMP: 27,
+        }) + [7] * 40},
+        {"sys": "1", "addr": "2", "data": _registers({
+            DATA_ONOFF: "1", DATA_MODE: "3", DATA_FAN: "1", DATA_SET_TEMP: "27",
+            DATA_PIPE_TEMP: "18", DATA_ROOM_TEMP: "26.5",
+        }, fill="0")},
+        {"sys": 2, "addr": 3, "data": _registers({
+            DATA_ONOFF: 1, DATA_MODE: 1.0, DATA_SET_TEMP: 22.5, DATA_ERROR_CODE: "0",
+            DATA_PIPE_TEMP: "19.5", DATA_ROOM_TEMP: 25.5,
+        })},
+        {"sys": 2, "addr": 4, "data": _registers({
+            DATA_ONOFF: 1, DATA_MODE: None, DATA_FAN: "x", DATA_SET_TEMP: True,
+        })[:DATA_ERROR_CODE]},
+        {"sys": 2, "addr": 5, "data": []},
+    ],
+}).encode()
+
+def _expected():
+    """Return registers decoded from a full stdlib parse."""
+    return {
+        (int(item["sys"]), int(item["addr"])): decode_registers(item["data"])
+        for item in json.loads(PAYLOAD)["dats"]
+    }
+
+def _decoded(payload: bytes):
+    """Return registers decoded from ``extract_idu_units``."""
+    return {
+        (sys_id, addr): decode_registers(list(registers))
+        for sys_id, addr, registers in decoder.extract_idu_units(payload)
+    }
+
+@pytest.fixture(params=sorted(decoder.JSON_BACKENDS))
+def backend(request):
+    """Run a test with every installed JSON backend."""
+    previous = decoder.json_backend
+    decoder.set_json_backend(request.param)
+    yield request.param
+    decoder.set_json_backend(previous)
+
+def test_backends_decode_same_registers(backend):
+    """Raw matching and full parsing give the same register values."""
+    assert _decoded(PAYLOAD) == _expected()
+
+def test_ascii_code_payload(backend):
+    """ASCII-code bodies decode like the plain JSON body."""
+    payload = " ".join(str(code) for code in PAYLOAD).encode()
+    assert _decoded(payload) == _expected()
+
+def test_quoted_registers_match_raw():
+    """Quoted register values do not stay raw bytes on the matcher path."""
+    units = decoder._match_idu_units(PAYLOAD)
+    assert units is not None
+    
+    registers = decode_registers(list(units[1][2]))
+    assert registers["set_temp"] == 27
+    assert registers["mode_code"] == 3
+    assert registers["room_temp"] == 26.5
+
+def test_failed_status(backend):
+    """Replies without success status give no units."""
+    assert decoder.extract_idu_units(b'{"status": "fail", "dats": []}') is None
+
+def test_nested_status_parsed_in_full(backend):
+    """A status field inside a unit entry does not decide the reply status."""
+    payload = json.dumps({
+        "dats": [{"sys": 1, "addr": 1, "status": "success", "data": [1, 2, 3]}],
+        "status": "fail",
+    }).encode()
+    assert decoder.extract_idu_units(payload) is None
+
+def test_meter_powers():
+    """Meter powers are read from the dats entries in order."""
+    payload = json.dumps({
+        "status": "success",
+        "dats": [{"id": "1", "pwr": "1200.5"}, {"id": "2", "pwr": -1}],
+    }).encode()
+    assert decoder.extract_meter_powers(payload) == [1200.5, -1.0]
+
+def test_meter_nested_pwr_parsed_in_full():
+    """A pwr field outside the dats entries is not taken as a meter."""
+    payload = json.dumps({
+        "status": "success",
+        "dats": [{"id": "1", "pwr": "1200.5", "phase": {"pwr": "400.0"}}, {"id": "2"}],
+        "total": {"pwr": "99.0"},
+    }).encode()
+    assert decoder.extract_meter_powers(payload) == [1200.5]
+
+def test_meter_failed_status():
+    """Meter replies without success status give no powers."""
+    payload = b'{"dats": [{"status": "success", "pwr": "1.0"}], "status": "fail"}'
+    assert decoder.extract_meter_powers(payload) is None
+
+def test_invalid_utf8_is_dropped(backend):
+    """A stray byte of another encoding does not lose the whole reply."""
+    payload = '{"status": "success", "miscdata": {"topo": [{"name": "Office '.encode()
+    payload += "\u043a".encode("cp1251") + b'"}]}}'
+    
+    data = decoder.decode_payload(payload)
+    assert data["miscdata"]["topo"][0]["name"] == "Office "
+
+def test_malformed_json_is_rejected(backend):
+    """Malformed documents still give None."""
+    assert decoder.decode_payload(b'{"status": ') is None
\ No newline at end of file
@@ -0,0 +1,49 @@
+"""Tests for rate limited error logging."""
+import asyncio
+import logging
+
+from custom_components.hidom.error_handler import handle_errors
+
+class _Client:
+    """Client with a host whose request can be made to fail."""
+    
+    def __init__(self, host):
+        self.host = host
+        self.fail = True
+    
+    @handle_errors((OSError,), None, "Request failed")
+    async def request(self):
+        if self.fail:
+            raise OSError("unreachable")
+        return "ok"
+
+def _errors(caplog):
+    """Return logged error messages and clear them."""
+    messages = [record.getMessage() for record in caplog.records if record.levelno == logging.ERROR]
+    caplog.clear()
+    return messages
+
+def test_hosts_logged_separately(caplog):
+    """A failure on one controller does not hide the first of another."""
+    first, second = _Client("10.0.0.1"), _Client("10.0.0.2")
+    
+    assert asyncio.run(first.request()) is None
+    assert asyncio.run(first.request()) is None
+    assert asyncio.run(second.request()) is None
+    
+    assert _errors(caplog) == ["Request failed: unreachable"] * 2
+
+def test_success_ends_suppression(caplog):
+    """A failure after recovery is logged at once."""
+    client = _Client("10.0.0.3")
+    
+    asyncio.run(client.request())
+    asyncio.run(client.request())
+    assert len(_errors(caplog)) == 1
+    
+    client.fail = False
+    assert asyncio.run(client.request()) == "ok"
+    
+    client.fail = True
+    asyncio.run(client.request())
+    assert _errors(caplog) == ["Request failed: unreachable"]
\ No newline at end of file
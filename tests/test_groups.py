@@ -0,0 +1,178 @@
+"""Tests for incremental group aggregates."""
+from custom_components.hidom.api.models import IDUDevice
+from custom_components.hidom.api.registers import apply_fields
+from custom_components.hidom.const import FAN_AUTO, FAN_HIGH, FAN_LOW, MODE_COOL, MODE_HEAT
+from custom_components.hidom.device.groups import HiDOMGroupIndex
+
+HALL = "room/A/1/Hall"
+
+def _device(addr, floor="1", room="Hall", tenant="Acme"):
+    """Return a unit of building A."""
+    return IDUDevice.from_topology({
+        "sysAdr": 1,
+        "address": str(addr),
+        "pppname": "A",
+        "ppname": floor,
+        "pname": room,
+        "tenantName": tenant,
+    })
+
+def _set(device, power, room_temp, set_temp, mode=MODE_COOL, fan=FAN_AUTO, error_code=0):
+    """Give a unit a polled state."""
+    apply_fields(device, {
+        "power": power,
+        "error_code": error_code,
+        "mode_code": mode,
+        "fan_code": fan,
+        "set_temp": set_temp,
+        "room_temp": room_temp,
+    })
+    return device
+
+def _installation():
+    """Return units of building A and the polled ones.
+    
+    The hall on floor 1 has two running units, one switched off, one
+    offline and one not polled yet. Floor 2 has a running office unit.
+    """
+    devices = [
+        _set(_device(1), 1, 22.0, 21),
+        _set(_device(2), 1, 24.0, 23),
+        _set(_device(3), 0, 20.0, 25, mode=MODE_HEAT, fan=FAN_LOW),
+        _set(_device(4), 1, 30.0, 18, error_code=60),
+        _set(_device(5, floor="2", room="Office", tenant="Globex"), 1, 26.0, 24, mode=MODE_HEAT, fan=FAN_HIGH),
+        _device(6),
+    ]
+    polled = {device.uid: device for device in devices[:5]}
+    return devices, polled
+
+def _aggregates(group):
+    """Return aggregate state of a group without its identity."""
+    state = group.as_dict()
+    return {key: state[key] for key in state if key not in ("key", "kind", "name", "parent")}
+
+def test_group_aggregates():
+    """Groups count units and aggregate online and running ones."""
+    devices, polled = _installation()
+    index = HiDOMGroupIndex()
+    index.rebuild(devices, polled)
+    
+    assert sorted(index.groups) == [
+        "building/A", "floor/A/1", "floor/A/2",
+        HALL, "room/A/2/Office", "tenant/Acme", "tenant/Globex",
+    ]
+    assert index.get(HALL).parent == "floor/A/1"
+    assert index.get("floor/A/1").parent == "building/A"
+    
+    assert _aggregates(index.get(HALL)) == {
+        "units": 5,
+        "units_polled": 4,
+        "units_on": 2,
+        "units_offline": 1,
+        "min_room_temp": 20.0,
+        "max_room_temp": 24.0,
+        "avg_room_temp": 22.0,
+        "avg_set_temp": 22.0,
+        "mode": "cool",
+        "fan": "auto",
+    }
+    assert _aggregates(index.get("building/A")) == {
+        "units": 6,
+        "units_polled": 5,
+        "units_on": 3,
+        "units_offline": 1,
+        "min_room_temp": 20.0,
+        "max_room_temp": 26.0,
+        "avg_room_temp": 23.0,
+        "avg_set_temp": 22.7,
+        "mode": "cool",
+        "fan": "auto",
+    }
+    assert index.get("tenant/Globex").uids == ["S1_5"]
+
+def test_changed_unit_updates_its_groups():
+    """A changed unit updates exactly the groups it belongs to."""
+    devices, polled = _installation()
+    index = HiDOMGroupIndex()
+    index.rebuild(devices, polled)
+    office = index.get("room/A/2/Office").version
+    
+    _set(devices[0], 0, 22.0, 21)
+    changed = index.update(polled, ["S1_1"])
+    
+    assert changed == {"building/A", "floor/A/1", HALL, "tenant/Acme"}
+    assert index.get("room/A/2/Office").version == office
+    
+    hall = index.get(HALL)
+    assert (hall.units_on, hall.avg_set_temp, hall.avg_room_temp) == (1, 23.0, 22.0)
+
+def test_unit_leaving_poll_drops_contribution():
+    """A unit missing from the poll no longer counts, and counts again on return."""
+    devices, polled = _installation()
+    index = HiDOMGroupIndex()
+    index.rebuild(devices, polled)
+    hall = index.get(HALL)
+    
+    del polled["S1_2"]
+    index.update(polled, ["S1_2"])
+    assert (len(hall.uids), hall.units_polled, hall.units_on) == (5, 3, 1)
+    assert (hall.max_room_temp, hall.avg_room_temp, hall.avg_set_temp) == (22.0, 21.0, 21.0)
+    
+    polled["S1_2"] = devices[1]
+    index.update(polled, ["S1_2"])
+    assert (hall.units_polled, hall.units_on, hall.max_room_temp) == (4, 2, 24.0)
+    
+    # Offline units count as polled, without temperatures
+    _set(devices[1], 1, 24.0, 23, error_code=61)
+    index.update(polled, ["S1_2"])
+    assert (hall.units_offline, hall.units_on, hall.max_room_temp) == (2, 1, 22.0)
+
+def test_unchanged_unit_changes_no_group():
+    """Applying the same state again reports no changed group."""
+    devices, polled = _installation()
+    index = HiDOMGroupIndex()
+    index.rebuild(devices, polled)
+    versions = {key: group.version for key, group in index.groups.items()}
+    
+    assert index.update(polled, list(polled)) == set()
+    assert {key: group.version for key, group in index.groups.items()} == versions
+
+def test_rebuild_keeps_groups():
+    """A rebuild keeps group objects, resets members and recomputes aggregates."""
+    devices, polled = _installation()
+    index = HiDOMGroupIndex()
+    index.rebuild(devices, polled)
+    before = dict(index.groups)
+    
+    # The office unit leaves, a new hall unit joins
+    joined = _set(_device(7), 1, 28.0, 20)
+    kept = devices[:4] + [joined]
+    polled = {device.uid: device for device in kept}
+    index.rebuild(kept, polled)
+    
+    assert "floor/A/2" not in index.groups
+    assert "tenant/Globex" not in index.groups
+    assert index.groups_of("S1_5") == ()
+    
+    for key, group in index.groups.items():
+        assert group is before[key]
+    
+    assert _aggregates(index.get("building/A")) == {
+        "units": 5,
+        "units_polled": 5,
+        "units_on": 3,
+        "units_offline": 1,
+        "min_room_temp": 20.0,
+        "max_room_temp": 28.0,
+        "avg_room_temp": 23.5,
+        "avg_set_temp": 21.3,
+        "mode": "cool",
+        "fan": "auto",
+    }
+
+def test_string_system_address_is_int():
+    """A system address sent as text matches integer filters."""
+    device = IDUDevice.from_topology({"sysAdr": "2", "address": "5", "pname": "Hall"})
+    
+    assert device.sys == 2
+    assert device.uid == "S2_5"
\ No newline at end of file
@@ -0,0 +1,72 @@
+"""Tests for the per-unit sample history."""
+import pytest
+
+from custom_components.hidom.device.history import IDUHistory
+
+SIZE = 50
+
+def test_statistics_of_known_sequence():
+    """On-time, cycles and setpoint delta follow the buffered samples."""
+    history = IDUHistory(SIZE, min_span=0)
+    history.append(0.0, 20.0, 12.0, 0, 2, 22)
+    history.append(600.0, 25.0, 12.0, 1, 2, 22)
+    history.append(1200.0, 23.0, 12.0, 1, 2, 22)
+    history.append(1800.0, 23.0, 12.0, 0, 2, 22)
+    history.append(2400.0, None, 12.0, 1, 2, 22)
+    history.append(3000.0, 24.0, 12.0, 1, 2, 23)
+    
+    # On from 600 to 1800 and from 2400, switched on twice in 50 minutes
+    assert history.span == 3000.0
+    assert history.on_time_pct == 60.0
+    assert history.cycles_per_hour == 2.4
+    
+    # Samples while on with a room temperature: +3, +1 and +1
+    assert history.mean_setpoint_delta == 1.67
+
+def test_eviction_drops_oldest_share():
+    """A full buffer removes the oldest sample from every statistic."""
+    history = IDUHistory(3, min_span=0)
+    history.append(0.0, 21.0, 12.0, 0, 2, 22)
+    history.append(600.0, 25.0, 12.0, 1, 2, 22)
+    history.append(1200.0, 22.0, 12.0, 1, 2, 22)
+    
+    assert (history.on_time_pct, history.cycles_per_hour, history.mean_setpoint_delta) == (50.0, 3.0, 1.5)
+    
+    # The switch-on from the evicted sample no longer counts
+    history.append(1800.0, 21.0, 12.0, 0, 2, 22)
+    assert (history.on_time_pct, history.cycles_per_hour, history.mean_setpoint_delta) == (100.0, 0.0, 1.5)
+    
+    # Neither does the on-time and delta of the next one
+    history.append(2400.0, 21.0, 12.0, 0, 2, 22)
+    assert (history.on_time_pct, history.cycles_per_hour, history.mean_setpoint_delta) == (50.0, 0.0, 0.0)
+    
+    history.append(3000.0, 26.0, 12.0, 1, 2, 24)
+    assert (history.on_time_pct, history.cycles_per_hour, history.mean_setpoint_delta) == (0.0, 3.0, 2.0)
+    
+    assert history.count == 3
+    assert history.span == 1200.0
+    assert [sample[0] for sample in history.samples()] == [1800.0, 2400.0, 3000.0]
+
+def test_out_of_order_sample_ignored():
+    """Samples not newer than the last one are dropped."""
+    history = IDUHistory(SIZE, min_span=0)
+    history.append(10.0, 21.0, 12.0, 1, 2, 22)
+    history.append(10.0, 25.0, 12.0, 0, 2, 22)
+    history.append(5.0, 25.0, 12.0, 0, 2, 22)
+    
+    assert history.count == 1
+    assert history.mean_setpoint_delta == -1.0
+
+def test_rates_wait_for_min_span():
+    """On-time and cycles are not reported before the minimum span."""
+    history = IDUHistory(SIZE, min_span=900)
+    history.append(0.0, 21.0, 12.0, 0, 2, 22)
+    history.append(60.0, 21.0, 12.0, 1, 2, 22)
+    
+    assert history.on_time_pct is None
+    assert history.cycles_per_hour is None
+    assert history.mean_setpoint_delta == -1.0
+    
+    history.append(900.0, 21.0, 12.0, 1, 2, 22)
+    assert history.on_time_pct == pytest.approx(93.3)
+    assert history.cycles_per_hour == 4.0
\ No newline at end of file
@@ -0,0 +1,157 @@
+"""Tests for the device manager."""
+import asyncio
+
+from custom_components.hidom.const import DATA_ONOFF, DATA_SET_TEMP
+from custom_components.hidom.device.manager import HiDOMDeviceManager
+
+def _manager(client):
+    """Return a manager with explicit command flushes only."""
+    return HiDOMDeviceManager(client, command_delay=60)
+
+def _queue_temp(manager, device_id, temp):
+    """Queue a setpoint change keeping the other registers of the unit."""
+    device = manager._idu_cache[device_id]
+    return manager.queue_command(device_id, {"temp": temp}, {
+        "onoff": device.power,
+        "mode": device.mode_code,
+        "fan": device.fan_code,
+    })
+
+def _write(client, write_result):
+    """Poll, queue a setpoint change and flush it.
+    
+    Returns the setpoint before the command, the optimistic one, the
+    result of the write and the manager.
+    """
+    # Switched off units are confirmed by their power state alone
+    client.simulator.registers(1, 1)[DATA_ONOFF] = 1
+    
+    async def run():
+        manager = _manager(client)
+        devices = await manager.get_idu_devices()
+        device = devices["S1_1"]
+        before = device.set_temp
+        target = before + 1 if before < 28 else before - 1
+        
+        client.write_result = write_result
+        applied = _queue_temp(manager, "S1_1", target)
+        optimistic = device.set_temp
+        await manager.async_shutdown()
+        
+        return before, optimistic, target, await applied, manager
+    
+    return asyncio.run(run())
+
+def test_optimistic_state_confirmed_by_read_back(fake_client):
+    """A confirmed write keeps the new state and drops the snapshot."""
+    before, optimistic, target, applied, manager = _write(fake_client, True)
+    
+    assert optimistic == target != before
+    assert applied is True
+    assert manager._idu_cache["S1_1"].set_temp == target
+    assert fake_client.simulator.registers(1, 1)[DATA_SET_TEMP] == target
+    assert manager._rollback == {}
+    
+    # The write was followed by a read-back of the unit alone
+    assert fake_client.idu_requests[-1] == [{"sys": 1, "addr": 1}]
+
+def test_failed_write_rolls_back(fake_client):
+    """A write reported as failed restores the previous state."""
+    before, optimistic, target, applied, manager = _write(fake_client, False)
+    
+    assert optimistic == target
+    assert applied is False
+    assert manager._idu_cache["S1_1"].set_temp == before
+    assert manager._rollback == {}
+
+def test_raising_write_rolls_back(fake_client):
+    """A write that raises restores the previous state."""
+    before, _, _, applied, manager = _write(fake_client, ConnectionError("unreachable"))
+    
+    assert applied is False
+    assert manager._idu_cache["S1_1"].set_temp == before
+    assert manager._rollback == {}
+
+def test_read_back_mismatch_reports_failure(fake_client):
+    """A write the unit did not apply is reported with its actual state."""
+    before, _, _, applied, manager = _write(fake_client, None)
+    
+    assert applied is False
+    assert manager._idu_cache["S1_1"].set_temp == before
+    assert manager._rollback == {}
+
+def test_poll_keeps_optimistic_state(fake_client):
+    """Polls while a command is pending do not overwrite its state."""
+    async def run():
+        manager = _manager(fake_client)
+        await manager.get_idu_devices()
+        device = manager._idu_cache["S1_1"]
+        target = device.set_temp + 1 if device.set_temp < 28 else device.set_temp - 1
+        
+        applied = _queue_temp(manager, "S1_1", target)
+        await manager.get_idu_devices()
+        polled = device.set_temp
+        
+        await manager.async_shutdown()
+        return target, polled, await applied
+    
+    target, polled, applied = asyncio.run(run())
+    assert polled == target
+    assert applied is True
+
+def _set_all_setpoints(client, temp):
+    """Change the setpoint of every simulated unit."""
+    for item in client.simulator.topology:
+        client.simulator.registers(item["sysAdr"], item["address"])[DATA_SET_TEMP] = temp
+
+def test_failed_chunk_keeps_previous_state(fake_client):
+    """Units of a failed chunk keep their state, the others are updated."""
+    async def run():
+        manager = HiDOMDeviceManager(fake_client, poll_by_system=True)
+        _set_all_setpoints(fake_client, 20)
+        await manager.get_idu_devices()
+        
+        _set_all_setpoints(fake_client, 26)
+        fake_client.failing_systems = {2}
+        devices = await manager.get_idu_devices()
+        return manager, devices
+    
+    manager, devices = asyncio.run(run())
+    
+    assert len(devices) == 8
+    assert {uid: device.set_temp for uid, device in devices.items()} == {
+        **{f"S1_{addr}": 26 for addr in range(1, 5)},
+        **{f"S2_{addr}": 20 for addr in range(1, 5)},
+    }
+    assert manager.failed_chunks == 1
+    assert manager.last_poll_units == 4
+    assert manager.changed_uids == {f"S1_{addr}" for addr in range(1, 5)}
+
+def test_all_chunks_failed_keeps_cache(fake_client):
+    """A poll without any reply leaves every unit as it was."""
+    async def run():
+        manager = HiDOMDeviceManager(fake_client, poll_chunk_size=3)
+        _set_all_setpoints(fake_client, 20)
+        await manager.get_idu_devices()
+        
+        _set_all_setpoints(fake_client, 26)
+        fake_client.failing_systems = {1, 2}
+        devices = await manager.get_idu_devices()
+        return manager, devices
+    
+    manager, devices = asyncio.run(run())
+    
+    assert len(devices) == 8
+    assert {device.set_temp for device in devices.values()} == {20}
+    assert manager.failed_chunks == 3
+    assert manager.changed_uids == frozenset()
+
+def test_chunk_size_limits_request(fake_client):
+    """Polls are split into requests of at most the chunk size."""
+    async def run():
+        manager = HiDOMDeviceManager(fake_client, poll_chunk_size=3)
+        await manager.get_idu_devices()
+    
+    asyncio.run(run())
+    
+    assert [len(devs) for devs in fake_client.idu_requests] == [3, 3, 2]
@@ -0,0 +1,75 @@
+"""Tests for the adaptive poll interval."""
+from custom_components.hidom.device.polling import HiDOMPollScheduler
+
+def _scheduler(boost_duration=60):
+    """Return a scheduler doubling a 10 s interval up to 60 s."""
+    return HiDOMPollScheduler(
+        10,
+        fast_interval=2,
+        idle_interval=60,
+        boost_duration=boost_duration,
+        backoff_factor=2,
+        offline_poll_every=3
+    )
+
+def test_quiet_polls_back_off_to_idle():
+    """Each poll without transitions grows the interval up to the idle one."""
+    scheduler = _scheduler()
+    
+    assert scheduler.current_interval == 10
+    assert [scheduler.observe_poll(0, 1) for _ in range(4)] == [20, 40, 60, 60]
+
+def test_activity_polls_fast_while_boosted():
+    """Commands and transitions switch to the fast interval."""
+    scheduler = _scheduler()
+    scheduler.observe_poll(0, 1)
+    
+    scheduler.notify_activity()
+    assert scheduler.boosted
+    assert scheduler.current_interval == 2
+    assert scheduler.observe_poll(0, 1) == 2
+    
+    quiet = _scheduler()
+    quiet.observe_poll(0, 1)
+    assert quiet.observe_poll(3, 1) == 2
+
+def test_boost_expiry_returns_to_base_interval():
+    """After the boost the interval restarts from the base one."""
+    scheduler = _scheduler(boost_duration=0)
+    scheduler.notify_activity()
+    
+    assert not scheduler.boosted
+    assert [scheduler.observe_poll(0, 1) for _ in range(3)] == [10, 20, 40]
+
+def test_intervals_bounded_by_base():
+    """The fast interval never exceeds, the idle one never undercuts the base."""
+    scheduler = HiDOMPollScheduler(30, fast_interval=60, idle_interval=5)
+    
+    scheduler.notify_activity()
+    assert scheduler.current_interval == 30
+    
+    idle = HiDOMPollScheduler(30, fast_interval=60, idle_interval=5, boost_duration=0)
+    assert idle.observe_poll(0, 1) == 30
+
+def test_offline_units_every_nth_poll():
+    """Offline units are included in every third poll only."""
+    scheduler = _scheduler()
+    included = []
+    
+    for _ in range(7):
+        included.append(scheduler.poll_offline())
+        scheduler.observe_poll(0, 1)
+    
+    assert included == [True, False, False, True, False, False, True]
+
+def test_request_budget():
+    """The budget reports requests per poll and the resulting rate."""
+    scheduler = _scheduler()
+    scheduler.record_requests(4)
+    scheduler.observe_poll(0, 4)
+    
+    budget = scheduler.request_budget
+    assert budget["interval"] == 20
+    assert budget["requests_per_poll"] == 4
+    assert budget["requests_per_minute"] == 12
+    assert budget["requests_last_minute"] == 4
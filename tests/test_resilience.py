@@ -0,0 +1,61 @@
+"""Tests for the controller circuit breaker."""
+from custom_components.hidom.api.resilience import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+)
+
+def _open_breaker(reset_timeout=0):
+    """Return a breaker that has just opened."""
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=reset_timeout)
+    for _ in range(2):
+        assert breaker.allow_request()
+        breaker.record_failure()
+    return breaker
+
+def test_opens_after_threshold():
+    """Consecutive failures open the breaker until the timeout passes."""
+    breaker = _open_breaker(reset_timeout=60)
+    
+    assert breaker.state == STATE_OPEN
+    assert not breaker.allow_request()
+
+def test_single_trial_when_half_open():
+    """Only one trial request is let through after the timeout."""
+    breaker = _open_breaker()
+    
+    assert breaker.state == STATE_HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    
+    breaker.record_success()
+    assert breaker.state == STATE_CLOSED
+    assert breaker.allow_request()
+
+def test_cancelled_trial_is_released():
+    """A trial that ends without an outcome does not block later requests."""
+    breaker = _open_breaker()
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    
+    breaker.release_trial()
+    assert breaker.state == STATE_HALF_OPEN
+    assert breaker.allow_request()
+
+def test_release_keeps_closed_breaker_closed():
+    """Releasing outside of a trial changes nothing."""
+    breaker = CircuitBreaker("test", failure_threshold=2)
+    breaker.release_trial()
+    
+    assert breaker.state == STATE_CLOSED
+    assert breaker.allow_request()
+
+def test_reset_closes_breaker():
+    """Reset closes an open breaker and forgets failures."""
+    breaker = _open_breaker(reset_timeout=60)
+    breaker.reset()
+    
+    assert breaker.state == STATE_CLOSED
+    assert breaker.failures == 0
+    assert breaker.allow_request()
\ No newline at end of file
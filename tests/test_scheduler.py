@@ -0,0 +1,106 @@
+"""Tests for the per-controller request scheduler."""
+import asyncio
+
+from custom_components.hidom.api.scheduler import (
+    PRIORITY_COMMAND,
+    HiDOMRequestScheduler,
+    get_request_scheduler,
+)
+
+def test_shared_scheduler_keeps_highest_concurrency():
+    """A later client of the same host cannot lower the limit."""
+    scheduler = get_request_scheduler("10.0.0.1", 3)
+    
+    assert get_request_scheduler("10.0.0.1") is scheduler
+    assert scheduler.concurrency == 3
+    
+    get_request_scheduler("10.0.0.1", 4)
+    assert scheduler.concurrency == 4
+    assert get_request_scheduler("10.0.0.2", 1).concurrency == 1
+def _blocked_scheduler():
+    """Return a single-slot scheduler and the event releasing its running request."""
+    scheduler = HiDOMRequestScheduler("test", concurrency=1)
+    release = asyncio.Event()
+    return scheduler, release
+
+def test_commands_run_before_queued_polls():
+    """A command queued after polls is started first."""
+    async def run():
+        scheduler, release = _blocked_scheduler()
+        order = []
+        
+        def request(name, wait=None):
+            async def func():
+                if wait is not None:
+                    await wait.wait()
+                order.append(name)
+                return name
+            return func
+        
+        tasks = [asyncio.create_task(scheduler.submit(request("running", release)))]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(scheduler.submit(request("poll 1"))))
+        tasks.append(asyncio.create_task(scheduler.submit(request("poll 2"))))
+        tasks.append(asyncio.create_task(
+            scheduler.submit(request("command"), priority=PRIORITY_COMMAND)
+        ))
+        await asyncio.sleep(0)
+        
+        assert scheduler.depth == 3
+        release.set()
+        await asyncio.gather(*tasks)
+        return order
+    
+    assert asyncio.run(run()) == ["running", "command", "poll 1", "poll 2"]
+
+def test_identical_queued_polls_are_merged():
+    """Polls queued under the same key share one request."""
+    async def run():
+        scheduler, release = _blocked_scheduler()
+        calls = []
+        
+        async def poll():
+            calls.append(len(calls))
+            return len(calls)
+        
+        blocker = asyncio.create_task(scheduler.submit(release.wait))
+        await asyncio.sleep(0)
+        merged = [
+            asyncio.create_task(scheduler.submit(poll, key=("idu", "all")))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        
+        release.set()
+        results = await asyncio.gather(*merged)
+        await blocker
+        
+        # A dispatched poll no longer takes new requests
+        again = await scheduler.submit(poll, key=("idu", "all"))
+        return results, again, scheduler.merged
+    
+    assert asyncio.run(run()) == ([1, 1, 1], 2, 2)
+
+def test_merged_polls_share_failure():
+    """Every caller of a merged poll gets its exception."""
+    async def run():
+        scheduler, release = _blocked_scheduler()
+        
+        async def poll():
+            raise ConnectionError("unreachable")
+        
+        blocker = asyncio.create_task(scheduler.submit(release.wait))
+        await asyncio.sleep(0)
+        merged = [
+            asyncio.create_task(scheduler.submit(poll, key="meter"))
+            for _ in range(2)
+        ]
+        await asyncio.sleep(0)
+        
+        release.set()
+        await blocker
+        return await asyncio.gather(*merged, return_exceptions=True)
+    
+    results = asyncio.run(run())
+    assert len(results) == 2
+    assert all(isinstance(result, ConnectionError) for result in results)
@@ -0,0 +1,59 @@
+"""Tests for unit state transition detection."""
+import pytest
+
+from custom_components.hidom.api.models import IDUDevice
+from custom_components.hidom.api.registers import apply_fields
+from custom_components.hidom.device.transitions import (
+    TRANSITION_ALARM,
+    TRANSITION_ALARM_CLEARED,
+    TRANSITION_ERROR_CODE,
+    TRANSITION_OFFLINE,
+    TRANSITION_ONLINE,
+    TRANSITION_POWER_OFF,
+    TRANSITION_POWER_ON,
+    detect_transitions,
+    transition_state,
+)
+
+DEVICE = IDUDevice.from_topology({"sysAdr": 1, "address": "2", "name": "Office"})
+
+# previous (power, status, error_code), current, expected (type, old, new)
+CASES = [
+    ((0, "off", 0), (0, "off", 0), []),
+    ((0, "off", 0), (1, "on", 0), [(TRANSITION_POWER_ON, 0, 1)]),
+    ((1, "on", 0), (0, "off", 0), [(TRANSITION_POWER_OFF, 1, 0)]),
+    ((1, "on", 0), (1, "offline", 60), [(TRANSITION_OFFLINE, "on", "offline")]),
+    ((1, "offline", 60), (1, "on", 0), [(TRANSITION_ONLINE, "offline", "on")]),
+    ((1, "on", 0), (1, "alarm", 12), [(TRANSITION_ALARM, 0, 12)]),
+    ((1, "alarm", 12), (1, "on", 0), [(TRANSITION_ALARM_CLEARED, 12, 0)]),
+    ((1, "alarm", 12), (1, "alarm", 13), [(TRANSITION_ERROR_CODE, 12, 13)]),
+    ((1, "offline", 61), (1, "offline", 60), [(TRANSITION_ERROR_CODE, 61, 60)]),
+    ((1, "offline", 60), (1, "alarm", 5), [(TRANSITION_ALARM, 60, 5)]),
+    ((0, "offline", 60), (1, "offline", 60), []),
+    ((1, "on", 0), (0, "offline", 60), [(TRANSITION_OFFLINE, "on", "offline")]),
+    ((1, "alarm", 12), (0, "alarm", 12), [(TRANSITION_POWER_OFF, 1, 0)]),
+    ((0, "off", 0), (1, "alarm", 5), [(TRANSITION_ALARM, 0, 5), (TRANSITION_POWER_ON, 0, 1)]),
+]
+
+@pytest.mark.parametrize("previous, current, expected", CASES)
+def test_detect_transitions(previous, current, expected):
+    """Each state change gives the expected transitions, in order."""
+    transitions = detect_transitions(DEVICE, previous, current)
+    
+    assert [(t.type, t.old, t.new) for t in transitions] == expected
+    for transition in transitions:
+        assert transition.uid == DEVICE.uid
+        assert transition.name == "Office"
+        assert transition.error_code == current[2]
+
+def test_transition_state_follows_registers():
+    """The compared state is read from the decoded unit fields."""
+    device = IDUDevice.from_topology({"sysAdr": 1, "address": "3"})
+    previous = transition_state(device)
+    
+    apply_fields(device, {"power": 1, "error_code": 12})
+    current = transition_state(device)
+    assert current == (1, "alarm", 12)
+    
+    transitions = detect_transitions(device, previous, current)
+    assert [t.as_dict()["type"] for t in transitions] == [TRANSITION_ALARM, TRANSITION_POWER_ON]
\ No newline at end of file
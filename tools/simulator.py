@@ -0,0 +1,363 @@
+"""Fake Hi-Dom controller for offline testing and load work.
+
+Serves get_miscdata, get_idu_data, set_idu and get_meter_pwr for a
+generated installation. Unit state is kept in full register arrays, so
+writes are visible in later polls. Latency, hung requests, HTTP errors,
+failed statuses and unit error codes can be injected.
+
+Usage: python tools/simulator.py [--systems 4] [--idus 16] [--port 8080]
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from aiohttp import web
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.hidom.api.client import (  # noqa: E402
+    ENDPOINT_MISCDATA,
+    ENDPOINT_IDU_DATA,
+    ENDPOINT_SET_IDU,
+    ENDPOINT_METER_PWR,
+)
+from custom_components.hidom.const import (  # noqa: E402
+    DATA_ONOFF,
+    DATA_MODE,
+    DATA_FAN,
+    DATA_SET_TEMP,
+    DATA_ERROR_CODE,
+    DATA_PIPE_TEMP,
+    DATA_ROOM_TEMP,
+    DATA_MODEL1,
+    DATA_MODEL2,
+    DATA_MODEL3,
+    DATA_MODEL4,
+    DATA_MODEL5,
+    SET_IDU_REG_ADDR,
+    MODE_COOL,
+    MODE_DRY,
+    MODE_FAN_ONLY,
+    MODE_HEAT,
+    FAN_AUTO,
+    FAN_HIGH,
+    FAN_MID,
+    FAN_LOW,
+    OFFLINE_ERROR_CODES,
+)
+
+# Registers in a get_idu_data array
+REGISTER_COUNT = 96
+
+# Registers written by set_idu, in regVal order
+WRITE_REGISTERS = (DATA_ONOFF, DATA_MODE, DATA_FAN, DATA_SET_TEMP)
+
+# Power drawn by a running unit (kW)
+UNIT_POWER_KW = 1.2
+
+# Error codes used for injected unit faults
+ALARM_CODES = (1, 5, 12)
+
+@dataclass
+class SimulatorConfig:
+    """Simulated installation and fault injection settings."""
+    systems: int = 4
+    idus_per_system: int = 16
+    meter_ids: Sequence[str] = ("1", "2")
+    ascii_meter: bool = False
+    latency: float = 0.0
+    latency_jitter: float = 0.0
+    hang_rate: float = 0.0
+    hang_time: float = 30.0
+    http_error_rate: float = 0.0
+    fail_rate: float = 0.0
+    unit_error_rate: float = 0.0
+    seed: Optional[int] = None
+
+@dataclass
+class SimulatorStats:
+    """Request counters per endpoint."""
+    requests: Dict[str, int] = field(default_factory=dict)
+    injected: Dict[str, int] = field(default_factory=dict)
+    
+    def count(self, counters: Dict[str, int], name: str) -> None:
+        """Increment a counter."""
+        counters[name] = counters.get(name, 0) + 1
+
+class HiDOMSimulator:
+    """In-memory Hi-Dom controller."""
+    
+    def __init__(self, config: Optional[SimulatorConfig] = None):
+        """Initialize."""
+        self.config = config or SimulatorConfig()
+        self.stats = SimulatorStats()
+        self._random = random.Random(self.config.seed)
+        self._topology: List[Dict[str, Any]] = []
+        self._registers: Dict[Tuple[int, int], List[int]] = {}
+        self._meters: Dict[str, float] = {
+            meter_id: self._random.uniform(10000, 500000)
+            for meter_id in self.config.meter_ids
+        }
+        self._last_tick = time.monotonic()
+        self._build_installation()
+    
+    @property
+    def topology(self) -> List[Dict[str, Any]]:
+        """Return topology entries of all units."""
+        return self._topology
+    
+    def registers(self, sys: int, addr: int) -> List[int]:
+        """Return register array of a unit."""
+        return self._registers[(sys, addr)]
+    
+    def _build_installation(self) -> None:
+        """Generate systems, units and their register arrays."""
+        rnd = self._random
+        
+        for sys in range(1, self.config.systems + 1):
+            for addr in range(1, self.config.idus_per_system + 1):
+                floor = (addr - 1) // 8 + 1
+                self._topology.append({
+                    "type": "IDU",
+                    "sysAdr": sys,
+                    "address": addr,
+                    "name": f"IDU {sys}-{addr}",
+                    "code": f"{sys:02d}{addr:03d}",
+                    "pname": f"Room {floor}{addr:02d}",
+                    "ppname": f"Floor {floor}",
+                    "pppname": f"Building {sys}",
+                    "indoorName": f"Indoor {addr}",
+                    "tenantName": f"Tenant {(addr - 1) % 4 + 1}",
+                })
+                
+                registers = [0] * REGISTER_COUNT
+                registers[DATA_ONOFF] = int(rnd.random() < 0.4)
+                registers[DATA_MODE] = rnd.choice((MODE_COOL, MODE_DRY, MODE_FAN_ONLY, MODE_HEAT))
+                registers[DATA_FAN] = rnd.choice((FAN_AUTO, FAN_HIGH, FAN_MID, FAN_LOW))
+                registers[DATA_SET_TEMP] = rnd.randint(18, 28)
+                registers[DATA_ROOM_TEMP] = rnd.randint(18, 30)
+                registers[DATA_PIPE_TEMP] = registers[DATA_ROOM_TEMP] - rnd.randint(0, 8)
+                registers[DATA_MODEL1] = 0x48
+                registers[DATA_MODEL2] = 0x44
+                registers[DATA_MODEL3] = sys
+                registers[DATA_MODEL4] = addr
+                registers[DATA_MODEL5] = 1
+                
+                self._registers[(sys, addr)] = registers
+    
+    def _tick(self) -> None:
+        """Advance room temperatures and meter counters."""
+        now = time.monotonic()
+        elapsed = now - self._last_tick
+        self._last_tick = now
+        running = 0
+        
+        for registers in self._registers.values():
+            if not registers[DATA_ONOFF] or registers[DATA_ERROR_CODE]:
+                continue
+            
+            running += 1
+            if self._random.random() < min(1.0, elapsed / 60):
+                delta = registers[DATA_SET_TEMP] - registers[DATA_ROOM_TEMP]
+                registers[DATA_ROOM_TEMP] += (delta > 0) - (delta < 0)
+        
+        energy_wh = running * UNIT_POWER_KW * 1000 * elapsed / 3600
+        for meter_id in self._meters:
+            self._meters[meter_id] += energy_wh / len(self._meters)
+    
+    def _inject_unit_errors(self) -> None:
+        """Raise or clear unit error codes at random."""
+        rate = self.config.unit_error_rate
+        if not rate:
+            return
+        
+        for registers in self._registers.values():
+            if self._random.random() >= rate:
+                continue
+            
+            if registers[DATA_ERROR_CODE]:
+                registers[DATA_ERROR_CODE] = 0
+            else:
+                registers[DATA_ERROR_CODE] = self._random.choice(ALARM_CODES + OFFLINE_ERROR_CODES)
+    
+    def miscdata(self) -> Dict[str, Any]:
+        """Build get_miscdata response."""
+        return {"status": "success", "miscdata": {"topo": self._topology}}
+    
+    def idu_data(self, devs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build get_idu_data response for the requested units."""
+        self._tick()
+        self._inject_unit_errors()
+        dats = []
+        
+        for dev in devs:
+            try:
+                key = int(dev["sys"]), int(dev["addr"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            
+            registers = self._registers.get(key)
+            if registers is not None:
+                dats.append({"sys": key[0], "addr": key[1], "data": list(registers)})
+        
+        return {"status": "success", "dats": dats}
+    
+    def set_idu(self, cmd_list: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Apply a set_idu command list."""
+        self._tick()
+        
+        for command in cmd_list:
+            try:
+                key = int(command["sys"]), int(command["iduAddr"])
+                reg_addr = int(command["regAddr"])
+                values = [int(value) for value in command["regVal"]]
+            except (KeyError, TypeError, ValueError):
+                return {"status": "fail"}
+            
+            registers = self._registers.get(key)
+            if registers is None or reg_addr != SET_IDU_REG_ADDR:
+                return {"status": "fail"}
+            
+            for register, value in zip(WRITE_REGISTERS, values):
+                registers[register] = value
+        
+        return {"status": "success"}
+    
+    def meter_pwr(self, ids: List[str]) -> Dict[str, Any]:
+        """Build get_meter_pwr response."""
+        self._tick()
+        return {
+            "status": "success",
+            "dats": [
+                {"id": meter_id, "pwr": f"{self._meters[meter_id]:.1f}", "vol": "230.0", "cur": "0.0"}
+                for meter_id in ids
+                if meter_id in self._meters
+            ],
+        }
+    
+    async def _inject_faults(self, name: str) -> Optional[web.Response]:
+        """Delay the request and return an injected failure, if any."""
+        config = self.config
+        rnd = self._random
+        
+        delay = config.latency + rnd.uniform(0, config.latency_jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        
+        if rnd.random() < config.hang_rate:
+            self.stats.count(self.stats.injected, "hang")
+            await asyncio.sleep(config.hang_time)
+        
+        if rnd.random() < config.http_error_rate:
+            self.stats.count(self.stats.injected, "http_error")
+            return web.Response(status=500, text="Internal Server Error")
+        
+        if rnd.random() < config.fail_rate:
+            self.stats.count(self.stats.injected, "fail")
+            return web.json_response({"status": "fail"})
+        
+        return None
+    
+    async def _handle(self, request: web.Request, name: str) -> web.Response:
+        """Handle one API request."""
+        self.stats.count(self.stats.requests, name)
+        
+        failure = await self._inject_faults(name)
+        if failure is not None:
+            return failure
+        
+        try:
+            payload = await request.json()
+        except ValueError:
+            return web.Response(status=400, text="Bad Request")
+        
+        if name == "miscdata":
+            return web.json_response(self.miscdata())
+        if name == "idu_data":
+            return web.json_response(self.idu_data(payload.get("devs", [])))
+        if name == "set_idu":
+            return web.json_response(self.set_idu(payload.get("cmdList", [])))
+        
+        document = json.dumps(self.meter_pwr(payload.get("ids", [])))
+        if self.config.ascii_meter:
+            return web.Response(text=" ".join(str(ord(c)) for c in document))
+        return web.Response(text=document, content_type="application/json")
+    
+    def make_app(self) -> web.Application:
+        """Create the aiohttp application."""
+        app = web.Application()
+        
+        for endpoint, name in (
+            (ENDPOINT_MISCDATA, "miscdata"),
+            (ENDPOINT_IDU_DATA, "idu_data"),
+            (ENDPOINT_SET_IDU, "set_idu"),
+            (ENDPOINT_METER_PWR, "meter_pwr"),
+        ):
+            async def handler(request: web.Request, name: str = name) -> web.Response:
+                return await self._handle(request, name)
+            app.router.add_post(endpoint, handler)
+        
+        return app
+    
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> web.AppRunner:
+        """Serve in the running event loop.
+        
+        Returns the runner; the bound address is in ``runner.addresses``.
+        Call ``runner.cleanup()`` to stop.
+        """
+        runner = web.AppRunner(self.make_app())
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        return runner
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--systems", type=int, default=4)
+    parser.add_argument("--idus", type=int, default=16, help="units per system")
+    parser.add_argument("--meter-ids", default="1,2", help="comma separated meter ids")
+    parser.add_argument("--ascii-meter", action="store_true", help="send meter data as ASCII codes")
+    parser.add_argument("--latency", type=float, default=0.0, help="base response delay (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random extra delay (s)")
+    parser.add_argument("--hang-rate", type=float, default=0.0, help="share of requests that hang")
+    parser.add_argument("--hang-time", type=float, default=30.0, help="hang duration (s)")
+    parser.add_argument("--http-error-rate", type=float, default=0.0, help="share of HTTP 500 replies")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help='share of {"status": "fail"} replies')
+    parser.add_argument("--unit-error-rate", type=float, default=0.0, help="unit fault toggle rate per poll")
+    parser.add_argument("--seed", type=int, default=None)
+    return parser.parse_args(argv)
+
+def main() -> None:
+    """Run the simulator until interrupted."""
+    args = parse_args()
+    simulator = HiDOMSimulator(SimulatorConfig(
+        systems=args.systems,
+        idus_per_system=args.idus,
+        meter_ids=[meter_id.strip() for meter_id in args.meter_ids.split(",") if meter_id.strip()],
+        ascii_meter=args.ascii_meter,
+        latency=args.latency,
+        latency_jitter=args.jitter,
+        hang_rate=args.hang_rate,
+        hang_time=args.hang_time,
+        http_error_rate=args.http_error_rate,
+        fail_rate=args.fail_rate,
+        unit_error_rate=args.unit_error_rate,
+        seed=args.seed,
+    ))
+    
+    print(
+        f"Simulating {args.systems} systems x {args.idus} IDUs "
+        f"on http://{args.host}:{args.port}"
+    )
+    web.run_app(simulator.make_app(), host=args.host, port=args.port, print=None)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file